@@ -0,0 +1,62 @@
+"""hot foreign key indexes
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-18 00:40:03.903337
+
+Plain CREATE INDEX statements only, no table rebuilds, so the migration can be
+applied while the workers keep serving (see app/migrate.py).
+"""
+from collections.abc import Sequence
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0002'
+down_revision: str | Sequence[str] | None = '0001'
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+INDEXES: list[tuple[str, str, list[str], bool]] = [
+    ("ix_users_role_id", "users", ["role_id"], False),
+    ("ix_courses_teacher_id", "courses", ["teacher_id"], False),
+    ("ix_courses_category_id", "courses", ["category_id"], False),
+    ("ix_tasks_course_id_is_active", "tasks", ["course_id", "is_active"], False),
+    ("ix_enrollments_student_id_is_active", "enrollments", ["student_id", "is_active"], False),
+    ("ix_enrollments_course_id_is_active", "enrollments", ["course_id", "is_active"], False),
+    ("ix_enrollments_assigner_id", "enrollments", ["assigner_id"], False),
+    ("ix_task_completions_task_id", "task_completions", ["task_id"], False),
+    (
+        "ux_task_completions_enrollment_id_task_id",
+        "task_completions",
+        ["enrollment_id", "task_id"],
+        True,
+    ),
+]
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    duplicate = op.get_bind().execute(
+        sa.text(
+            "SELECT enrollment_id, task_id FROM task_completions "
+            "GROUP BY enrollment_id, task_id HAVING count(*) > 1 LIMIT 1"
+        )
+    ).first()
+    if duplicate is not None:
+        raise RuntimeError(
+            "task_completions contains duplicate (enrollment_id, task_id) rows, "
+            f"e.g. {tuple(duplicate)}; remove them before adding the unique index"
+        )
+
+    for name, table, columns, unique in INDEXES:
+        op.create_index(name, table, columns, unique=unique, if_not_exists=True)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for name, table, _, _ in reversed(INDEXES):
+        op.drop_index(name, table_name=table, if_exists=True)
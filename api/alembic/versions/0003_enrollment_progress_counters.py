@@ -0,0 +1,60 @@
+"""enrollment progress counters
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-18 01:32:10.512204
+
+Adds the denormalized completed_tasks/total_tasks columns and backfills them
+with one UPDATE; `python -m app.reconcile_progress` verifies them afterwards.
+"""
+from collections.abc import Sequence
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0003'
+down_revision: str | Sequence[str] | None = '0002'
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    columns = {
+        column["name"] for column in sa.inspect(op.get_bind()).get_columns("enrollments")
+    }
+    # ADD COLUMN with a constant default is a metadata-only change in SQLite
+    for name in ("completed_tasks", "total_tasks"):
+        if name not in columns:
+            op.add_column(
+                "enrollments",
+                sa.Column(name, sa.Integer(), nullable=False, server_default="0"),
+            )
+
+    op.execute(
+        """
+        UPDATE enrollments SET
+            total_tasks = (
+                SELECT count(tasks.task_id) FROM tasks
+                WHERE tasks.course_id = enrollments.course_id AND tasks.is_active = 1
+            ),
+            completed_tasks = (
+                SELECT count(task_completions.task_completion_id)
+                FROM task_completions
+                JOIN tasks ON tasks.task_id = task_completions.task_id
+                WHERE task_completions.enrollment_id = enrollments.enrollment_id
+                    AND task_completions.is_active = 1
+                    AND tasks.course_id = enrollments.course_id
+                    AND tasks.is_active = 1
+            )
+        """
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.batch_alter_table('enrollments', schema=None) as batch_op:
+        batch_op.drop_column('total_tasks')
+        batch_op.drop_column('completed_tasks')
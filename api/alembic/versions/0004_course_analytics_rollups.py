@@ -0,0 +1,85 @@
+"""course analytics rollups
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2026-10-18 09:12:44.301875
+
+Adds the course_stats/course_deadline_stats rollups behind the analytics
+endpoints and fills them from the current enrollments.
+"""
+from collections.abc import Sequence
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0004'
+down_revision: str | Sequence[str] | None = '0003'
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    inspector = sa.inspect(op.get_bind())
+    if not inspector.has_table('course_stats'):
+        op.create_table('course_stats',
+        sa.Column('course_id', sa.Integer(), nullable=False),
+        sa.Column('enrollments', sa.Integer(), server_default='0', nullable=False),
+        sa.Column('completed_enrollments', sa.Integer(), server_default='0', nullable=False),
+        sa.Column('completion_seconds', sa.Integer(), server_default='0', nullable=False),
+        sa.Column('completed_tasks', sa.Integer(), server_default='0', nullable=False),
+        sa.Column('total_tasks', sa.Integer(), server_default='0', nullable=False),
+        sa.ForeignKeyConstraint(['course_id'], ['courses.course_id'], ),
+        sa.PrimaryKeyConstraint('course_id')
+        )
+    if not inspector.has_table('course_deadline_stats'):
+        op.create_table('course_deadline_stats',
+        sa.Column('course_id', sa.Integer(), nullable=False),
+        sa.Column('deadline', sa.Date(), nullable=False),
+        sa.Column('open_enrollments', sa.Integer(), server_default='0', nullable=False),
+        sa.ForeignKeyConstraint(['course_id'], ['courses.course_id'], ),
+        sa.PrimaryKeyConstraint('course_id', 'deadline')
+        )
+
+    op.execute("DELETE FROM course_stats")
+    op.execute(
+        """
+        INSERT INTO course_stats (
+            course_id, enrollments, completed_enrollments, completion_seconds,
+            completed_tasks, total_tasks
+        )
+        SELECT
+            courses.course_id,
+            count(enrollments.enrollment_id),
+            count(enrollments.completed_at),
+            coalesce(sum(CASE WHEN enrollments.completed_at IS NOT NULL THEN max(
+                CAST((julianday(enrollments.completed_at)
+                    - julianday(enrollments.enrolled_at)) * 86400 AS INTEGER),
+                0
+            ) END), 0),
+            coalesce(sum(enrollments.completed_tasks), 0),
+            coalesce(sum(enrollments.total_tasks), 0)
+        FROM courses
+        LEFT JOIN enrollments ON enrollments.course_id = courses.course_id
+            AND enrollments.is_active = 1
+        GROUP BY courses.course_id
+        """
+    )
+    op.execute("DELETE FROM course_deadline_stats")
+    op.execute(
+        """
+        INSERT INTO course_deadline_stats (course_id, deadline, open_enrollments)
+        SELECT course_id, deadline, count(*)
+        FROM enrollments
+        WHERE is_active = 1 AND completed_at IS NULL AND deadline IS NOT NULL
+        GROUP BY course_id, deadline
+        """
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('course_deadline_stats')
+    op.drop_table('course_stats')
@@ -0,0 +1,37 @@
+"""filter date indexes
+
+Revision ID: 0005
+Revises: 0004
+Create Date: 2026-10-18 11:05:27.640113
+
+Indexes the date columns the collection filters expose (enrollments since a
+date, completions since a date). Plain CREATE INDEX, safe to run online.
+"""
+from collections.abc import Sequence
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0005'
+down_revision: str | Sequence[str] | None = '0004'
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+INDEXES: list[tuple[str, str, list[str]]] = [
+    ("ix_enrollments_enrolled_at", "enrollments", ["enrolled_at"]),
+    ("ix_task_completions_completed_at", "task_completions", ["completed_at"]),
+]
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    for name, table, columns in INDEXES:
+        op.create_index(name, table, columns, if_not_exists=True)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for name, table, _ in reversed(INDEXES):
+        op.drop_index(name, table_name=table, if_exists=True)
@@ -1,6 +1,8 @@
 from typing import Annotated
 
-from fastapi import Path
+from fastapi import Path, Query
+
+from app.pagination import MAX_PAGE_LIMIT
 
 ID_PATH_ANNOTATION = Annotated[
     int,
@@ -12,3 +14,49 @@ ID_PATH_ANNOTATION = Annotated[
         le=9223372036854775807,  # 8 bytes int max value
     ),
 ]
+
+CURSOR_QUERY_ANNOTATION = Annotated[
+    str | None,
+    Query(
+        title="Cursor",
+        description="Opaque cursor returned as `next_cursor` by the previous page",
+    ),
+]
+
+LIMIT_QUERY_ANNOTATION = Annotated[
+    int | None,
+    Query(
+        title="Limit",
+        description="Page size; when set the response is a page with `next_cursor`",
+        ge=1,
+        le=MAX_PAGE_LIMIT,
+    ),
+]
+
+FIELDS_QUERY_ANNOTATION = Annotated[
+    str | None,
+    Query(
+        title="Fields",
+        description="Comma-separated response fields to return, e.g. course_id,title",
+    ),
+]
+
+FILTER_QUERY_ANNOTATION = Annotated[
+    list[str] | None,
+    Query(
+        alias="filter",
+        title="Filter",
+        description=(
+            "Repeatable `field:operator:value` filter, operators eq, ne, lt, lte, "
+            "gt, gte, in (values separated by |) and null (true/false)"
+        ),
+    ),
+]
+
+SORT_QUERY_ANNOTATION = Annotated[
+    str | None,
+    Query(
+        title="Sort",
+        description="Comma-separated sort fields, prefix with - for descending",
+    ),
+]
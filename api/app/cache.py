@@ -0,0 +1,340 @@
+"""In-process caches with write-through invalidation, shared by all workers.
+
+Read controllers opt in to the response cache with `@cached_response(*tables)`.
+Entries hold the JSON body keyed by controller and arguments, are evicted
+least recently used beyond `cache__max_entries` and after
+`cache__ttl_seconds`, and are dropped as soon as a transaction that wrote one
+of their tables commits (the tables are collected by app.versioning). Routes
+listed in `cache__disabled_routes` always run their query.
+
+Every uvicorn worker has its own entries, but the per-table generations live
+in a memory-mapped file next to the database. A commit in one worker bumps
+them, and the other workers notice on their next lookup by comparing a few
+integers, without a query or any message passing. Other caches built on table
+rows (the authenticated users of app.src.auth) use the same mechanism through
+`build_cache`, and `TableMirror` keeps a whole small table in memory with it.
+"""
+
+import fcntl
+import functools
+import inspect
+import mmap
+import os
+import struct
+import threading
+import time
+import zlib
+from abc import ABC, abstractmethod
+from collections import OrderedDict, defaultdict
+from collections.abc import Callable, Hashable, Iterable
+from dataclasses import dataclass
+from typing import Any
+
+from fastapi import Response
+from fastapi.concurrency import run_in_threadpool
+from pydantic_core import to_json
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.versioning import CHANGED_TABLES
+
+
+class LocalGenerations:
+    """Per-table write generations of a single process."""
+
+    def __init__(self):
+        self._values: dict[str, int] = defaultdict(int)
+        self._lock = threading.Lock()
+
+    def read(self, tables: tuple[str, ...]) -> tuple[int, ...]:
+        return tuple(self._values[table] for table in tables)
+
+    def bump(self, tables: Iterable[str]) -> None:
+        with self._lock:
+            for table in tables:
+                self._values[table] += 1
+
+
+class SharedGenerations:
+    """Per-table write generations in a file mapped by every worker.
+
+    Tables are hashed onto a fixed array of 64-bit counters; a collision only
+    makes two tables invalidate each other. Readers take no lock (aligned
+    8-byte loads do not tear), bumps are serialized across processes with
+    flock and within the process with a thread lock.
+    """
+
+    SLOT = struct.Struct("<Q")
+
+    def __init__(self, path: str, slots: int = 512):
+        self.slots = slots
+        self._fd = os.open(path, os.O_RDWR | os.O_CREAT, 0o644)
+        size = slots * self.SLOT.size
+        if os.fstat(self._fd).st_size < size:
+            os.ftruncate(self._fd, size)
+        self._map = mmap.mmap(self._fd, size)
+        self._lock = threading.Lock()
+
+    def _offset(self, table: str) -> int:
+        return zlib.crc32(table.encode()) % self.slots * self.SLOT.size
+
+    def read(self, tables: tuple[str, ...]) -> tuple[int, ...]:
+        return tuple(
+            self.SLOT.unpack_from(self._map, self._offset(table))[0]
+            for table in tables
+        )
+
+    def bump(self, tables: Iterable[str]) -> None:
+        offsets = {self._offset(table) for table in tables}
+        with self._lock:
+            fcntl.flock(self._fd, fcntl.LOCK_EX)
+            try:
+                for offset in offsets:
+                    (value,) = self.SLOT.unpack_from(self._map, offset)
+                    self.SLOT.pack_into(self._map, offset, value + 1)
+            finally:
+                fcntl.flock(self._fd, fcntl.LOCK_UN)
+
+
+Generations = LocalGenerations | SharedGenerations
+
+
+@dataclass
+class CacheEntry[V]:
+    value: V
+    tables: tuple[str, ...]
+    generation: tuple[int, ...]
+    expires_at: float
+
+
+@dataclass
+class RouteStats:
+    hits: int = 0
+    misses: int = 0
+
+
+class GenerationCache[V]:
+    """Bounded LRU/TTL map from a key to a value built from some tables.
+
+    Each table has a generation that every invalidation bumps. A miss hands
+    out the current generations, which are read before the query and stored
+    with the entry; an entry whose tables moved on since is stale. Since
+    commits bump after writing, a read racing a write never serves old rows
+    once the bump is visible, in this worker or any other.
+    """
+
+    def __init__(
+        self, max_entries: int, ttl_seconds: float, generations: Generations
+    ):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.generations = generations
+        self._entries: OrderedDict[Hashable, CacheEntry[V]] = OrderedDict()
+        self._keys_by_table: dict[str, set[Hashable]] = defaultdict(set)
+        self._lock = threading.Lock()
+        self.routes: dict[str, RouteStats] = defaultdict(RouteStats)
+        self.evictions = 0
+        self.expirations = 0
+        self.invalidations = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def lookup(
+        self, route: str, key: Hashable, tables: tuple[str, ...]
+    ) -> tuple[V | None, tuple[int, ...]]:
+        now = time.monotonic()
+        generation = self.generations.read(tables)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                if entry.expires_at <= now:
+                    self._remove(key)
+                    self.expirations += 1
+                elif entry.generation != generation:
+                    # Written by another worker since the entry was stored
+                    self._remove(key)
+                    self.invalidations += 1
+                else:
+                    self._entries.move_to_end(key)
+                    self.routes[route].hits += 1
+                    return entry.value, generation
+
+            self.routes[route].misses += 1
+            return None, generation
+
+    def store(
+        self,
+        key: Hashable,
+        tables: tuple[str, ...],
+        generation: tuple[int, ...],
+        value: V,
+        ttl_seconds: float | None = None,
+    ) -> None:
+        if self.generations.read(tables) != generation:
+            return  # a write committed while the response was built
+
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            if ttl_seconds is None or ttl_seconds > self.ttl_seconds:
+                ttl_seconds = self.ttl_seconds
+            self._entries[key] = CacheEntry(
+                value, tables, generation, time.monotonic() + ttl_seconds
+            )
+            for table in tables:
+                self._keys_by_table[table].add(key)
+
+            while len(self._entries) > self.max_entries:
+                self._remove(next(iter(self._entries)))
+                self.evictions += 1
+
+    def forget(self, tables: Iterable[str]) -> None:
+        """Drop the local entries of `tables`, after their generations moved."""
+        with self._lock:
+            for table in tables:
+                for key in list(self._keys_by_table.pop(table, ())):
+                    self._remove(key)
+                    self.invalidations += 1
+
+    def route_stats(self) -> dict[str, RouteStats]:
+        with self._lock:
+            return {
+                route: RouteStats(stats.hits, stats.misses)
+                for route, stats in self.routes.items()
+            }
+
+    def _remove(self, key: Hashable) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return
+        for table in entry.tables:
+            keys = self._keys_by_table.get(table)
+            if keys is not None:
+                keys.discard(key)
+
+
+@functools.cache
+def get_generations() -> Generations:
+    if not settings.cache.shared:
+        return LocalGenerations()
+    return SharedGenerations(
+        settings.cache.generations_file or f"{settings.sql.name}.generations"
+    )
+
+
+caches: list[GenerationCache] = []
+
+
+def build_cache(max_entries: int, ttl_seconds: float) -> GenerationCache:
+    cache: GenerationCache = GenerationCache(
+        max_entries, ttl_seconds, get_generations()
+    )
+    caches.append(cache)
+    return cache
+
+
+response_cache: GenerationCache[bytes] | None = (
+    build_cache(settings.cache.max_entries, settings.cache.ttl_seconds)
+    if settings.cache.enabled
+    else None
+)
+
+
+@event.listens_for(Session, "after_commit")
+def invalidate_committed(session: Session) -> None:
+    tables = session.info.get(CHANGED_TABLES)
+    if not tables:
+        return
+
+    get_generations().bump(tables)
+    for cache in caches:
+        cache.forget(tables)
+
+
+class TableMirror[V](ABC):
+    """In-memory value derived from a few small tables, rebuilt when they change.
+
+    Subclasses implement `load`, which queries. Checking for changes costs a
+    few shared-memory reads, so callers can afford it on every request. With
+    cache__shared=false the generations only count this worker's own commits,
+    so the value is then also rebuilt every `refresh_seconds`, which bounds how
+    late it reflects the writes of other workers. Shared generations see every
+    commit and never reload on a timer.
+    """
+
+    def __init__(self, tables: tuple[str, ...], refresh_seconds: float):
+        self.tables = tables
+        self.refresh_seconds = refresh_seconds
+        self.value: V | None = None
+        self._generation: tuple[int, ...] | None = None
+        self._loaded_at = float("-inf")
+
+    @abstractmethod
+    def load(self) -> V:
+        """Query the current value."""
+
+    def stale(self) -> bool:
+        generations = get_generations()
+        if self._generation != generations.read(self.tables):
+            return True
+        return (
+            isinstance(generations, LocalGenerations)
+            and time.monotonic() - self._loaded_at > self.refresh_seconds
+        )
+
+    def reload(self) -> None:
+        # Read first, so a write committed during the query reloads again
+        generation = get_generations().read(self.tables)
+        self.value = self.load()
+        self._generation = generation
+        self._loaded_at = time.monotonic()
+
+    async def refresh(self) -> None:
+        """Reload on the threadpool if needed, never blocking the event loop."""
+        if self.stale():
+            await run_in_threadpool(self.reload)
+
+
+def freeze(value: Any) -> Hashable:
+    if isinstance(value, list | tuple):
+        return tuple(freeze(item) for item in value)
+    return value
+
+
+def cached_response(*tables: str) -> Callable[[Callable], Callable]:
+    """Cache the encoded result of a read controller.
+
+    `tables` must cover every table the response is built from. The result is
+    always returned as a ready JSON Response, so hits skip both the query and
+    Pydantic serialization. Errors are not cached.
+    """
+
+    def decorate(fn: Callable) -> Callable:
+        route = fn.__name__
+        signature = inspect.signature(fn)
+
+        @functools.wraps(fn)
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+            if response_cache is None or route in settings.cache.disabled_routes:
+                return fn(*args, **kwargs)
+
+            arguments = signature.bind(*args, **kwargs)
+            arguments.apply_defaults()
+            key = (route,) + tuple(
+                (name, freeze(value))
+                for name, value in arguments.arguments.items()
+                if name != "sql"
+            )
+
+            body, generation = response_cache.lookup(route, key, tables)
+            if body is None:
+                result = fn(*args, **kwargs)
+                body = result.body if isinstance(result, Response) else to_json(result)
+                response_cache.store(key, tables, generation, body)
+            return Response(content=body, media_type="application/json")
+
+        return wrapper
+
+    return decorate
@@ -1,3 +1,5 @@
+from typing import Literal
+
 from pydantic import BaseModel
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
@@ -6,18 +8,107 @@ class AuthSettings(BaseModel):
     secret_key: str
     algorithm: str
     access_token_expire_minutes: int
+    refresh_token_expire_days: int = 7
+    # Role given to every user registered through POST /users
+    default_role: str = "student"
+    # Upper bound on how late a worker sees revocations and role changes from
+    # another worker when cache__shared is off
+    state_refresh_seconds: float = 5
+    # Dedicated threads for bcrypt and token signing, see app.src.auth.pool
+    pool_workers: int = 4
+    # Logins admitted at once (running or queued), the rest get 503
+    pool_max_pending: int = 64
+
+
+class SqlitePragmas(BaseModel):
+    # busy_timeout goes first so the remaining pragmas already wait on locks
+    busy_timeout: int | None = None
+    journal_mode: Literal["DELETE", "TRUNCATE", "PERSIST", "MEMORY", "WAL"] | None = None
+    synchronous: Literal["OFF", "NORMAL", "FULL", "EXTRA"] | None = None
+    mmap_size: int | None = None
+    cache_size: int | None = None
+    temp_store: Literal["DEFAULT", "FILE", "MEMORY"] | None = None
+
+
+STORAGE_PROFILES: dict[str, SqlitePragmas] = {
+    "default": SqlitePragmas(),
+    "wal": SqlitePragmas(
+        busy_timeout=5000,
+        journal_mode="WAL",
+        synchronous="NORMAL",
+        mmap_size=268435456,  # 256 MiB
+        cache_size=-65536,  # 64 MiB, negative values are KiB
+        temp_store="MEMORY",
+    ),
+}
 
 
 class SqlSettings(BaseModel):
     name: str
+    # "async" serves the auth path from an aiosqlite AsyncSession
+    mode: Literal["sync", "async"] = "sync"
+    profile: Literal["default", "wal"] = "default"
+    # Individual pragmas override the ones coming from the profile
+    pragmas: SqlitePragmas = SqlitePragmas()
+    # Serialize writes through one in-process writer that group-commits them
+    write_queue: bool = False
+    write_batch_size: int = 64
+    # How long a request waits for its write to be committed before a 503
+    write_timeout_seconds: float = 30
 
     def get_url(self):
         return f"sqlite:///{self.name}.db"
 
+    def get_async_url(self):
+        return f"sqlite+aiosqlite:///{self.name}.db"
+
+    def get_pragmas(self) -> dict[str, str | int]:
+        pragmas = STORAGE_PROFILES[self.profile].model_dump(exclude_none=True)
+        pragmas.update(self.pragmas.model_dump(exclude_none=True))
+        return pragmas
+
+
+class StartupSettings(BaseModel):
+    # Budget for importing app.main, enforced by `python -m app.import_profile`
+    import_budget_ms: int = 1500
+
+
+class SerializationSettings(BaseModel):
+    # Encode collection endpoints from column tuples instead of ORM entities
+    fast_collections: bool = True
+
+
+class SnapshotSettings(BaseModel):
+    # Used by `python -m app.snapshot` and POST /exports/snapshots
+    output_dir: str = "snapshots"
+    file_format: Literal["parquet", "arrow"] = "parquet"
+    chunk_size: int = 50000
+
+
+class CacheSettings(BaseModel):
+    # In-process cache of GET responses, see app.cache
+    enabled: bool = True
+    max_entries: int = 1024
+    ttl_seconds: float = 300
+    # Controller names (e.g. "get_courses") that always hit the database
+    disabled_routes: list[str] = []
+    # Share invalidations between workers through a memory-mapped file,
+    # <sql__name>.generations unless set
+    shared: bool = True
+    generations_file: str | None = None
+    # Validated users of get_current_user, keyed by bearer token
+    user_enabled: bool = True
+    user_max_entries: int = 4096
+    user_ttl_seconds: float = 60
+
 
 class Settings(BaseSettings):
     sql: SqlSettings
     auth: AuthSettings
+    startup: StartupSettings = StartupSettings()
+    serialization: SerializationSettings = SerializationSettings()
+    snapshot: SnapshotSettings = SnapshotSettings()
+    cache: CacheSettings = CacheSettings()
 
     model_config = SettingsConfigDict(
         env_file="../.env",
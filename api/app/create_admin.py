@@ -0,0 +1,75 @@
+"""Create the built-in roles and an administrator account.
+
+Usage: python -m app.create_admin USERNAME [--email EMAIL]
+
+Registration through POST /users always assigns auth__default_role, and only
+admins may manage roles and users, so the first administrator is made here.
+Missing roles of app.src.auth.permissions.ROLE_PERMISSIONS are created. An
+existing USERNAME is promoted to the admin role and its tokens are revoked;
+otherwise the user is created with the password read from the terminal.
+"""
+
+import argparse
+import getpass
+
+from sqlalchemy import select
+
+from app import models
+from app.database import SessionLocal
+from app.src.auth.controllers import ADMIN_ROLE
+from app.src.auth.permissions import ROLE_PERMISSIONS
+from app.src.auth.revocations import revoke_tokens
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("username")
+    parser.add_argument("--email", help="required when the user does not exist")
+    args = parser.parse_args()
+
+    with SessionLocal() as sql:
+        roles = {
+            role.name: role
+            for role in sql.scalars(
+                select(models.Role).where(models.Role.name.in_(ROLE_PERMISSIONS))
+            )
+        }
+        for name in ROLE_PERMISSIONS:
+            if name not in roles:
+                roles[name] = models.Role(name=name)
+                sql.add(roles[name])
+                print(f"Created role {name}")
+
+        user = sql.scalars(
+            select(models.User).where(models.User.username == args.username)
+        ).one_or_none()
+        if user is None:
+            if args.email is None:
+                raise SystemExit(f"User {args.username} does not exist, pass --email")
+            user = models.User(
+                username=args.username,
+                first_name=args.username,
+                last_name=args.username,
+                email=args.email,
+                password_hash=getpass.getpass(f"Password for {args.username}: "),
+                role=roles[ADMIN_ROLE],
+            )
+            sql.add(user)
+            print(f"Created admin {args.username}")
+        elif user.role is not roles[ADMIN_ROLE]:
+            user.role = roles[ADMIN_ROLE]
+            sql.flush()
+            # The user's tokens still carry the old role
+            revoke_tokens(
+                sql,
+                select(models.User.user_id).where(models.User.user_id == user.user_id),
+            )
+            print(f"Promoted {args.username} to admin")
+        else:
+            print(f"{args.username} is already an admin")
+
+        sql.commit()
+
+
+if __name__ == "__main__":
+    main()
@@ -1,6 +1,3 @@
-from app import models
-
-
 def sqlalchemy_to_mermaid(metadata_obj, title="Database Schema"):
     """
     Convert SQLAlchemy metadata to Mermaid entity-relationship diagram.
@@ -52,7 +49,3 @@ def sqlalchemy_to_mermaid(metadata_obj, title="Database Schema"):
                 mermaid_code.append(relationship)
 
     return "\n".join(mermaid_code)
-
-
-mermaid = sqlalchemy_to_mermaid(models.Base.metadata)
-print(mermaid)
@@ -1,11 +1,17 @@
 from typing import Any
-from sqlalchemy import Engine, create_engine
+from sqlalchemy import Engine, create_engine, event
 
-from collections.abc import Generator
+from collections.abc import AsyncGenerator, Generator
 
 
 from sqlalchemy.orm import sessionmaker
 
+from sqlalchemy.ext.asyncio import (
+    AsyncEngine,
+    AsyncSession,
+    async_sessionmaker,
+    create_async_engine,
+)
 from sqlalchemy.ext.declarative import declarative_base
 
 
@@ -17,12 +23,61 @@ from app.config import settings
 connect_args: dict[str, bool] = {"check_same_thread": False}
 
 
+def apply_storage_profile(sync_engine: Engine, read_only: bool = False) -> None:
+    pragmas = settings.sql.get_pragmas()
+
+    @event.listens_for(sync_engine, "connect")
+    def set_sqlite_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        for name, value in pragmas.items():
+            cursor.execute(f"PRAGMA {name} = {value}")
+        if read_only:
+            cursor.execute("PRAGMA query_only = ON")
+        cursor.close()
+
+
+def begin_immediate(sync_engine: Engine) -> None:
+    """Let SQLAlchemy emit BEGIN itself instead of pysqlite.
+
+    pysqlite defers BEGIN until the first DML statement, which breaks SAVEPOINTs
+    and upgrades a read lock to a write lock mid-transaction, where busy_timeout
+    cannot help. BEGIN IMMEDIATE takes the write lock up front instead.
+    """
+
+    @event.listens_for(sync_engine, "connect")
+    def disable_pysqlite_transactions(dbapi_connection, connection_record):
+        dbapi_connection.isolation_level = None
+
+    @event.listens_for(sync_engine, "begin")
+    def emit_begin(conn):
+        conn.exec_driver_sql("BEGIN IMMEDIATE")
+
+
+# Mutating routes use the write engine, GET routes the read-only one
 engine: Engine = create_engine(settings.sql.get_url(), connect_args=connect_args)
+apply_storage_profile(engine)
+begin_immediate(engine)
+
+read_engine: Engine = create_engine(settings.sql.get_url(), connect_args=connect_args)
+apply_storage_profile(read_engine, read_only=True)
 
 Base = declarative_base()
 
 
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+ReadSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=read_engine)
+
+
+# Async engine is only built in async mode so aiosqlite stays an opt-in driver
+async_engine: AsyncEngine | None = None
+AsyncSessionLocal: async_sessionmaker[AsyncSession] | None = None
+
+if settings.sql.mode == "async":
+    async_engine = create_async_engine(settings.sql.get_async_url())
+    apply_storage_profile(async_engine.sync_engine)
+    AsyncSessionLocal = async_sessionmaker(
+        bind=async_engine, autoflush=False, expire_on_commit=False
+    )
 
 
 # Dependency
@@ -32,3 +87,21 @@ def get_sql() -> Generator[Session, Any, None]:
         yield session
     finally:
         session.close()
+
+
+# Read-only dependency
+def get_read_sql() -> Generator[Session, Any, None]:
+    session: Session = ReadSessionLocal()
+    try:
+        yield session
+    finally:
+        session.close()
+
+
+# Async dependency
+async def get_async_sql() -> AsyncGenerator[AsyncSession, None]:
+    if AsyncSessionLocal is None:
+        raise RuntimeError('Async database layer requires sql__mode="async"')
+
+    async with AsyncSessionLocal() as session:
+        yield session
@@ -0,0 +1,117 @@
+"""Profile the cold-start import of the API and enforce the startup budget.
+
+Usage: python -m app.import_profile [--budget-ms MS] [--top N] [--module NAME]
+
+Imports the app in a fresh interpreter with `-X importtime`, prints the most
+expensive modules and packages and exits with status 1 when the import takes
+longer than the budget (startup__import_budget_ms) or when one of the optional
+heavy modules is pulled in at startup.
+"""
+
+import argparse
+import re
+import subprocess
+import sys
+from collections import defaultdict
+from dataclasses import dataclass
+
+from app.config import settings
+
+# Only needed by CLI commands or on first use, never at worker startup
+LAZY_MODULES: tuple[str, ...] = (
+    "passlib",
+    "sqlalchemy_schemadisplay",
+    "pydot",
+    "alembic",
+    "pyarrow",
+)
+
+IMPORTTIME_LINE = re.compile(r"^import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)$")
+
+
+@dataclass
+class ModuleCost:
+    name: str
+    self_us: int
+    cumulative_us: int
+    depth: int
+
+
+def profile_imports(module: str) -> list[ModuleCost]:
+    completed = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True,
+        text=True,
+        check=False,
+    )
+    if completed.returncode != 0:
+        sys.stderr.write(completed.stderr)
+        raise SystemExit(f"Importing {module} failed")
+
+    costs = []
+    for line in completed.stderr.splitlines():
+        match = IMPORTTIME_LINE.match(line)
+        if match is None:
+            continue
+        self_us, cumulative_us, indent, name = match.groups()
+        costs.append(
+            ModuleCost(name, int(self_us), int(cumulative_us), len(indent) // 2)
+        )
+    return costs
+
+
+def report(costs: list[ModuleCost], module: str, top: int) -> float:
+    total_us = sum(cost.self_us for cost in costs)
+
+    packages: dict[str, int] = defaultdict(int)
+    for cost in costs:
+        packages[cost.name.split(".")[0]] += cost.self_us
+
+    print(f"Importing {module} took {total_us / 1000:.1f} ms\n")
+    print(f"{'self ms':>9} {'cum ms':>9}  module")
+    for cost in sorted(costs, key=lambda c: c.self_us, reverse=True)[:top]:
+        print(
+            f"{cost.self_us / 1000:9.1f} {cost.cumulative_us / 1000:9.1f}  {cost.name}"
+        )
+
+    print(f"\n{'self ms':>9}  package")
+    for package, self_us in sorted(
+        packages.items(), key=lambda item: item[1], reverse=True
+    )[:top]:
+        print(f"{self_us / 1000:9.1f}  {package}")
+
+    return total_us / 1000
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--budget-ms", type=float, default=settings.startup.import_budget_ms
+    )
+    parser.add_argument("--top", type=int, default=20)
+    parser.add_argument("--module", default="app.main")
+    args = parser.parse_args()
+
+    costs = profile_imports(args.module)
+    total_ms = report(costs, args.module, args.top)
+
+    failures = []
+    imported = {cost.name.split(".")[0] for cost in costs}
+    eager = sorted(imported.intersection(LAZY_MODULES))
+    if eager:
+        failures.append(f"lazy modules imported at startup: {', '.join(eager)}")
+    if total_ms > args.budget_ms:
+        failures.append(
+            f"startup import {total_ms:.1f} ms exceeds budget {args.budget_ms:.0f} ms"
+        )
+
+    if failures:
+        for failure in failures:
+            print(f"FAIL: {failure}", file=sys.stderr)
+        raise SystemExit(1)
+
+    print(f"\nOK: within the {args.budget_ms:.0f} ms budget")
+
+
+if __name__ == "__main__":
+    main()
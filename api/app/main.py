@@ -1,7 +1,7 @@
 from fastapi import FastAPI
 from app import models
 from app.database import engine
-from sqlalchemy_schemadisplay import create_schema_graph
+from app.versioning import ETagMiddleware
 from fastapi.middleware.cors import CORSMiddleware
 
 from app.src.routers import router as api_router
@@ -9,15 +9,7 @@ from app.src.auth.routes import router as auth_router
 
 # Create the database tables
 models.Base.metadata.create_all(bind=engine)
-graph = create_schema_graph(
-    metadata=models.Base.metadata,
-    engine=engine,
-    show_datatypes=True,
-    show_indexes=True,
-    rankdir="LR",
-    font="Helvetica",
-)
-graph.write_png("db_schema.png")
+# Schema diagrams are rendered by `python -m app.schema_diagram`
 
 
 app = FastAPI(docs_url="/", redoc_url=None)
@@ -31,7 +23,9 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["ETag"],
 )
+app.add_middleware(ETagMiddleware)
 
 
 app.include_router(api_router)
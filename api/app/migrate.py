@@ -0,0 +1,33 @@
+"""Bring the database up to the latest schema revision.
+
+Usage: python -m app.migrate
+
+Run it once before starting the workers. Databases created by the old
+`create_all` call have no alembic_version table; they are stamped with the
+initial revision first so that only the newer migrations are applied.
+"""
+
+from pathlib import Path
+
+from alembic import command
+from alembic.config import Config
+from sqlalchemy import inspect
+
+from app.database import engine
+
+ALEMBIC_INI = Path(__file__).resolve().parents[1] / "alembic.ini"
+INITIAL_REVISION = "0001"
+
+
+def migrate() -> None:
+    config = Config(str(ALEMBIC_INI))
+
+    tables = set(inspect(engine).get_table_names())
+    if "users" in tables and "alembic_version" not in tables:
+        command.stamp(config, INITIAL_REVISION)
+
+    command.upgrade(config, "head")
+
+
+if __name__ == "__main__":
+    migrate()
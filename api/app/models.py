@@ -1,4 +1,14 @@
-from sqlalchemy import Column, Integer, String, Boolean, DateTime, Date, ForeignKey
+from sqlalchemy import (
+    Column,
+    Integer,
+    String,
+    Boolean,
+    DateTime,
+    Date,
+    Float,
+    ForeignKey,
+    Index,
+)
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import relationship
 
@@ -17,6 +27,7 @@ class Role(Base):
 
 class User(Base):
     __tablename__ = "users"
+    __table_args__ = (Index("ix_users_role_id", "role_id"),)
 
     user_id = Column(Integer, primary_key=True, nullable=False)
     username = Column(String, nullable=False, unique=True)
@@ -39,6 +50,10 @@ class User(Base):
 
 class Course(Base):
     __tablename__ = "courses"
+    __table_args__ = (
+        Index("ix_courses_teacher_id", "teacher_id"),
+        Index("ix_courses_category_id", "category_id"),
+    )
 
     course_id = Column(Integer, primary_key=True, nullable=False)
     teacher_id = Column(Integer, ForeignKey("users.user_id"), nullable=False)
@@ -56,6 +71,7 @@ class Course(Base):
 
 class Task(Base):
     __tablename__ = "tasks"
+    __table_args__ = (Index("ix_tasks_course_id_is_active", "course_id", "is_active"),)
 
     task_id = Column(Integer, primary_key=True, nullable=False)
     course_id = Column(Integer, ForeignKey("courses.course_id"), nullable=False)
@@ -69,6 +85,12 @@ class Task(Base):
 
 class Enrollment(Base):
     __tablename__ = "enrollments"
+    __table_args__ = (
+        Index("ix_enrollments_student_id_is_active", "student_id", "is_active"),
+        Index("ix_enrollments_course_id_is_active", "course_id", "is_active"),
+        Index("ix_enrollments_assigner_id", "assigner_id"),
+        Index("ix_enrollments_enrolled_at", "enrolled_at"),
+    )
 
     enrollment_id = Column(Integer, primary_key=True, nullable=False)
     student_id = Column(Integer, ForeignKey("users.user_id"), nullable=False)
@@ -78,6 +100,9 @@ class Enrollment(Base):
     enrolled_at = Column(Date, nullable=False)
     deadline = Column(Date, nullable=True)
     is_active = Column(Boolean, nullable=False, default=True)
+    # Denormalized progress, maintained by app.src.enrollments.progress
+    completed_tasks = Column(Integer, nullable=False, default=0, server_default="0")
+    total_tasks = Column(Integer, nullable=False, default=0, server_default="0")
 
     student = relationship(
         "User", foreign_keys=[student_id], back_populates="student_enrollments"
@@ -91,6 +116,16 @@ class Enrollment(Base):
 
 class TaskCompletion(Base):
     __tablename__ = "task_completions"
+    __table_args__ = (
+        Index(
+            "ux_task_completions_enrollment_id_task_id",
+            "enrollment_id",
+            "task_id",
+            unique=True,
+        ),
+        Index("ix_task_completions_task_id", "task_id"),
+        Index("ix_task_completions_completed_at", "completed_at"),
+    )
 
     task_completion_id = Column(Integer, primary_key=True, nullable=False)
     enrollment_id = Column(
@@ -112,4 +147,50 @@ class Category(Base):
     description = Column(String, nullable=True)
     is_active = Column(Boolean, nullable=False, default=True)
 
-    courses = relationship("Course", back_populates="category")
\ No newline at end of file
+    courses = relationship("Course", back_populates="category")
+
+
+class CourseStats(Base):
+    """Per-course analytics rollup, maintained by app.src.analytics.rollups."""
+
+    __tablename__ = "course_stats"
+
+    course_id = Column(Integer, ForeignKey("courses.course_id"), primary_key=True)
+    # Active enrollments only
+    enrollments = Column(Integer, nullable=False, default=0, server_default="0")
+    completed_enrollments = Column(
+        Integer, nullable=False, default=0, server_default="0"
+    )
+    completion_seconds = Column(Integer, nullable=False, default=0, server_default="0")
+    # Sums of the enrollment progress counters
+    completed_tasks = Column(Integer, nullable=False, default=0, server_default="0")
+    total_tasks = Column(Integer, nullable=False, default=0, server_default="0")
+
+
+class CourseDeadlineStats(Base):
+    """Open (not completed) active enrollments per course and deadline."""
+
+    __tablename__ = "course_deadline_stats"
+
+    course_id = Column(Integer, ForeignKey("courses.course_id"), primary_key=True)
+    deadline = Column(Date, primary_key=True)
+    open_enrollments = Column(Integer, nullable=False, default=0, server_default="0")
+
+
+class TableVersion(Base):
+    """Change counter per table, bumped by app.versioning on every write."""
+
+    __tablename__ = "table_versions"
+
+    table_name = Column(String, primary_key=True)
+    version = Column(Integer, nullable=False, default=0, server_default="0")
+
+
+class TokenRevocation(Base):
+    """Access tokens of a user issued before `revoked_at` are no longer valid."""
+
+    __tablename__ = "token_revocations"
+
+    user_id = Column(Integer, ForeignKey("users.user_id"), primary_key=True)
+    # Epoch seconds, compared with the `iat` claim
+    revoked_at = Column(Float, nullable=False)
@@ -0,0 +1,139 @@
+import base64
+import binascii
+import json
+from collections.abc import Sequence
+from dataclasses import dataclass
+from datetime import date, datetime
+from typing import Any
+
+from fastapi import HTTPException
+from pydantic import BaseModel
+from sqlalchemy import and_, or_
+from sqlalchemy.orm import InstrumentedAttribute, Query
+
+DEFAULT_PAGE_LIMIT = 50
+MAX_PAGE_LIMIT = 500
+
+
+class Page[T](BaseModel):
+    items: list[T]
+    next_cursor: str | None = None
+
+
+@dataclass(frozen=True)
+class SortKey:
+    column: InstrumentedAttribute
+    descending: bool = False
+
+    def clause(self):
+        return self.column.desc() if self.descending else self.column.asc()
+
+
+def order_by_keys(query: Query, ordering: Sequence[SortKey]) -> Query:
+    return query.order_by(*(key.clause() for key in ordering))
+
+
+def encode_cursor(values: list[Any]) -> str:
+    raw = json.dumps(values, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> list[Any]:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode()))
+    except (binascii.Error, UnicodeDecodeError, ValueError) as e:
+        raise HTTPException(status_code=400, detail="Invalid cursor") from e
+
+    if not isinstance(values, list) or not values:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    return values
+
+
+def parse_bool(value: Any) -> bool:
+    if isinstance(value, bool):
+        return value
+    if isinstance(value, str) and value.lower() in ("true", "1", "false", "0"):
+        return value.lower() in ("true", "1")
+    raise ValueError(value)
+
+
+def column_value(column: InstrumentedAttribute, value: Any) -> Any:
+    """Convert a JSON/query-string value to the Python type of `column`.
+
+    Raises ValueError (or TypeError) when the value does not fit the column.
+    """
+    python_type = column.type.python_type
+    if python_type is bool:
+        return parse_bool(value)
+    if python_type is int:
+        if isinstance(value, bool):
+            raise ValueError(value)
+        return int(value)
+    if python_type is datetime:
+        return datetime.fromisoformat(value)
+    if python_type is date:
+        return date.fromisoformat(value)
+    if not isinstance(value, str):
+        raise ValueError(value)
+    return value
+
+
+def cursor_value(value: Any) -> Any:
+    if isinstance(value, date | datetime):
+        return value.isoformat()
+    return value
+
+
+def after_keys(keys: Sequence[SortKey], values: list[Any]):
+    """Rows strictly after `values` in the order given by `keys`."""
+    clauses = []
+    for position, key in enumerate(keys):
+        equal = [prior.column == values[i] for i, prior in enumerate(keys[:position])]
+        beyond = (
+            key.column < values[position]
+            if key.descending
+            else key.column > values[position]
+        )
+        clauses.append(and_(*equal, beyond))
+    return or_(*clauses)
+
+
+def keyset_paginate(
+    query: Query,
+    pk: InstrumentedAttribute,
+    cursor: str | None,
+    limit: int,
+    ordering: Sequence[SortKey] = (),
+) -> tuple[list[Any], str | None]:
+    """Return one page of `query` in `ordering` and the cursor of the next page.
+
+    The page is located with a comparison on the sort keys (the primary key
+    breaks ties) instead of `OFFSET`, so every page costs one index range scan
+    no matter how deep the client has paged. Sort columns must not be NULL.
+    """
+    keys = [key for key in ordering if key.column is not pk]
+    keys.append(next((key for key in ordering if key.column is pk), SortKey(pk)))
+
+    if cursor is not None:
+        values = decode_cursor(cursor)
+        if len(values) != len(keys):
+            raise HTTPException(status_code=400, detail="Invalid cursor")
+        try:
+            values = [
+                column_value(key.column, v)
+                for key, v in zip(keys, values, strict=True)
+            ]
+        except (TypeError, ValueError) as e:
+            raise HTTPException(status_code=400, detail="Invalid cursor") from e
+        query = query.filter(after_keys(keys, values))
+
+    # One extra row tells us whether another page exists without a COUNT(*).
+    rows = order_by_keys(query, keys).limit(limit + 1).all()
+    if len(rows) <= limit:
+        return rows, None
+
+    rows = rows[:limit]
+    return rows, encode_cursor(
+        [cursor_value(getattr(rows[-1], key.column.key)) for key in keys]
+    )
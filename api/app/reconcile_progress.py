@@ -0,0 +1,48 @@
+"""Check the denormalized enrollment progress counters against the source rows.
+
+Usage: python -m app.reconcile_progress [--fix]
+
+Prints every enrollment whose completed_tasks/total_tasks differ from a fresh
+count of tasks and task completions. With --fix the counters of those
+enrollments are rebuilt. Exits with status 1 when drift is found and not fixed.
+"""
+
+import argparse
+
+from app import models, versioning  # noqa: F401  bumps the table versions
+from app.database import SessionLocal
+from app.src.enrollments.progress import find_progress_drift, recount_progress
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--fix", action="store_true", help="rebuild drifted counters")
+    args = parser.parse_args()
+
+    with SessionLocal() as sql:
+        drift = find_progress_drift(sql)
+        for row in drift:
+            print(
+                f"enrollment {row.enrollment_id}: "
+                f"completed {row.completed_tasks} -> {row.expected_completed_tasks}, "
+                f"total {row.total_tasks} -> {row.expected_total_tasks}"
+            )
+
+        if not drift:
+            print("Progress counters are consistent")
+            return
+
+        if not args.fix:
+            print(f"{len(drift)} enrollments drifted, rerun with --fix to rebuild")
+            raise SystemExit(1)
+
+        recount_progress(
+            sql,
+            models.Enrollment.enrollment_id.in_([row.enrollment_id for row in drift]),
+        )
+        sql.commit()
+        print(f"Rebuilt progress counters of {len(drift)} enrollments")
+
+
+if __name__ == "__main__":
+    main()
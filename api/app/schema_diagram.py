@@ -0,0 +1,96 @@
+"""Render the database schema diagrams outside of application startup.
+
+Usage: python -m app.schema_diagram [--output-dir DIR] [--force]
+
+Writes db_schema.png (Graphviz) and db_schema.mmd (Mermaid). Both are cached
+by a hash of models.Base.metadata and only re-rendered when the schema changes.
+"""
+
+import argparse
+import hashlib
+from pathlib import Path
+
+from sqlalchemy import MetaData
+
+from app import models
+
+PNG_NAME = "db_schema.png"
+MERMAID_NAME = "db_schema.mmd"
+HASH_NAME = "db_schema.sha256"
+
+
+def metadata_fingerprint(metadata: MetaData) -> str:
+    digest = hashlib.sha256()
+    for table in sorted(metadata.tables.values(), key=lambda t: t.name):
+        digest.update(f"table {table.name}\n".encode())
+        for column in table.columns:
+            targets = sorted(fk.target_fullname for fk in column.foreign_keys)
+            digest.update(
+                f"column {column.name} {column.type} {column.nullable} "
+                f"{column.primary_key} {targets}\n".encode()
+            )
+        for index in sorted(table.indexes, key=lambda i: i.name or ""):
+            columns = [column.name for column in index.columns]
+            digest.update(f"index {index.name} {columns} {index.unique}\n".encode())
+    return digest.hexdigest()
+
+
+def render_png(metadata: MetaData, path: Path) -> None:
+    # Graphviz bindings are only needed here, never by the running app
+    from sqlalchemy_schemadisplay import create_schema_graph
+
+    from app.database import engine
+
+    graph = create_schema_graph(
+        metadata=metadata,
+        engine=engine,
+        show_datatypes=True,
+        show_indexes=True,
+        rankdir="LR",
+        font="Helvetica",
+    )
+    graph.write_png(str(path))
+
+
+def render_mermaid(metadata: MetaData, path: Path) -> None:
+    from app.create_mermaid import sqlalchemy_to_mermaid
+
+    path.write_text(sqlalchemy_to_mermaid(metadata) + "\n")
+
+
+def render(output_dir: Path, force: bool = False) -> bool:
+    """Re-render the diagrams when the schema changed, return whether it did."""
+    metadata = models.Base.metadata
+    fingerprint = metadata_fingerprint(metadata)
+    hash_path = output_dir / HASH_NAME
+    outputs = [output_dir / PNG_NAME, output_dir / MERMAID_NAME]
+
+    up_to_date = (
+        hash_path.exists()
+        and hash_path.read_text().strip() == fingerprint
+        and all(path.exists() for path in outputs)
+    )
+    if up_to_date and not force:
+        return False
+
+    output_dir.mkdir(parents=True, exist_ok=True)
+    render_png(metadata, output_dir / PNG_NAME)
+    render_mermaid(metadata, output_dir / MERMAID_NAME)
+    hash_path.write_text(fingerprint + "\n")
+    return True
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--output-dir", type=Path, default=Path())
+    parser.add_argument("--force", action="store_true", help="ignore the cache")
+    args = parser.parse_args()
+
+    if render(args.output_dir, force=args.force):
+        print(f"Schema diagrams written to {args.output_dir.resolve()}")
+    else:
+        print("Schema unchanged, diagrams are up to date")
+
+
+if __name__ == "__main__":
+    main()
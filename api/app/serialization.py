@@ -0,0 +1,124 @@
+from collections.abc import Sequence
+from typing import Any
+
+from fastapi import HTTPException, Response
+from pydantic import BaseModel
+from pydantic_core import to_json
+from sqlalchemy.orm import InstrumentedAttribute, Query
+
+from app.pagination import (
+    DEFAULT_PAGE_LIMIT,
+    SortKey,
+    keyset_paginate,
+    order_by_keys,
+)
+
+
+class Projection:
+    """The columns behind a response schema, selected as plain tuples.
+
+    Rows of `columns` are turned into dicts in the schema's field order and
+    encoded straight to JSON, skipping ORM entities and per-row
+    `model_validate`. Relationship fields are given as nested projections and
+    have to be joined by the query. `fields` narrows the projection to a
+    subset of the schema (sparse fieldsets).
+    """
+
+    def __init__(
+        self,
+        schema: type[BaseModel],
+        model: Any,
+        fields: list[str] | None = None,
+        **nested: "Projection",
+    ):
+        self.schema = schema
+        self.model = model
+        self.fields = list(schema.model_fields) if fields is None else fields
+        self.available_nested = nested
+        self.nested = {name: nested[name] for name in self.fields if name in nested}
+        self.columns: list = []
+        for name in self.fields:
+            if name in self.nested:
+                self.columns.extend(
+                    column.label(f"{name}_{column.key}")
+                    for column in self.nested[name].columns
+                )
+            else:
+                self.columns.append(getattr(model, name))
+
+    def restrict(self, fields: str | None) -> "Projection":
+        """Projection limited to the comma-separated `fields` query parameter."""
+        if fields is None:
+            return self
+
+        requested = {name.strip() for name in fields.split(",") if name.strip()}
+        if not requested:
+            raise HTTPException(status_code=400, detail="No fields requested")
+        unknown = requested.difference(self.schema.model_fields)
+        if unknown:
+            raise HTTPException(
+                status_code=400, detail=f"Unknown fields: {', '.join(sorted(unknown))}"
+            )
+
+        return Projection(
+            self.schema,
+            self.model,
+            [name for name in self.schema.model_fields if name in requested],
+            **self.available_nested,
+        )
+
+    def build(self, row, start: int = 0) -> tuple[dict[str, Any], int]:
+        item = {}
+        position = start
+        for name in self.fields:
+            if name in self.nested:
+                item[name], position = self.nested[name].build(row, position)
+            else:
+                item[name] = row[position]
+                position += 1
+        return item, position
+
+    def dump(self, rows) -> list[dict[str, Any]]:
+        return [self.build(row)[0] for row in rows]
+
+
+def json_response(content: Any) -> Response:
+    # Same bytes as FastAPI's JSONResponse: compact separators, UTF-8, ISO dates
+    return Response(content=to_json(content), media_type="application/json")
+
+
+def list_response(
+    query: Query,
+    projection: Projection,
+    pk: InstrumentedAttribute,
+    cursor: str | None,
+    limit: int | None,
+    not_found_detail: str | None = None,
+    ordering: Sequence[SortKey] = (),
+) -> Response:
+    """Serialize a collection endpoint, plain list or `Page`, from column rows."""
+    if cursor is None and limit is None:
+        rows = order_by_keys(query, ordering).all()
+        if not rows and not_found_detail is not None:
+            raise HTTPException(status_code=404, detail=not_found_detail)
+        return json_response(projection.dump(rows))
+
+    # The cursor is built from the sort keys and the primary key, even when
+    # they are not returned
+    selected = set(projection.fields).difference(projection.nested)
+    for column in dict.fromkeys([key.column for key in ordering] + [pk]):
+        if column.key not in selected:
+            query = query.add_columns(column)
+    rows, next_cursor = keyset_paginate(
+        query, pk, cursor, limit or DEFAULT_PAGE_LIMIT, ordering
+    )
+    return json_response({"items": projection.dump(rows), "next_cursor": next_cursor})
+
+
+def detail_response(
+    query: Query, projection: Projection, not_found_detail: str
+) -> Response:
+    row = query.first()
+    if row is None:
+        raise HTTPException(status_code=404, detail=not_found_detail)
+    return json_response(projection.build(row)[0])
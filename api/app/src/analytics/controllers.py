@@ -0,0 +1,117 @@
+from datetime import date
+
+from fastapi import HTTPException
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+
+from app import models
+from app.src.analytics.schemas import CategoryStatsResponse, CourseStatsResponse
+
+SECONDS_PER_DAY = 86400
+
+ROLLUP_COLUMNS = (
+    "enrollments",
+    "completed_enrollments",
+    "completion_seconds",
+    "completed_tasks",
+    "total_tasks",
+)
+
+
+def summed_rollup_columns() -> list:
+    return [
+        func.coalesce(func.sum(getattr(models.CourseStats, column)), 0).label(column)
+        for column in ROLLUP_COLUMNS
+    ]
+
+
+def overdue_enrollments(sql: Session, *criteria) -> int:
+    return sql.execute(
+        select(func.coalesce(func.sum(models.CourseDeadlineStats.open_enrollments), 0))
+        .join(
+            models.Course,
+            models.Course.course_id == models.CourseDeadlineStats.course_id,
+        )
+        .where(models.CourseDeadlineStats.deadline < date.today(), *criteria)
+    ).scalar_one()
+
+
+def build_stats(rollup, overdue: int) -> dict:
+    def ratio(part: int, whole: int) -> float | None:
+        return part / whole if whole else None
+
+    average_seconds = ratio(rollup.completion_seconds, rollup.completed_enrollments)
+    return {
+        "enrollments": rollup.enrollments,
+        "completed_enrollments": rollup.completed_enrollments,
+        "completion_rate": ratio(rollup.completed_enrollments, rollup.enrollments),
+        "average_completion_days": (
+            None if average_seconds is None else average_seconds / SECONDS_PER_DAY
+        ),
+        "overdue_enrollments": overdue,
+        "completed_tasks": rollup.completed_tasks,
+        "total_tasks": rollup.total_tasks,
+        "task_completion_rate": ratio(rollup.completed_tasks, rollup.total_tasks),
+    }
+
+
+def get_course_stats(sql: Session, course_id: int) -> CourseStatsResponse:
+    try:
+        course: models.Course | None = sql.get(models.Course, course_id)
+        if course is None or not course.is_active:
+            raise HTTPException(status_code=404, detail="Course not found")
+
+        rollup = sql.execute(
+            select(*summed_rollup_columns()).where(
+                models.CourseStats.course_id == course_id
+            )
+        ).one()
+        overdue = overdue_enrollments(sql, models.Course.course_id == course_id)
+
+        return CourseStatsResponse(course_id=course_id, **build_stats(rollup, overdue))
+
+    except HTTPException as e:
+        raise e
+
+    except Exception as e:
+        raise HTTPException(status_code=500, detail="Internal server error") from e
+
+
+def get_category_stats(sql: Session, category_id: int) -> CategoryStatsResponse:
+    try:
+        category: models.Category | None = sql.get(models.Category, category_id)
+        if category is None or not category.is_active:
+            raise HTTPException(status_code=404, detail="Category not found")
+
+        rollup = sql.execute(
+            select(
+                func.count(models.Course.course_id).label("courses"),
+                *summed_rollup_columns(),
+            )
+            .select_from(models.Course)
+            .outerjoin(
+                models.CourseStats,
+                models.CourseStats.course_id == models.Course.course_id,
+            )
+            .where(
+                models.Course.category_id == category_id,
+                models.Course.is_active == True,  # noqa: E712
+            )
+        ).one()
+        overdue = overdue_enrollments(
+            sql,
+            models.Course.category_id == category_id,
+            models.Course.is_active == True,  # noqa: E712
+        )
+
+        return CategoryStatsResponse(
+            category_id=category_id,
+            courses=rollup.courses,
+            **build_stats(rollup, overdue),
+        )
+
+    except HTTPException as e:
+        raise e
+
+    except Exception as e:
+        raise HTTPException(status_code=500, detail="Internal server error") from e
@@ -0,0 +1,171 @@
+from collections import defaultdict
+from collections.abc import Iterable
+from dataclasses import dataclass
+from datetime import date, datetime, time
+
+from sqlalchemy import Select, func, select, update
+from sqlalchemy.dialects.sqlite import insert
+from sqlalchemy.orm import Session
+
+from app import models
+
+
+@dataclass(frozen=True)
+class EnrollmentSnapshot:
+    """What one active enrollment contributes to its course rollup."""
+
+    course_id: int
+    completed: bool
+    completion_seconds: int
+    open_deadline: date | None
+
+
+def enrollment_snapshot(enrollment) -> EnrollmentSnapshot | None:
+    """Snapshot an Enrollment row, or any object carrying its columns."""
+    if not enrollment.is_active:
+        return None
+
+    if enrollment.completed_at is None:
+        return EnrollmentSnapshot(enrollment.course_id, False, 0, enrollment.deadline)
+
+    started = datetime.combine(enrollment.enrolled_at, time())
+    completed_at = enrollment.completed_at.replace(tzinfo=None)
+    seconds = max(int((completed_at - started).total_seconds()), 0)
+    return EnrollmentSnapshot(enrollment.course_id, True, seconds, None)
+
+
+def apply_enrollment(
+    sql: Session, snapshot: EnrollmentSnapshot | None, sign: int
+) -> None:
+    """Add (sign=1) or remove (sign=-1) an enrollment's contribution."""
+    apply_enrollments(sql, [snapshot], sign)
+
+
+def apply_enrollments(
+    sql: Session, snapshots: Iterable[EnrollmentSnapshot | None], sign: int
+) -> None:
+    """Apply many contributions with one upsert per rollup table."""
+    courses: dict[int, list[int]] = defaultdict(lambda: [0, 0, 0])
+    deadlines: dict[tuple[int, date], int] = defaultdict(int)
+    for snapshot in snapshots:
+        if snapshot is None:
+            continue
+        totals = courses[snapshot.course_id]
+        totals[0] += sign
+        totals[1] += sign if snapshot.completed else 0
+        totals[2] += sign * snapshot.completion_seconds
+        if snapshot.open_deadline is not None:
+            deadlines[snapshot.course_id, snapshot.open_deadline] += sign
+
+    if courses:
+        stats = insert(models.CourseStats)
+        sql.execute(
+            stats.on_conflict_do_update(
+                index_elements=[models.CourseStats.course_id],
+                set_={
+                    column: getattr(models.CourseStats, column)
+                    + stats.excluded[column]
+                    for column in (
+                        "enrollments",
+                        "completed_enrollments",
+                        "completion_seconds",
+                    )
+                },
+            ),
+            [
+                {
+                    "course_id": course_id,
+                    "enrollments": enrollments,
+                    "completed_enrollments": completed,
+                    "completion_seconds": seconds,
+                }
+                for course_id, (enrollments, completed, seconds) in courses.items()
+            ],
+        )
+
+    if deadlines:
+        bucket = insert(models.CourseDeadlineStats)
+        sql.execute(
+            bucket.on_conflict_do_update(
+                index_elements=[
+                    models.CourseDeadlineStats.course_id,
+                    models.CourseDeadlineStats.deadline,
+                ],
+                set_={
+                    "open_enrollments": models.CourseDeadlineStats.open_enrollments
+                    + bucket.excluded.open_enrollments
+                },
+            ),
+            [
+                {"course_id": course_id, "deadline": deadline, "open_enrollments": n}
+                for (course_id, deadline), n in deadlines.items()
+            ],
+        )
+
+
+def bump_completed_tasks(sql: Session, enrollment_id: int, delta: int) -> None:
+    course_id = (
+        select(models.Enrollment.course_id)
+        .where(
+            models.Enrollment.enrollment_id == enrollment_id,
+            models.Enrollment.is_active == True,  # noqa: E712
+        )
+        .scalar_subquery()
+    )
+    sql.execute(
+        update(models.CourseStats)
+        .where(models.CourseStats.course_id == course_id)
+        .values(completed_tasks=models.CourseStats.completed_tasks + delta)
+        .execution_options(synchronize_session=False)
+    )
+
+
+def bump_total_tasks(sql: Session, course_id: int, delta: int) -> None:
+    # Every active enrollment of the course gains `delta` tasks
+    sql.execute(
+        update(models.CourseStats)
+        .where(models.CourseStats.course_id == course_id)
+        .values(
+            total_tasks=models.CourseStats.total_tasks
+            + delta * models.CourseStats.enrollments
+        )
+        .execution_options(synchronize_session=False)
+    )
+
+
+def refresh_task_totals(sql: Session, course_ids: Iterable[int] | Select) -> None:
+    """Re-sum the progress counters of the given courses' active enrollments."""
+    if not isinstance(course_ids, Select):
+        course_ids = list(course_ids)
+
+    sql.execute(
+        insert(models.CourseStats)
+        .from_select(
+            ["course_id"],
+            select(models.Course.course_id).where(
+                models.Course.course_id.in_(course_ids)
+            ),
+        )
+        .on_conflict_do_nothing()
+    )
+
+    def active_sum(column):
+        return (
+            select(func.coalesce(func.sum(column), 0))
+            .where(
+                models.Enrollment.course_id == models.CourseStats.course_id,
+                models.Enrollment.is_active == True,  # noqa: E712
+            )
+            .correlate(models.CourseStats)
+            .scalar_subquery()
+        )
+
+    sql.execute(
+        update(models.CourseStats)
+        .where(models.CourseStats.course_id.in_(course_ids))
+        .values(
+            completed_tasks=active_sum(models.Enrollment.completed_tasks),
+            total_tasks=active_sum(models.Enrollment.total_tasks),
+        )
+        .execution_options(synchronize_session=False)
+    )
@@ -0,0 +1,34 @@
+from typing import Annotated
+
+from app.annotations import ID_PATH_ANNOTATION
+from app.src.analytics.controllers import get_category_stats, get_course_stats
+from app.src.analytics.schemas import CategoryStatsResponse, CourseStatsResponse
+from fastapi import APIRouter, Depends
+
+from sqlalchemy.orm import Session
+
+from app.database import get_read_sql
+
+router = APIRouter(tags=["Analytics"])
+
+
+@router.get(
+    "/courses/{course_id}/stats",
+    summary="Get course analytics",
+    operation_id="getCourseStats",
+)
+def endp_get_course_stats(
+    sql: Annotated[Session, Depends(get_read_sql)], course_id: ID_PATH_ANNOTATION
+) -> CourseStatsResponse:
+    return get_course_stats(sql=sql, course_id=course_id)
+
+
+@router.get(
+    "/categories/{category_id}/stats",
+    summary="Get category analytics",
+    operation_id="getCategoryStats",
+)
+def endp_get_category_stats(
+    sql: Annotated[Session, Depends(get_read_sql)], category_id: ID_PATH_ANNOTATION
+) -> CategoryStatsResponse:
+    return get_category_stats(sql=sql, category_id=category_id)
@@ -0,0 +1,21 @@
+from pydantic import BaseModel
+
+
+class StatsBase(BaseModel):
+    enrollments: int
+    completed_enrollments: int
+    completion_rate: float | None = None
+    average_completion_days: float | None = None
+    overdue_enrollments: int
+    completed_tasks: int
+    total_tasks: int
+    task_completion_rate: float | None = None
+
+
+class CourseStatsResponse(StatsBase):
+    course_id: int
+
+
+class CategoryStatsResponse(StatsBase):
+    category_id: int
+    courses: int
@@ -1,61 +1,198 @@
+import time
 from datetime import timedelta
 from typing import Annotated
-from app.src.auth.schemas import Token
-from app.src.auth.utils import create_access_token, verify_password
+from app.src.auth.revocations import revocations
+from app.src.auth.schemas import Token, TokenClaims
+from app.src.auth.pool import password_pool
+from app.src.auth.utils import create_access_token
 from app.src.users.schemas import UserResponse
 from fastapi import Depends, HTTPException, status
+from fastapi.concurrency import run_in_threadpool
 from fastapi.security import OAuth2PasswordBearer
 import jwt
-from sqlalchemy.orm import Session
+from pydantic import ValidationError
+from sqlalchemy.orm import joinedload, selectinload
 from sqlalchemy import select
 from app import models
-from app.database import get_sql
+from app.cache import GenerationCache, build_cache
+from app.database import AsyncSessionLocal, ReadSessionLocal
 from app.config import settings
 
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/auth/token")
 
+ADMIN_ROLE = "admin"
 
-def authenticate_user(sql: Session, username: str, password: str) -> None | models.User:
-    user: models.User | None = sql.execute(
-        select(models.User).where(models.User.username == username)
-    ).scalar_one_or_none()
-    if not user or not verify_password(password, user.password_hash):
-        return None
-    return user
+# `typ` claim of the two kinds of JWT issued by /auth/token and /auth/refresh
+ACCESS_TOKEN = "access"
+REFRESH_TOKEN = "refresh"
 
+# Validated users by bearer token (which carries the subject). Any write to
+# these tables, e.g. update_user deactivating a user or changing their role,
+# evicts them in every worker.
+USER_TABLES = ("users", "roles")
+user_cache: GenerationCache[UserResponse] | None = (
+    build_cache(settings.cache.user_max_entries, settings.cache.user_ttl_seconds)
+    if settings.cache.user_enabled
+    else None
+)
 
-async def get_current_user(
-    token: Annotated[str, Depends(oauth2_scheme)],
-    sql: Annotated[Session, Depends(get_sql)],
-) -> UserResponse:
-    credentials_exception = HTTPException(
+
+def credentials_exception() -> HTTPException:
+    return HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="Could not validate credentials",
         headers={"WWW-Authenticate": "Bearer"},
     )
+
+
+def decode_token(token: str, token_type: str) -> dict:
     try:
         payload = jwt.decode(
-            token, settings.auth.secret_key, algorithms=[settings.auth.algorithm]
+            token,
+            settings.auth.secret_key,
+            algorithms=[settings.auth.algorithm],
+            options={"require": ["sub", "uid", "iat", "exp"]},
         )
-        username = payload.get("sub")
-        if username is None:
-            raise credentials_exception
     except jwt.PyJWTError as e:
-        raise credentials_exception from e
+        raise credentials_exception() from e
+    # A refresh token must never authorize a request, and vice versa
+    if payload.get("typ") != token_type:
+        raise credentials_exception()
+    return payload
+
+
+def access_claims(token: str) -> TokenClaims:
+    payload = decode_token(token, ACCESS_TOKEN)
+    try:
+        return TokenClaims(
+            user_id=payload["uid"],
+            username=payload["sub"],
+            role_id=payload["role_id"],
+            role=payload["role"],
+            issued_at=payload["iat"],
+            expires_at=payload["exp"],
+        )
+    except (KeyError, ValidationError) as e:
+        raise credentials_exception() from e
+
 
-    user: models.User | None = sql.execute(
-        select(models.User).where(models.User.username == username)
-    ).scalar_one_or_none()
-    if user is None:
-        raise credentials_exception
-    return UserResponse.model_validate(user)
+def load_user(**criteria) -> models.User | None:
+    with ReadSessionLocal() as sql:
+        return sql.execute(
+            select(models.User)
+            .options(joinedload(models.User.role))
+            .filter_by(**criteria)
+        ).scalar_one_or_none()
 
 
-def get_access_token(sql, username, password):
-    user: None | models.User = authenticate_user(
-        sql, username, password
+async def load_user_async(**criteria) -> models.User | None:
+    if AsyncSessionLocal is None:
+        raise RuntimeError('Async database layer requires sql__mode="async"')
+
+    async with AsyncSessionLocal() as sql:
+        # AsyncSession cannot lazy-load, so the role is fetched up front
+        return (
+            await sql.execute(
+                select(models.User)
+                .options(selectinload(models.User.role))
+                .filter_by(**criteria)
+            )
+        ).scalar_one_or_none()
+
+
+async def find_user(**criteria) -> models.User | None:
+    if settings.sql.mode == "async":
+        return await load_user_async(**criteria)
+    # Sync mode queries on the threadpool instead of blocking the event loop
+    return await run_in_threadpool(load_user, **criteria)
+
+
+async def authenticate_user(username: str, password: str) -> None | models.User:
+    user = await find_user(username=username)
+
+    # bcrypt runs on the password pool, never on the event loop
+    if not user or not await password_pool.verify(password, user.password_hash):
+        return None
+    if not user.is_active:
+        return None
+    return user
+
+
+async def get_current_claims(
+    token: Annotated[str, Depends(oauth2_scheme)],
+) -> TokenClaims:
+    """Authorize a request from the signed claims of its access token alone.
+
+    The only state consulted is the in-memory revocation list, so there is no
+    query and no threadpool hop unless another worker revoked tokens since.
+    """
+    claims = access_claims(token)
+    await revocations.refresh()
+    if revocations.is_revoked(claims.user_id, claims.issued_at):
+        raise credentials_exception()
+    return claims
+
+
+async def get_current_user(
+    token: Annotated[str, Depends(oauth2_scheme)],
+    claims: Annotated[TokenClaims, Depends(get_current_claims)],
+) -> UserResponse:
+    """Load the full profile of the token's user, for routes that need it.
+
+    A cache hit costs one dict lookup and a few shared-memory reads on top of
+    the claims check. Entries never outlive the token.
+    """
+    generation: tuple[int, ...] = ()
+    if user_cache is not None:
+        cached, generation = user_cache.lookup("get_current_user", token, USER_TABLES)
+        if cached is not None:
+            return cached
+
+    user = await find_user(user_id=claims.user_id)
+    if user is None or not user.is_active:
+        raise credentials_exception()
+    response = UserResponse.model_validate(user)
+
+    if user_cache is not None:
+        user_cache.store(
+            token,
+            USER_TABLES,
+            generation,
+            response,
+            ttl_seconds=claims.expires_at - time.time(),
+        )
+    return response
+
+
+def get_current_admin(
+    claims: Annotated[TokenClaims, Depends(get_current_claims)],
+) -> TokenClaims:
+    if claims.role != ADMIN_ROLE:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN, detail="Admin role required"
+        )
+    return claims
+
+
+def sign_tokens(user_claims: dict) -> tuple[str, str]:
+    access_token = create_access_token(
+        {**user_claims, "typ": ACCESS_TOKEN},
+        timedelta(minutes=settings.auth.access_token_expire_minutes),
     )
+    refresh_token = create_access_token(
+        {
+            "sub": user_claims["sub"],
+            "uid": user_claims["uid"],
+            "iat": user_claims["iat"],
+            "typ": REFRESH_TOKEN,
+        },
+        timedelta(days=settings.auth.refresh_token_expire_days),
+    )
+    return access_token, refresh_token
+
+
+async def issue_token(user: None | models.User) -> Token:
     if not user:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -63,8 +200,33 @@ def get_access_token(sql, username, password):
             headers={"WWW-Authenticate": "Bearer"},
         )
 
-    access_token_expires = timedelta(minutes=settings.auth.access_token_expire_minutes)
-    access_token = create_access_token(
-        data={"sub": user.username}, expires_delta=access_token_expires
+    user_claims = {
+        "sub": user.username,
+        "uid": user.user_id,
+        "role_id": user.role_id,
+        "role": user.role.name,
+        # Fractional, so a token issued right after a revocation is not revoked
+        "iat": time.time(),
+    }
+    access_token, refresh_token = await password_pool.run(sign_tokens, user_claims)
+    return Token(
+        access_token=access_token, token_type="bearer", refresh_token=refresh_token
     )
-    return Token(access_token=access_token, token_type="bearer")
\ No newline at end of file
+
+
+async def get_access_token(username: str, password: str) -> Token:
+    user: None | models.User = await authenticate_user(username, password)
+    return await issue_token(user)
+
+
+async def refresh_access_token(refresh_token: str) -> Token:
+    """Trade a refresh token for new tokens carrying the user's current claims.
+
+    The user is read from the database, so a deactivated user cannot refresh
+    and a changed role lands in the new access token.
+    """
+    payload = decode_token(refresh_token, REFRESH_TOKEN)
+    user = await find_user(user_id=payload["uid"])
+    if user is None or not user.is_active:
+        raise credentials_exception()
+    return await issue_token(user)
@@ -0,0 +1,143 @@
+"""Role based authorization of the private routers.
+
+What each role may do is a bitmask of `Permission`, looked up by role name in
+`ROLE_PERMISSIONS`; a role missing from it (or renamed away from it) gets no
+permission. Every worker keeps the resulting role id -> mask matrix in memory
+and rebuilds it when the `roles` table changes (see app.cache.TableMirror), so
+a request is checked against the role id of its access token with one dict
+lookup and one AND, without a query.
+"""
+
+import functools
+import operator
+from enum import IntFlag
+from typing import Annotated
+
+from fastapi import Depends, HTTPException, Request, status
+from sqlalchemy import select
+
+from app import models
+from app.cache import TableMirror
+from app.config import settings
+from app.database import ReadSessionLocal
+from app.src.auth.controllers import get_current_claims
+from app.src.auth.schemas import TokenClaims
+
+ROLE_TABLES = ("roles",)
+
+# Methods that only read, checked against the read permission of a router
+SAFE_METHODS = frozenset({"GET", "HEAD", "OPTIONS"})
+
+
+class Permission(IntFlag):
+    READ_CATEGORIES = 1 << 0
+    WRITE_CATEGORIES = 1 << 1
+    READ_COURSES = 1 << 2
+    WRITE_COURSES = 1 << 3
+    READ_TASKS = 1 << 4
+    WRITE_TASKS = 1 << 5
+    READ_ENROLLMENTS = 1 << 6
+    WRITE_ENROLLMENTS = 1 << 7
+    READ_TASK_COMPLETIONS = 1 << 8
+    WRITE_TASK_COMPLETIONS = 1 << 9
+    READ_ANALYTICS = 1 << 10
+    READ_EXPORTS = 1 << 11
+    WRITE_EXPORTS = 1 << 12
+    READ_CACHE = 1 << 13
+    READ_ROLES = 1 << 14
+    WRITE_ROLES = 1 << 15
+    READ_USERS = 1 << 16
+    WRITE_USERS = 1 << 17
+    # Pending task completions of the caller's own enrollments, see owner_scope
+    WRITE_OWN_TASK_COMPLETIONS = 1 << 18
+
+
+ALL_PERMISSIONS = functools.reduce(operator.or_, Permission)
+
+STUDENT_PERMISSIONS = (
+    Permission.READ_CATEGORIES
+    | Permission.READ_COURSES
+    | Permission.READ_TASKS
+    | Permission.READ_ENROLLMENTS
+    | Permission.READ_TASK_COMPLETIONS
+    | Permission.WRITE_OWN_TASK_COMPLETIONS
+)
+
+TEACHER_PERMISSIONS = (
+    STUDENT_PERMISSIONS
+    | Permission.WRITE_CATEGORIES
+    | Permission.WRITE_COURSES
+    | Permission.WRITE_TASKS
+    | Permission.WRITE_ENROLLMENTS
+    | Permission.WRITE_TASK_COMPLETIONS
+    | Permission.READ_ANALYTICS
+    | Permission.READ_EXPORTS
+    | Permission.READ_ROLES
+    | Permission.READ_USERS
+)
+
+ROLE_PERMISSIONS: dict[str, Permission] = {
+    "admin": ALL_PERMISSIONS,
+    "teacher": TEACHER_PERMISSIONS,
+    "student": STUDENT_PERMISSIONS,
+}
+
+
+class PermissionMatrix(TableMirror[dict[int, Permission]]):
+    """Permission bitmask of every role, by role id."""
+
+    def load(self) -> dict[int, Permission]:
+        with ReadSessionLocal() as sql:
+            rows = sql.execute(select(models.Role.role_id, models.Role.name)).all()
+        return {
+            role_id: ROLE_PERMISSIONS.get(name, Permission(0))
+            for role_id, name in rows
+        }
+
+    def allows(self, role_id: int, required: Permission) -> bool:
+        granted = (self.value or {}).get(role_id, Permission(0))
+        return granted & required == required
+
+
+permission_matrix = PermissionMatrix(ROLE_TABLES, settings.auth.state_refresh_seconds)
+
+
+def authorize(read: Permission, write: Permission | None = None):
+    """Router dependency requiring `read` for safe methods and `write` otherwise.
+
+    Routers without write routes can leave out `write`.
+    """
+
+    async def check_permission(
+        request: Request,
+        claims: Annotated[TokenClaims, Depends(get_current_claims)],
+    ) -> None:
+        await permission_matrix.refresh()
+        if write is None or request.method in SAFE_METHODS:
+            required = read
+        else:
+            required = write
+        if not permission_matrix.allows(claims.role_id, required):
+            raise HTTPException(
+                status_code=status.HTTP_403_FORBIDDEN, detail="Permission denied"
+            )
+
+    return Depends(check_permission)
+
+
+def owner_scope(unrestricted: Permission):
+    """Route dependency giving the user id the caller's writes are limited to.
+
+    None when the caller's role has `unrestricted`, the caller's own user id
+    otherwise; the controller then only lets it touch that user's rows.
+    """
+
+    async def get_owner_id(
+        claims: Annotated[TokenClaims, Depends(get_current_claims)],
+    ) -> int | None:
+        await permission_matrix.refresh()
+        if permission_matrix.allows(claims.role_id, unrestricted):
+            return None
+        return claims.user_id
+
+    return get_owner_id
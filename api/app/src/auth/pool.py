@@ -0,0 +1,94 @@
+import asyncio
+import threading
+import time
+from collections.abc import Callable
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any
+
+from fastapi import HTTPException, status
+
+from app.config import settings
+from app.src.auth.schemas import PasswordPoolStats
+from app.src.auth.utils import verify_password
+
+
+class PasswordPool:
+    """Bounded worker pool for password hashing/verification and token signing.
+
+    bcrypt takes 100-300 ms of CPU per call, so it must not run on the event
+    loop, nor on the shared threadpool that serves every sync endpoint. Jobs
+    run on `workers` dedicated threads (bcrypt releases the GIL while
+    hashing). At most `max_pending` jobs are admitted at once, running or
+    queued; beyond that the request is turned away with 503 instead of
+    queueing unboundedly during a login spike.
+    """
+
+    def __init__(self, workers: int, max_pending: int):
+        self.workers = workers
+        self.max_pending = max_pending
+        self._executor = ThreadPoolExecutor(workers, thread_name_prefix="password")
+        self._lock = threading.Lock()
+        self._pending = 0
+        self._running = 0
+        self._peak_queued = 0
+        self._completed = 0
+        self._rejected = 0
+        self._wait_seconds = 0.0
+
+    async def run[T](self, fn: Callable[..., T], *args: Any) -> T:
+        with self._lock:
+            if self._pending >= self.max_pending:
+                self._rejected += 1
+                raise HTTPException(
+                    status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                    detail="Too many concurrent logins, retry shortly",
+                    headers={"Retry-After": "1"},
+                )
+            self._pending += 1
+            self._peak_queued = max(self._peak_queued, self._pending - self._running)
+
+        submitted = time.perf_counter()
+
+        def job() -> T:
+            with self._lock:
+                self._running += 1
+                self._wait_seconds += time.perf_counter() - submitted
+            try:
+                return fn(*args)
+            finally:
+                with self._lock:
+                    self._running -= 1
+
+        future = self._executor.submit(job)
+        # Also runs when the caller went away and the job was cancelled unstarted
+        future.add_done_callback(self._finished)
+        return await asyncio.wrap_future(future)
+
+    def _finished(self, future: Future) -> None:
+        with self._lock:
+            self._pending -= 1
+            if not future.cancelled():
+                self._completed += 1
+
+    async def verify(self, plain_password: str, hashed_password: str) -> bool:
+        return await self.run(verify_password, plain_password, hashed_password)
+
+    def stats(self) -> PasswordPoolStats:
+        with self._lock:
+            return PasswordPoolStats(
+                workers=self.workers,
+                max_pending=self.max_pending,
+                running=self._running,
+                queued=self._pending - self._running,
+                peak_queued=self._peak_queued,
+                completed=self._completed,
+                rejected=self._rejected,
+                average_wait_ms=(
+                    self._wait_seconds / self._completed * 1000
+                    if self._completed
+                    else None
+                ),
+            )
+
+
+password_pool = PasswordPool(settings.auth.pool_workers, settings.auth.pool_max_pending)
@@ -0,0 +1,58 @@
+"""Revocation list for the stateless access tokens.
+
+Access tokens carry the user id and role as signed claims, so requests are
+authorized without touching the database. When a claim stops being true (the
+user is deactivated, renamed or moved to another role, or the role is
+renamed) the tokens issued to that user so far are revoked by a
+`token_revocations` row written in the same transaction. Every worker keeps
+the list in memory and reloads it when the table's shared generation moves
+(see app.cache), which costs a few memory reads per request.
+"""
+
+import time
+
+from sqlalchemy import Select, literal, select
+from sqlalchemy.dialects.sqlite import insert
+from sqlalchemy.orm import Session
+
+from app import models
+from app.cache import TableMirror
+from app.config import settings
+from app.database import ReadSessionLocal
+
+REVOCATIONS = models.TokenRevocation.__table__
+REVOCATION_TABLES = (REVOCATIONS.name,)
+
+
+def revoke_tokens(sql: Session, user_ids: Select) -> None:
+    """Revoke the access tokens issued so far to the users of `user_ids`."""
+    stmt = insert(REVOCATIONS).from_select(
+        ["user_id", "revoked_at"], user_ids.add_columns(literal(time.time()))
+    )
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[REVOCATIONS.c.user_id],
+        set_={"revoked_at": stmt.excluded.revoked_at},
+    )
+    sql.execute(stmt)
+
+
+class RevocationList(TableMirror[dict[int, float]]):
+    """In-memory copy of the revocations that can still matter."""
+
+    def load(self) -> dict[int, float]:
+        # Older revocations only concern tokens that have expired anyway
+        horizon = time.time() - settings.auth.access_token_expire_minutes * 60
+        with ReadSessionLocal() as sql:
+            rows = sql.execute(
+                select(REVOCATIONS.c.user_id, REVOCATIONS.c.revoked_at).where(
+                    REVOCATIONS.c.revoked_at > horizon
+                )
+            ).all()
+        return dict(rows)  # type: ignore[arg-type]
+
+    def is_revoked(self, user_id: int, issued_at: float) -> bool:
+        revoked_at = (self.value or {}).get(user_id)
+        return revoked_at is not None and issued_at <= revoked_at
+
+
+revocations = RevocationList(REVOCATION_TABLES, settings.auth.state_refresh_seconds)
@@ -1,27 +1,38 @@
 from typing import Annotated
-from app.src.auth.schemas import Token
+from app.src.auth.pool import password_pool
+from app.src.auth.schemas import PasswordPoolStats, RefreshRequest, Token
 from app.src.users.schemas import UserResponse
 from fastapi import APIRouter, Depends
 from fastapi.security import OAuth2PasswordRequestForm
-from sqlalchemy.orm import Session
-from app.database import get_sql
-from passlib.context import CryptContext  # Pro hashování hesel
 from app.src.auth.controllers import (
     get_access_token,
+    get_current_admin,
     get_current_user,
+    refresh_access_token,
 )
 
 router = APIRouter(tags=["Auth"], prefix="/auth")
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")  # Hashovací context
-
 
 @router.post("/token")
 async def login_for_access_token(
     form_data: Annotated[OAuth2PasswordRequestForm, Depends()],
-    sql: Annotated[Session, Depends(get_sql)],
 ) -> Token:
-    return get_access_token(sql, form_data.username, form_data.password)
+    return await get_access_token(form_data.username, form_data.password)
+
+
+@router.post("/refresh")
+async def refresh_token(data: RefreshRequest) -> Token:
+    return await refresh_access_token(data.refresh_token)
+
+
+@router.get(
+    "/password_pool",
+    summary="Get password pool load",
+    dependencies=[Depends(get_current_admin)],
+)
+def endp_get_password_pool_stats() -> PasswordPoolStats:
+    return password_pool.stats()
 
 
 @router.get("/users/me")
@@ -4,7 +4,35 @@ from pydantic import BaseModel
 class Token(BaseModel):
     access_token: str
     token_type: str
+    refresh_token: str | None = None
+
+
+class RefreshRequest(BaseModel):
+    refresh_token: str
+
+
+class TokenClaims(BaseModel):
+    """The signed claims of an access token, enough to authorize a request."""
+
+    user_id: int
+    username: str
+    role_id: int
+    role: str
+    issued_at: float
+    expires_at: float
 
 
 class TokenData(BaseModel):
-    username: str | None = None
\ No newline at end of file
+    username: str | None = None
+
+
+class PasswordPoolStats(BaseModel):
+    workers: int
+    max_pending: int
+    running: int
+    # Admitted jobs waiting for a worker
+    queued: int
+    peak_queued: int
+    completed: int
+    rejected: int
+    average_wait_ms: float | None = None
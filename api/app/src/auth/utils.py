@@ -1,8 +1,21 @@
 from datetime import timedelta, datetime
+from functools import cache
+from typing import TYPE_CHECKING
 import jwt
 
 from app.config import settings
 
+if TYPE_CHECKING:
+    from passlib.context import CryptContext
+
+
+@cache
+def get_pwd_context() -> "CryptContext":
+    # passlib is imported on first use so it stays off the worker startup path
+    from passlib.context import CryptContext
+
+    return CryptContext(schemes=["bcrypt"], deprecated="auto")  # Hashovací context
+
 
 def create_access_token(data: dict, expires_delta: timedelta | None = None) -> str:
     to_encode = data.copy()
@@ -16,4 +29,4 @@ def create_access_token(data: dict, expires_delta: timedelta | None = None) -> s
 def verify_password(plain_password, hashed_password):
     # FIXME: Zde je potřeba opravit ověření hesla. nemame zatím validoatr na hashování hesel
     return plain_password == hashed_password
-    # return pwd_context.verify(plain_password, hashed_password)
+    # return get_pwd_context().verify(plain_password, hashed_password)
@@ -0,0 +1,41 @@
+from app.cache import response_cache
+from app.config import settings
+from app.src.cache.schemas import CacheRouteStats, CacheStatsResponse
+
+
+def get_cache_stats() -> CacheStatsResponse:
+    if response_cache is None:
+        return CacheStatsResponse(
+            enabled=False,
+            entries=0,
+            max_entries=settings.cache.max_entries,
+            ttl_seconds=settings.cache.ttl_seconds,
+            evictions=0,
+            expirations=0,
+            invalidations=0,
+            routes=[],
+        )
+
+    routes = []
+    for route, stats in sorted(response_cache.route_stats().items()):
+        lookups = stats.hits + stats.misses
+        routes.append(
+            CacheRouteStats(
+                route=route,
+                hits=stats.hits,
+                misses=stats.misses,
+                hit_rate=stats.hits / lookups if lookups else None,
+                disabled=route in settings.cache.disabled_routes,
+            )
+        )
+
+    return CacheStatsResponse(
+        enabled=True,
+        entries=len(response_cache),
+        max_entries=response_cache.max_entries,
+        ttl_seconds=response_cache.ttl_seconds,
+        evictions=response_cache.evictions,
+        expirations=response_cache.expirations,
+        invalidations=response_cache.invalidations,
+        routes=routes,
+    )
@@ -0,0 +1,16 @@
+from app.src.auth.controllers import get_current_admin
+from app.src.cache.controllers import get_cache_stats
+from app.src.cache.schemas import CacheStatsResponse
+from fastapi import APIRouter, Depends
+
+router = APIRouter(prefix="/cache", tags=["Cache"])
+
+
+@router.get(
+    "/stats",
+    summary="Get response cache hit and miss statistics",
+    operation_id="getCacheStats",
+    dependencies=[Depends(get_current_admin)],
+)
+def endp_get_cache_stats() -> CacheStatsResponse:
+    return get_cache_stats()
@@ -0,0 +1,20 @@
+from pydantic import BaseModel
+
+
+class CacheRouteStats(BaseModel):
+    route: str
+    hits: int
+    misses: int
+    hit_rate: float | None = None
+    disabled: bool
+
+
+class CacheStatsResponse(BaseModel):
+    enabled: bool
+    entries: int
+    max_entries: int
+    ttl_seconds: float
+    evictions: int
+    expirations: int
+    invalidations: int
+    routes: list[CacheRouteStats]
@@ -1,14 +1,79 @@
 from app.src.categories.schemas import CategoryResponse, CategoryCreate, CategoryUpdate
-from fastapi import HTTPException
+from fastapi import HTTPException, Response
 from sqlalchemy.orm import Session
 from sqlalchemy.exc import IntegrityError
 from app import models
-
-
-def get_categories(sql: Session) -> list[CategoryResponse]:
+from app.cache import cached_response
+from app.writer import run_write
+from app.filtering import Filters
+from app.pagination import (
+    DEFAULT_PAGE_LIMIT,
+    Page,
+    keyset_paginate,
+    order_by_keys,
+)
+from app.config import settings
+from app.serialization import Projection, detail_response, list_response
+
+
+CATEGORY_PROJECTION = Projection(CategoryResponse, models.Category)
+CATEGORY_FILTERS = Filters(
+    {
+        "category_id": models.Category.category_id,
+        "name": models.Category.name,
+        "is_active": models.Category.is_active,
+    },
+    sortable=("category_id", "name"),
+)
+
+
+@cached_response("categories")
+def get_categories(
+    sql: Session,
+    cursor: str | None = None,
+    limit: int | None = None,
+    fields: str | None = None,
+    filters: list[str] | None = None,
+    sort: str | None = None,
+) -> list[CategoryResponse] | Page[CategoryResponse] | Response:
     try:
-        categories: list[models.Category] = sql.query(models.Category).all()
-        return [CategoryResponse.model_validate(category) for category in categories]
+        ordering = CATEGORY_FILTERS.ordering(sort)
+        if fields is not None or settings.serialization.fast_collections:
+            projection = CATEGORY_PROJECTION.restrict(fields)
+            return list_response(
+                CATEGORY_FILTERS.where(
+                    sql.query(*projection.columns),
+                    filters,
+                ),
+                projection,
+                models.Category.category_id,
+                cursor,
+                limit,
+                ordering=ordering,
+            )
+
+        query = sql.query(models.Category)
+        query = CATEGORY_FILTERS.where(query, filters)
+        if cursor is None and limit is None:
+            categories: list[models.Category] = order_by_keys(query, ordering).all()
+            return [
+                CategoryResponse.model_validate(category) for category in categories
+            ]
+
+        categories, next_cursor = keyset_paginate(
+            query,
+            models.Category.category_id,
+            cursor,
+            limit or DEFAULT_PAGE_LIMIT,
+            ordering,
+        )
+        return Page[CategoryResponse](
+            items=[CategoryResponse.model_validate(category) for category in categories],
+            next_cursor=next_cursor,
+        )
+
+    except HTTPException as e:
+        raise e
 
     except Exception as e:
         print(e)
@@ -17,12 +82,14 @@ def get_categories(sql: Session) -> list[CategoryResponse]:
 
 def create_category(sql: Session, data: CategoryCreate) -> CategoryResponse:
     try:
-        new_category = models.Category(**data.model_dump())
+        def write(sql: Session) -> CategoryResponse:
+            new_category = models.Category(**data.model_dump())
+
+            sql.add(new_category)
+            sql.flush()
+            return CategoryResponse.model_validate(new_category)
 
-        sql.add(new_category)
-        sql.commit()
-        sql.refresh(new_category)
-        return CategoryResponse.model_validate(new_category)
+        return run_write(sql, write)
 
     except IntegrityError as e:
         raise HTTPException(status_code=400, detail=str(e.orig)) from e
@@ -36,16 +103,18 @@ def update_category(
     sql: Session, category_id: int, data: CategoryUpdate
 ) -> CategoryResponse:
     try:
-        category: models.Category | None = sql.get(models.Category, category_id)
-        if category is None:
-            raise HTTPException(status_code=404, detail="Category not found")
+        def write(sql: Session) -> CategoryResponse:
+            category: models.Category | None = sql.get(models.Category, category_id)
+            if category is None:
+                raise HTTPException(status_code=404, detail="Category not found")
 
-        for key, value in data.model_dump(exclude_unset=True).items():
-            setattr(category, key, value)
+            for key, value in data.model_dump(exclude_unset=True).items():
+                setattr(category, key, value)
 
-        sql.commit()
-        sql.refresh(category)
-        return CategoryResponse.model_validate(category)
+            sql.flush()
+            return CategoryResponse.model_validate(category)
+
+        return run_write(sql, write)
 
     except HTTPException as e:
         raise e
@@ -58,8 +127,22 @@ def update_category(
         raise HTTPException(status_code=500, detail="Internal server error") from e
 
 
-def get_category(sql: Session, category_id: int) -> CategoryResponse:
+@cached_response("categories")
+def get_category(
+    sql: Session, category_id: int, fields: str | None = None
+) -> CategoryResponse | Response:
     try:
+        if fields is not None:
+            projection = CATEGORY_PROJECTION.restrict(fields)
+            return detail_response(
+                sql.query(*projection.columns).filter(
+                    models.Category.category_id == category_id,
+                    models.Category.is_active == True,
+                ),
+                projection,
+                "Category not found",
+            )
+
         category: models.Category | None = sql.get(models.Category, category_id)
         if category is None or not category.is_active:
             raise HTTPException(status_code=404, detail="Category not found")
@@ -74,13 +157,16 @@ def get_category(sql: Session, category_id: int) -> CategoryResponse:
 
 def delete_category(sql: Session, category_id: int):
     try:
-        category: models.Category | None = sql.get(models.Category, category_id)
-        if category is None:
-            raise HTTPException(status_code=404, detail="Category not found")
+        def write(sql: Session) -> None:
+            category: models.Category | None = sql.get(models.Category, category_id)
+            if category is None:
+                raise HTTPException(status_code=404, detail="Category not found")
+
+            category.is_active = False
+            sql.flush()
+
+        return run_write(sql, write)
 
-        category.is_active = False
-        sql.commit()
-        sql.refresh(category)
     except HTTPException as e:
         raise e
 
@@ -1,6 +1,15 @@
 from typing import Annotated
-from app.annotations import ID_PATH_ANNOTATION
-from app.database import get_sql
+from app.annotations import (
+    CURSOR_QUERY_ANNOTATION,
+    FIELDS_QUERY_ANNOTATION,
+    FILTER_QUERY_ANNOTATION,
+    ID_PATH_ANNOTATION,
+    LIMIT_QUERY_ANNOTATION,
+    SORT_QUERY_ANNOTATION,
+)
+from app.pagination import Page
+from app.database import get_read_sql, get_sql
+from app.versioning import conditional_get
 from app.src.categories.controllers import (
     create_category,
     get_categories,
@@ -16,11 +25,28 @@ from sqlalchemy.orm import Session
 router = APIRouter(prefix="/categories", tags=["Categories"])
 
 
-@router.get("", summary="Get all categories", operation_id="getCategories")
+@router.get(
+    "",
+    summary="Get all categories",
+    operation_id="getCategories",
+    dependencies=[conditional_get("categories")],
+)
 def endp_get_categories(
-    sql: Annotated[Session, Depends(get_sql)],
-) -> list[CategoryResponse]:
-    return get_categories(sql)
+    sql: Annotated[Session, Depends(get_read_sql)],
+    cursor: CURSOR_QUERY_ANNOTATION = None,
+    limit: LIMIT_QUERY_ANNOTATION = None,
+    fields: FIELDS_QUERY_ANNOTATION = None,
+    filters: FILTER_QUERY_ANNOTATION = None,
+    sort: SORT_QUERY_ANNOTATION = None,
+) -> list[CategoryResponse] | Page[CategoryResponse]:
+    return get_categories(
+        sql,
+        cursor=cursor,
+        limit=limit,
+        fields=fields,
+        filters=filters,
+        sort=sort,
+    )
 
 
 @router.post("", summary="Create a category", operation_id="createCategories")
@@ -41,11 +67,18 @@ def endp_update_category(
     return update_category(sql, category_id, data)
 
 
-@router.get("/{category_id}", summary="Get a category", operation_id="getCategory")
+@router.get(
+    "/{category_id}",
+    summary="Get a category",
+    operation_id="getCategory",
+    dependencies=[conditional_get("categories")],
+)
 def endp_get_category(
-    sql: Annotated[Session, Depends(get_sql)], category_id: ID_PATH_ANNOTATION
+    sql: Annotated[Session, Depends(get_read_sql)],
+    category_id: ID_PATH_ANNOTATION,
+    fields: FIELDS_QUERY_ANNOTATION = None,
 ) -> CategoryResponse:
-    return get_category(sql, category_id)
+    return get_category(sql, category_id, fields=fields)
 
 
 @router.delete(
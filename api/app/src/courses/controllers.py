@@ -1,15 +1,83 @@
 from app.utils import validate_int
-from fastapi import HTTPException
-from sqlalchemy.orm import Session
+from fastapi import HTTPException, Response
+from sqlalchemy.orm import Session, raiseload
 from app import models
+from app.cache import cached_response
+from app.writer import run_write
+from app.filtering import Filters
+from app.pagination import (
+    DEFAULT_PAGE_LIMIT,
+    Page,
+    keyset_paginate,
+    order_by_keys,
+)
+from app.config import settings
+from app.serialization import Projection, detail_response, list_response
 from app.src.courses.schemas import CourseCreate, CourseResponse, CourseUpdate
 from sqlalchemy.exc import IntegrityError
 
 
-def get_courses(sql: Session) -> list[CourseResponse]:
+# CourseResponse reads no relationships; refuse lazy loads instead of letting a
+# schema change quietly turn the list endpoint into N+1 queries
+COURSE_RESPONSE_OPTIONS = (raiseload("*"),)
+COURSE_PROJECTION = Projection(CourseResponse, models.Course)
+COURSE_FILTERS = Filters(
+    {
+        "course_id": models.Course.course_id,
+        "title": models.Course.title,
+        "category_id": models.Course.category_id,
+        "teacher_id": models.Course.teacher_id,
+        "is_active": models.Course.is_active,
+    },
+    sortable=("course_id", "title"),
+)
+
+
+@cached_response("courses")
+def get_courses(
+    sql: Session,
+    cursor: str | None = None,
+    limit: int | None = None,
+    fields: str | None = None,
+    filters: list[str] | None = None,
+    sort: str | None = None,
+) -> list[CourseResponse] | Page[CourseResponse] | Response:
     try:
-        courses: list[models.Course] = sql.query(models.Course).all()
-        return [CourseResponse.model_validate(course) for course in courses]
+        ordering = COURSE_FILTERS.ordering(sort)
+        if fields is not None or settings.serialization.fast_collections:
+            projection = COURSE_PROJECTION.restrict(fields)
+            return list_response(
+                COURSE_FILTERS.where(
+                    sql.query(*projection.columns),
+                    filters,
+                ),
+                projection,
+                models.Course.course_id,
+                cursor,
+                limit,
+                ordering=ordering,
+            )
+
+        query = sql.query(models.Course).options(*COURSE_RESPONSE_OPTIONS)
+        query = COURSE_FILTERS.where(query, filters)
+        if cursor is None and limit is None:
+            courses: list[models.Course] = order_by_keys(query, ordering).all()
+            return [CourseResponse.model_validate(course) for course in courses]
+
+        courses, next_cursor = keyset_paginate(
+            query,
+            models.Course.course_id,
+            cursor,
+            limit or DEFAULT_PAGE_LIMIT,
+            ordering,
+        )
+        return Page[CourseResponse](
+            items=[CourseResponse.model_validate(course) for course in courses],
+            next_cursor=next_cursor,
+        )
+
+    except HTTPException as e:
+        raise e
 
     except Exception as e:
         raise HTTPException(status_code=500, detail="Internal server error") from e
@@ -17,21 +85,24 @@ def get_courses(sql: Session) -> list[CourseResponse]:
 
 def create_course(sql: Session, data: CourseCreate) -> CourseResponse:
     try:
-        new_course: models.Course = models.Course(**data.model_dump())
+        def write(sql: Session) -> CourseResponse:
+            new_course: models.Course = models.Course(**data.model_dump())
 
-        category: models.Category | None = sql.get(models.Category, validate_int(data.category_id))
-        if category is None or not category.is_active:
-            raise HTTPException(status_code=404, detail="Category not found")
+            category: models.Category | None = sql.get(models.Category, validate_int(data.category_id))
+            if category is None or not category.is_active:
+                raise HTTPException(status_code=404, detail="Category not found")
 
-        teacher: models.User | None = sql.get(models.User, validate_int(data.teacher_id))
-        if teacher is None or not teacher.is_active:
-            raise HTTPException(status_code=404, detail="Teacher not found")
+            teacher: models.User | None = sql.get(models.User, validate_int(data.teacher_id))
+            if teacher is None or not teacher.is_active:
+                raise HTTPException(status_code=404, detail="Teacher not found")
+
+            sql.add(new_course)
+            sql.flush()
 
-        sql.add(new_course)
-        sql.commit()
-        sql.refresh(new_course)
+            return CourseResponse.model_validate(new_course)
+
+        return run_write(sql, write)
 
-        return CourseResponse.model_validate(new_course)
     except HTTPException as e:
         raise e
 
@@ -46,30 +117,32 @@ def create_course(sql: Session, data: CourseCreate) -> CourseResponse:
 
 def update_course(sql: Session, data: CourseUpdate, course_id: int) -> CourseResponse:
     try:
-        course: models.Course | None = sql.get(models.Course, validate_int(course_id))
-        if course is None:
-            raise HTTPException(status_code=404, detail="Course not found")
-
-        if data.category_id is not None:
-            category: models.Category | None = sql.get(
-                models.Category, validate_int(data.category_id)
-            )
-            if category is None or not category.is_active:
-                raise HTTPException(status_code=404, detail="Category not found")
-
-        if data.teacher_id is not None:
-            teacher: models.User | None = sql.get(
-                models.User, validate_int(data.teacher_id)
-            )
-            if teacher is None or not teacher.is_active:
-                raise HTTPException(status_code=404, detail="Teacher not found")
-
-        for var, value in vars(data).items():
-            if value is not None:
-                setattr(course, var, value)
-        sql.commit()
-        sql.refresh(course)
-        return CourseResponse.model_validate(course)
+        def write(sql: Session) -> CourseResponse:
+            course: models.Course | None = sql.get(models.Course, validate_int(course_id))
+            if course is None:
+                raise HTTPException(status_code=404, detail="Course not found")
+
+            if data.category_id is not None:
+                category: models.Category | None = sql.get(
+                    models.Category, validate_int(data.category_id)
+                )
+                if category is None or not category.is_active:
+                    raise HTTPException(status_code=404, detail="Category not found")
+
+            if data.teacher_id is not None:
+                teacher: models.User | None = sql.get(
+                    models.User, validate_int(data.teacher_id)
+                )
+                if teacher is None or not teacher.is_active:
+                    raise HTTPException(status_code=404, detail="Teacher not found")
+
+            for var, value in vars(data).items():
+                if value is not None:
+                    setattr(course, var, value)
+            sql.flush()
+            return CourseResponse.model_validate(course)
+
+        return run_write(sql, write)
 
     except HTTPException as e:
         raise e
@@ -83,9 +156,25 @@ def update_course(sql: Session, data: CourseUpdate, course_id: int) -> CourseRes
         raise HTTPException(status_code=500, detail="Internal server error") from e
 
 
-def get_course(sql: Session, course_id: int) -> CourseResponse:
+@cached_response("courses")
+def get_course(
+    sql: Session, course_id: int, fields: str | None = None
+) -> CourseResponse | Response:
     try:
-        course: models.Course | None = sql.get(models.Course, course_id)
+        if fields is not None:
+            projection = COURSE_PROJECTION.restrict(fields)
+            return detail_response(
+                sql.query(*projection.columns).filter(
+                    models.Course.course_id == course_id,
+                    models.Course.is_active == True,
+                ),
+                projection,
+                "Course not found",
+            )
+
+        course: models.Course | None = sql.get(
+            models.Course, course_id, options=COURSE_RESPONSE_OPTIONS
+        )
         if course is None or not course.is_active:
             raise HTTPException(status_code=404, detail="Course not found")
 
@@ -101,13 +190,15 @@ def get_course(sql: Session, course_id: int) -> CourseResponse:
 
 def delete_course(sql: Session, course_id: int):
     try:
-        course: models.Course | None = sql.get(models.Course, course_id)
-        if course is None:
-            raise HTTPException(status_code=404, detail="Course not found")
+        def write(sql: Session) -> None:
+            course: models.Course | None = sql.get(models.Course, course_id)
+            if course is None:
+                raise HTTPException(status_code=404, detail="Course not found")
+
+            course.is_active = False
+            sql.flush()
 
-        course.is_active = False
-        sql.commit()
-        sql.refresh(course)
+        return run_write(sql, write)
 
     except HTTPException as e:
         raise e
@@ -1,6 +1,14 @@
 from typing import Annotated
 
-from app.annotations import ID_PATH_ANNOTATION
+from app.annotations import (
+    CURSOR_QUERY_ANNOTATION,
+    FIELDS_QUERY_ANNOTATION,
+    FILTER_QUERY_ANNOTATION,
+    ID_PATH_ANNOTATION,
+    LIMIT_QUERY_ANNOTATION,
+    SORT_QUERY_ANNOTATION,
+)
+from app.pagination import Page
 from app.src.courses.controllers import (
     create_course,
     delete_course,
@@ -13,16 +21,34 @@ from fastapi import APIRouter, Depends
 
 from sqlalchemy.orm import Session
 
-from app.database import get_sql
+from app.database import get_read_sql, get_sql
+from app.versioning import conditional_get
 
 router = APIRouter(prefix="/courses", tags=["Courses"])
 
 
-@router.get("", summary="Get all courses", operation_id="getCourses")
+@router.get(
+    "",
+    summary="Get all courses",
+    operation_id="getCourses",
+    dependencies=[conditional_get("courses")],
+)
 def endp_get_courses(
-    sql: Annotated[Session, Depends(get_sql)],
-) -> list[CourseResponse]:
-    return get_courses(sql=sql)
+    sql: Annotated[Session, Depends(get_read_sql)],
+    cursor: CURSOR_QUERY_ANNOTATION = None,
+    limit: LIMIT_QUERY_ANNOTATION = None,
+    fields: FIELDS_QUERY_ANNOTATION = None,
+    filters: FILTER_QUERY_ANNOTATION = None,
+    sort: SORT_QUERY_ANNOTATION = None,
+) -> list[CourseResponse] | Page[CourseResponse]:
+    return get_courses(
+        sql=sql,
+        cursor=cursor,
+        limit=limit,
+        fields=fields,
+        filters=filters,
+        sort=sort,
+    )
 
 
 @router.post("", summary="Create a course", operation_id="createCourses")
@@ -41,11 +67,18 @@ def endp_update_course(
     return update_course(sql=sql, data=data, course_id=course_id)
 
 
-@router.get("/{course_id}", summary="Get a course", operation_id="getCourse")
+@router.get(
+    "/{course_id}",
+    summary="Get a course",
+    operation_id="getCourse",
+    dependencies=[conditional_get("courses")],
+)
 def endp_get_course(
-    sql: Annotated[Session, Depends(get_sql)], course_id: ID_PATH_ANNOTATION
+    sql: Annotated[Session, Depends(get_read_sql)],
+    course_id: ID_PATH_ANNOTATION,
+    fields: FIELDS_QUERY_ANNOTATION = None,
 ) -> CourseResponse:
-    return get_course(sql=sql, course_id=course_id)
+    return get_course(sql=sql, course_id=course_id, fields=fields)
 
 
 @router.delete("/{course_id}", summary="Delete a course", operation_id="deleteCourse", status_code=204)
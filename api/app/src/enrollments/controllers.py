@@ -1,8 +1,22 @@
 from app.utils import validate_int
-from fastapi import HTTPException
-from sqlalchemy.orm import Session
+from fastapi import HTTPException, Response
+from sqlalchemy.orm import Session, raiseload, selectinload
 from app import models
+from app.writer import run_write
+from app.src.enrollments.progress import recount_progress
+from app.src.analytics import rollups
+from app.filtering import Filters
+from app.pagination import (
+    DEFAULT_PAGE_LIMIT,
+    Page,
+    keyset_paginate,
+    order_by_keys,
+)
+from app.config import settings
+from app.serialization import Projection, detail_response, list_response
 from app.src.enrollments.schemas import (
+    EnrollmentBulkCreate,
+    EnrollmentBulkResult,
     EnrollmentCreate,
     EnrollmentResponse,
     EnrollmentUpdate,
@@ -10,15 +24,80 @@ from app.src.enrollments.schemas import (
 )
 
 from sqlalchemy.exc import IntegrityError
-from sqlalchemy import func, select, and_
+from sqlalchemy import insert, select
+
 
+# Loader profiles per response schema, see users.controllers
+ENROLLMENT_RESPONSE_OPTIONS = (raiseload("*"),)
+ENROLLMENT_RESPONSE_TASKS_OPTIONS = (
+    selectinload(models.Enrollment.task_completions),
+    raiseload("*"),
+)
+ENROLLMENT_PROJECTION = Projection(EnrollmentResponse, models.Enrollment)
+ENROLLMENT_FILTERS = Filters(
+    {
+        "enrollment_id": models.Enrollment.enrollment_id,
+        "student_id": models.Enrollment.student_id,
+        "course_id": models.Enrollment.course_id,
+        "assigner_id": models.Enrollment.assigner_id,
+        "is_active": models.Enrollment.is_active,
+        "enrolled_at": models.Enrollment.enrolled_at,
+        "completed_at": models.Enrollment.completed_at,
+    },
+    sortable=("enrollment_id", "enrolled_at"),
+)
 
-def get_enrollments(sql: Session) -> list[EnrollmentResponse]:
+
+def get_enrollments(
+    sql: Session,
+    cursor: str | None = None,
+    limit: int | None = None,
+    fields: str | None = None,
+    filters: list[str] | None = None,
+    sort: str | None = None,
+) -> list[EnrollmentResponse] | Page[EnrollmentResponse] | Response:
     try:
-        enrollments: list[models.Enrollment] = sql.query(models.Enrollment).all()
-        return [
-            EnrollmentResponse.model_validate(enrollment) for enrollment in enrollments
-        ]
+        ordering = ENROLLMENT_FILTERS.ordering(sort)
+        if fields is not None or settings.serialization.fast_collections:
+            projection = ENROLLMENT_PROJECTION.restrict(fields)
+            return list_response(
+                ENROLLMENT_FILTERS.where(
+                    sql.query(*projection.columns),
+                    filters,
+                ),
+                projection,
+                models.Enrollment.enrollment_id,
+                cursor,
+                limit,
+                ordering=ordering,
+            )
+
+        query = sql.query(models.Enrollment).options(*ENROLLMENT_RESPONSE_OPTIONS)
+        query = ENROLLMENT_FILTERS.where(query, filters)
+        if cursor is None and limit is None:
+            enrollments: list[models.Enrollment] = order_by_keys(query, ordering).all()
+            return [
+                EnrollmentResponse.model_validate(enrollment)
+                for enrollment in enrollments
+            ]
+
+        enrollments, next_cursor = keyset_paginate(
+            query,
+            models.Enrollment.enrollment_id,
+            cursor,
+            limit or DEFAULT_PAGE_LIMIT,
+            ordering,
+        )
+        return Page[EnrollmentResponse](
+            items=[
+                EnrollmentResponse.model_validate(enrollment)
+                for enrollment in enrollments
+            ],
+            next_cursor=next_cursor,
+        )
+
+    except HTTPException as e:
+        raise e
 
     except Exception as e:
         raise HTTPException(status_code=500, detail="Internal server error") from e
@@ -26,30 +105,38 @@ def get_enrollments(sql: Session) -> list[EnrollmentResponse]:
 
 def create_enrollment(sql: Session, data: EnrollmentCreate) -> EnrollmentResponse:
     try:
-        student: models.User | None = sql.get(
-            models.User, validate_int(data.student_id)
-        )
-        if student is None or not student.is_active:
-            raise HTTPException(status_code=404, detail="Student not found")
+        def write(sql: Session) -> EnrollmentResponse:
+            student: models.User | None = sql.get(
+                models.User, validate_int(data.student_id)
+            )
+            if student is None or not student.is_active:
+                raise HTTPException(status_code=404, detail="Student not found")
 
-        course: models.Course | None = sql.get(
-            models.User, validate_int(data.course_id)
-        )
-        if course is None or not course.is_active:
-            raise HTTPException(status_code=404, detail="Course not found")
+            course: models.Course | None = sql.get(
+                models.User, validate_int(data.course_id)
+            )
+            if course is None or not course.is_active:
+                raise HTTPException(status_code=404, detail="Course not found")
 
-        assigner: models.User | None = sql.get(
-            models.User, validate_int(data.assigner_id)
-        )
-        if assigner is None or not assigner.is_active:
-            raise HTTPException(status_code=404, detail="Assigner not found")
+            assigner: models.User | None = sql.get(
+                models.User, validate_int(data.assigner_id)
+            )
+            if assigner is None or not assigner.is_active:
+                raise HTTPException(status_code=404, detail="Assigner not found")
+
+            new_enrollment: models.Enrollment = models.Enrollment(**data.model_dump())
+            sql.add(new_enrollment)
+            sql.flush()
+            rollups.apply_enrollment(
+                sql, rollups.enrollment_snapshot(new_enrollment), 1
+            )
+            recount_progress(
+                sql, models.Enrollment.enrollment_id == new_enrollment.enrollment_id
+            )
 
-        new_enrollment: models.Enrollment = models.Enrollment(**data.model_dump())
-        sql.add(new_enrollment)
-        sql.commit()
-        sql.refresh(new_enrollment)
+            return EnrollmentResponse.model_validate(new_enrollment)
 
-        return EnrollmentResponse.model_validate(new_enrollment)
+        return run_write(sql, write)
 
     except HTTPException as e:
         sql.rollback()
@@ -66,44 +153,154 @@ def create_enrollment(sql: Session, data: EnrollmentCreate) -> EnrollmentRespons
         raise HTTPException(status_code=500, detail="Internal server error") from e
 
 
-def update_enrollment(
-    sql: Session, data: EnrollmentUpdate, enrollment_id: int
-) -> EnrollmentResponse:
+def create_enrollments_bulk(
+    sql: Session, data: EnrollmentBulkCreate
+) -> list[EnrollmentBulkResult]:
     try:
-        enrollment: models.Enrollment | None = sql.get(models.Enrollment, enrollment_id)
-        if enrollment is None:
-            raise HTTPException(
-                status_code=404, detail="Student course enrollment not found"
+        def write(sql: Session) -> list[EnrollmentBulkResult]:
+            items = data.items
+            student_ids = {item.student_id for item in items}
+            user_ids = student_ids | {item.assigner_id for item in items}
+            course_ids = {item.course_id for item in items}
+
+            # One IN query per table instead of three lookups per item
+            active_users = set(
+                sql.scalars(
+                    select(models.User.user_id).where(
+                        models.User.user_id.in_(user_ids),
+                        models.User.is_active == True,  # noqa: E712
+                    )
+                )
             )
-
-        if data.student_id is not None:
-            student: models.User | None = sql.get(
-                models.User, validate_int(data.student_id)
+            active_courses = set(
+                sql.scalars(
+                    select(models.Course.course_id).where(
+                        models.Course.course_id.in_(course_ids),
+                        models.Course.is_active == True,  # noqa: E712
+                    )
+                )
             )
-            if student is None or not student.is_active:
-                raise HTTPException(status_code=404, detail="Student not found")
-
-        if data.course_id is not None:
-            course: models.Course | None = sql.get(
-                models.User, validate_int(data.course_id)
+            enrolled = set(
+                sql.execute(
+                    select(models.Enrollment.student_id, models.Enrollment.course_id)
+                    .where(
+                        models.Enrollment.student_id.in_(student_ids),
+                        models.Enrollment.course_id.in_(course_ids),
+                        models.Enrollment.is_active == True,  # noqa: E712
+                    )
+                ).tuples()
             )
-            if course is None or not course.is_active:
-                raise HTTPException(status_code=404, detail="Course not found")
 
-        if data.assigner_id is not None:
-            assigner: models.User | None = sql.get(
-                models.User, validate_int(data.assigner_id)
+            results: list[EnrollmentBulkResult] = []
+            new_items: list[tuple[EnrollmentBulkResult, EnrollmentCreate]] = []
+            for index, item in enumerate(items):
+                detail = None
+                if item.student_id not in active_users:
+                    detail = "Student not found"
+                elif item.course_id not in active_courses:
+                    detail = "Course not found"
+                elif item.assigner_id not in active_users:
+                    detail = "Assigner not found"
+
+                if detail is not None:
+                    result = EnrollmentBulkResult(
+                        index=index, status="not_found", detail=detail
+                    )
+                elif (item.student_id, item.course_id) in enrolled:
+                    result = EnrollmentBulkResult(
+                        index=index,
+                        status="conflict",
+                        detail="Student course enrollment already exists",
+                    )
+                else:
+                    result = EnrollmentBulkResult(index=index, status="created")
+                    if item.is_active:
+                        enrolled.add((item.student_id, item.course_id))
+                    new_items.append((result, item))
+                results.append(result)
+
+            if not new_items:
+                return results
+
+            enrollment_ids = sql.scalars(
+                insert(models.Enrollment).returning(
+                    models.Enrollment.enrollment_id, sort_by_parameter_order=True
+                ),
+                [item.model_dump() for _, item in new_items],
+            ).all()
+            # RETURNING yields one id per inserted row, in parameter order
+            for (result, _), enrollment_id in zip(
+                new_items, enrollment_ids, strict=True
+            ):
+                result.enrollment_id = enrollment_id
+
+            rollups.apply_enrollments(
+                sql, [rollups.enrollment_snapshot(item) for _, item in new_items], 1
             )
-            if assigner is None or not assigner.is_active:
-                raise HTTPException(status_code=404, detail="Assigner not found")
+            recount_progress(sql, models.Enrollment.enrollment_id.in_(enrollment_ids))
 
-        for key, value in data.model_dump(exclude_unset=True).items():
-            if value is not None:
-                setattr(enrollment, key, value)
+            return results
 
-        sql.commit()
-        sql.refresh(enrollment)
-        return EnrollmentResponse.model_validate(enrollment)
+        return run_write(sql, write)
+
+    except HTTPException as e:
+        sql.rollback()
+        raise e
+
+    except Exception as e:
+        sql.rollback()
+        raise HTTPException(status_code=500, detail="Internal server error") from e
+
+
+def update_enrollment(
+    sql: Session, data: EnrollmentUpdate, enrollment_id: int
+) -> EnrollmentResponse:
+    try:
+        def write(sql: Session) -> EnrollmentResponse:
+            enrollment: models.Enrollment | None = sql.get(models.Enrollment, enrollment_id)
+            if enrollment is None:
+                raise HTTPException(
+                    status_code=404, detail="Student course enrollment not found"
+                )
+
+            if data.student_id is not None:
+                student: models.User | None = sql.get(
+                    models.User, validate_int(data.student_id)
+                )
+                if student is None or not student.is_active:
+                    raise HTTPException(status_code=404, detail="Student not found")
+
+            if data.course_id is not None:
+                course: models.Course | None = sql.get(
+                    models.User, validate_int(data.course_id)
+                )
+                if course is None or not course.is_active:
+                    raise HTTPException(status_code=404, detail="Course not found")
+
+            if data.assigner_id is not None:
+                assigner: models.User | None = sql.get(
+                    models.User, validate_int(data.assigner_id)
+                )
+                if assigner is None or not assigner.is_active:
+                    raise HTTPException(status_code=404, detail="Assigner not found")
+
+            old_course_id = enrollment.course_id
+            before = rollups.enrollment_snapshot(enrollment)
+            for key, value in data.model_dump(exclude_unset=True).items():
+                if value is not None:
+                    setattr(enrollment, key, value)
+
+            sql.flush()
+            rollups.apply_enrollment(sql, before, -1)
+            rollups.apply_enrollment(sql, rollups.enrollment_snapshot(enrollment), 1)
+            if data.course_id is not None:
+                recount_progress(
+                    sql, models.Enrollment.enrollment_id == enrollment.enrollment_id
+                )
+            rollups.refresh_task_totals(sql, {old_course_id, enrollment.course_id})
+            return EnrollmentResponse.model_validate(enrollment)
+
+        return run_write(sql, write)
 
     except HTTPException as e:
         raise e
@@ -119,9 +316,24 @@ def update_enrollment(
         raise HTTPException(status_code=500, detail="Internal server error") from e
 
 
-def get_enrollment(sql: Session, enrollment_id: int) -> EnrollmentResponse:
+def get_enrollment(
+    sql: Session, enrollment_id: int, fields: str | None = None
+) -> EnrollmentResponse | Response:
     try:
-        enrollment: models.Enrollment | None = sql.get(models.Enrollment, enrollment_id)
+        if fields is not None:
+            projection = ENROLLMENT_PROJECTION.restrict(fields)
+            return detail_response(
+                sql.query(*projection.columns).filter(
+                    models.Enrollment.enrollment_id == enrollment_id,
+                    models.Enrollment.is_active == True,
+                ),
+                projection,
+                "Student course enrollment not found",
+            )
+
+        enrollment: models.Enrollment | None = sql.get(
+            models.Enrollment, enrollment_id, options=ENROLLMENT_RESPONSE_OPTIONS
+        )
         if enrollment is None or not enrollment.is_active:
             raise HTTPException(
                 status_code=404, detail="Student course enrollment not found"
@@ -137,15 +349,20 @@ def get_enrollment(sql: Session, enrollment_id: int) -> EnrollmentResponse:
 
 def delete_enrollment(sql: Session, enrollment_id: int):
     try:
-        enrollment: models.Enrollment | None = sql.get(models.Enrollment, enrollment_id)
-        if enrollment is None:
-            raise HTTPException(
-                status_code=404, detail="Student course enrollment not found"
-            )
+        def write(sql: Session) -> None:
+            enrollment: models.Enrollment | None = sql.get(models.Enrollment, enrollment_id)
+            if enrollment is None:
+                raise HTTPException(
+                    status_code=404, detail="Student course enrollment not found"
+                )
+
+            before = rollups.enrollment_snapshot(enrollment)
+            enrollment.is_active = False
+            sql.flush()
+            rollups.apply_enrollment(sql, before, -1)
+            rollups.refresh_task_totals(sql, [enrollment.course_id])
 
-        enrollment.is_active = False
-        sql.commit()
-        sql.refresh(enrollment)
+        return run_write(sql, write)
 
     except HTTPException as e:
         raise e
@@ -160,7 +377,9 @@ def get_task_completions_for_user(
 ) -> EnrollmentResponseTasks:
     try:
         enrollment: models.Enrollment = sql.execute(
-            select(models.Enrollment).where(
+            select(models.Enrollment)
+            .options(*ENROLLMENT_RESPONSE_TASKS_OPTIONS)
+            .where(
                 models.Enrollment.student_id == user_id,
                 models.Enrollment.enrollment_id == enrollment_id,
                 models.Enrollment.is_active == True,
@@ -172,33 +391,44 @@ def get_task_completions_for_user(
                 status_code=404, detail="Student course enrollments not found"
             )
 
-        result = sql.execute(
-            select(
-                func.count(models.Task.task_id).label("total_tasks"),
-                func.count(models.TaskCompletion.task_completion_id).label(
-                    "completed_tasks"
-                ),
-            )
-            .select_from(models.Task)
-            .outerjoin(
-                models.TaskCompletion,
-                and_(
-                    models.TaskCompletion.task_id == models.Task.task_id,
-                    models.TaskCompletion.enrollment_id == enrollment.enrollment_id,
-                    models.TaskCompletion.is_active == True,
-                ),  # noqa: E712
-            )
-            .where(
-                models.Task.course_id == enrollment.course_id,
-                models.Task.is_active == True,  # noqa: E712
+        # completed_tasks/total_tasks are maintained on the row itself
+        return EnrollmentResponseTasks.model_validate(enrollment)
+
+    except HTTPException as e:
+        raise e
+
+    except Exception as e:
+        raise HTTPException(status_code=500, detail="Internal server error") from e
+
+
+def get_enrollments_progress(
+    sql: Session, user_id: int | None = None, enrollment_ids: list[int] | None = None
+) -> list[EnrollmentResponseTasks]:
+    try:
+        if user_id is None and not enrollment_ids:
+            raise HTTPException(
+                status_code=400, detail="Provide user_id or enrollment_ids"
             )
-        ).one()
 
-        real_result = enrollment
-        real_result.total_tasks = result.total_tasks
-        real_result.completed_tasks = result.completed_tasks
+        query = (
+            select(models.Enrollment)
+            .options(*ENROLLMENT_RESPONSE_OPTIONS)
+            .where(models.Enrollment.is_active == True)  # noqa: E712
+            .order_by(models.Enrollment.enrollment_id)
+        )
+        if user_id is not None:
+            query = query.where(models.Enrollment.student_id == user_id)
+        if enrollment_ids:
+            query = query.where(models.Enrollment.enrollment_id.in_(enrollment_ids))
 
-        return EnrollmentResponseTasks.model_validate(real_result)
+        return [
+            EnrollmentResponseTasks(
+                **EnrollmentResponse.model_validate(enrollment).model_dump(),
+                total_tasks=enrollment.total_tasks,
+                completed_tasks=enrollment.completed_tasks,
+            )
+            for enrollment in sql.execute(query).scalars()
+        ]
 
     except HTTPException as e:
         raise e
@@ -0,0 +1,109 @@
+from sqlalchemy import Select, and_, func, select, update
+from sqlalchemy.orm import Session
+
+from app import models
+from app.src.analytics import rollups
+
+
+def total_tasks_subquery():
+    return (
+        select(func.count(models.Task.task_id))
+        .where(
+            models.Task.course_id == models.Enrollment.course_id,
+            models.Task.is_active == True,  # noqa: E712
+        )
+        .correlate(models.Enrollment)
+        .scalar_subquery()
+    )
+
+
+def completed_tasks_subquery():
+    return (
+        select(func.count(models.TaskCompletion.task_completion_id))
+        .join(models.Task, models.Task.task_id == models.TaskCompletion.task_id)
+        .where(
+            models.TaskCompletion.enrollment_id == models.Enrollment.enrollment_id,
+            models.TaskCompletion.is_active == True,  # noqa: E712
+            models.Task.course_id == models.Enrollment.course_id,
+            models.Task.is_active == True,  # noqa: E712
+        )
+        .correlate(models.Enrollment)
+        .scalar_subquery()
+    )
+
+
+def recount_progress(sql: Session, *criteria) -> None:
+    """Recompute the counters of the enrollments matching `criteria`."""
+    sql.execute(
+        update(models.Enrollment)
+        .where(*criteria)
+        .values(
+            total_tasks=total_tasks_subquery(),
+            completed_tasks=completed_tasks_subquery(),
+        )
+        .execution_options(synchronize_session="fetch")
+    )
+    rollups.refresh_task_totals(
+        sql, select(models.Enrollment.course_id).where(*criteria).distinct()
+    )
+
+
+def bump_completed_tasks(sql: Session, enrollment_id: int, delta: int) -> None:
+    sql.execute(
+        update(models.Enrollment)
+        .where(models.Enrollment.enrollment_id == enrollment_id)
+        .values(completed_tasks=models.Enrollment.completed_tasks + delta)
+        .execution_options(synchronize_session="fetch")
+    )
+    rollups.bump_completed_tasks(sql, enrollment_id, delta)
+
+
+def bump_total_tasks(sql: Session, course_id: int, delta: int) -> None:
+    sql.execute(
+        update(models.Enrollment)
+        .where(models.Enrollment.course_id == course_id)
+        .values(total_tasks=models.Enrollment.total_tasks + delta)
+        .execution_options(synchronize_session="fetch")
+    )
+    rollups.bump_total_tasks(sql, course_id, delta)
+
+
+def expected_progress_query() -> Select:
+    """Progress computed from scratch, as the counters should read."""
+    return (
+        select(
+            models.Enrollment.enrollment_id,
+            models.Enrollment.completed_tasks,
+            models.Enrollment.total_tasks,
+            func.count(models.TaskCompletion.task_completion_id).label(
+                "expected_completed_tasks"
+            ),
+            func.count(models.Task.task_id).label("expected_total_tasks"),
+        )
+        .outerjoin(
+            models.Task,
+            and_(
+                models.Task.course_id == models.Enrollment.course_id,
+                models.Task.is_active == True,  # noqa: E712
+            ),
+        )
+        .outerjoin(
+            models.TaskCompletion,
+            and_(
+                models.TaskCompletion.task_id == models.Task.task_id,
+                models.TaskCompletion.enrollment_id == models.Enrollment.enrollment_id,
+                models.TaskCompletion.is_active == True,  # noqa: E712
+            ),
+        )
+        .group_by(models.Enrollment.enrollment_id)
+        .order_by(models.Enrollment.enrollment_id)
+    )
+
+
+def find_progress_drift(sql: Session) -> list:
+    return [
+        row
+        for row in sql.execute(expected_progress_query())
+        if row.completed_tasks != row.expected_completed_tasks
+        or row.total_tasks != row.expected_total_tasks
+    ]
@@ -1,29 +1,78 @@
 from typing import Annotated
 
-from app.annotations import ID_PATH_ANNOTATION
+from app.annotations import (
+    CURSOR_QUERY_ANNOTATION,
+    FIELDS_QUERY_ANNOTATION,
+    FILTER_QUERY_ANNOTATION,
+    ID_PATH_ANNOTATION,
+    LIMIT_QUERY_ANNOTATION,
+    SORT_QUERY_ANNOTATION,
+)
+from app.pagination import Page
 from app.src.enrollments.controllers import (
     create_enrollment,
+    create_enrollments_bulk,
     delete_enrollment,
     get_enrollment,
     get_enrollments,
     update_enrollment,
     get_task_completions_for_user,
+    get_enrollments_progress,
 )
 from app.src.enrollments.schemas import EnrollmentCreate, EnrollmentResponse, EnrollmentUpdate
-from fastapi import APIRouter, Depends
-from app.src.enrollments.schemas import EnrollmentResponseTasks
+from fastapi import APIRouter, Depends, Query
+from app.src.enrollments.schemas import (
+    EnrollmentBulkCreate,
+    EnrollmentBulkResult,
+    EnrollmentResponseTasks,
+)
 from sqlalchemy.orm import Session
 
-from app.database import get_sql
+from app.database import get_read_sql, get_sql
+from app.versioning import conditional_get
 
 router = APIRouter(prefix="/enrollments", tags=["Enrollments"])
 
 
-@router.get("", summary="Get all student course enrollments", operation_id="getEnrollments")
+@router.get(
+    "",
+    summary="Get all student course enrollments",
+    operation_id="getEnrollments",
+    dependencies=[conditional_get("enrollments")],
+)
 def endp_get_enrollments(
-    sql: Annotated[Session, Depends(get_sql)],
-) -> list[EnrollmentResponse]:
-    return get_enrollments(sql=sql)
+    sql: Annotated[Session, Depends(get_read_sql)],
+    cursor: CURSOR_QUERY_ANNOTATION = None,
+    limit: LIMIT_QUERY_ANNOTATION = None,
+    fields: FIELDS_QUERY_ANNOTATION = None,
+    filters: FILTER_QUERY_ANNOTATION = None,
+    sort: SORT_QUERY_ANNOTATION = None,
+) -> list[EnrollmentResponse] | Page[EnrollmentResponse]:
+    return get_enrollments(
+        sql=sql,
+        cursor=cursor,
+        limit=limit,
+        fields=fields,
+        filters=filters,
+        sort=sort,
+    )
+
+
+# Declared before /{enrollment_id} so "progress" is not parsed as an id
+@router.get(
+    "/progress",
+    summary="Get task progress of many enrollments",
+    operation_id="getEnrollmentsProgress",
+    dependencies=[conditional_get("enrollments", "task_completions")],
+)
+def endp_get_enrollments_progress(
+    sql: Annotated[Session, Depends(get_read_sql)],
+    user_id: Annotated[int | None, Query(ge=1)] = None,
+    enrollment_ids: Annotated[list[int] | None, Query()] = None,
+) -> list[EnrollmentResponseTasks]:
+    return get_enrollments_progress(
+        sql=sql, user_id=user_id, enrollment_ids=enrollment_ids
+    )
 
 
 @router.post("", summary="Create a student course enrollment", operation_id="createEnrollment")
@@ -33,6 +82,17 @@ def endp_create_enrollment(
     return create_enrollment(sql=sql, data=data)
 
 
+@router.post(
+    "/bulk",
+    summary="Create many student course enrollments",
+    operation_id="createEnrollmentsBulk",
+)
+def endp_create_enrollments_bulk(
+    sql: Annotated[Session, Depends(get_sql)], data: EnrollmentBulkCreate
+) -> list[EnrollmentBulkResult]:
+    return create_enrollments_bulk(sql=sql, data=data)
+
+
 @router.put("/{enrollment_id}", summary="Update a student course enrollment", operation_id="updateEnrollment")
 def endp_update_enrollment(
     enrollment_id: ID_PATH_ANNOTATION,
@@ -43,11 +103,18 @@ def endp_update_enrollment(
     return update_enrollment(sql=sql, data=data, enrollment_id=enrollment_id)
 
 
-@router.get("/{enrollment_id}", summary="Get a student course enrollment", operation_id="getEnrollment")
+@router.get(
+    "/{enrollment_id}",
+    summary="Get a student course enrollment",
+    operation_id="getEnrollment",
+    dependencies=[conditional_get("enrollments")],
+)
 def endp_get_enrollment(
-    sql: Annotated[Session, Depends(get_sql)], enrollment_id: ID_PATH_ANNOTATION
+    sql: Annotated[Session, Depends(get_read_sql)],
+    enrollment_id: ID_PATH_ANNOTATION,
+    fields: FIELDS_QUERY_ANNOTATION = None,
 ) -> EnrollmentResponse:
-    return get_enrollment(sql=sql, enrollment_id=enrollment_id)
+    return get_enrollment(sql=sql, enrollment_id=enrollment_id, fields=fields)
 
 
 @router.delete(
@@ -62,8 +129,13 @@ def endp_delete_enrollment(
     return delete_enrollment(sql=sql, enrollment_id=enrollment_id)
 
 
-@router.get("/{user_id}/task_completion", summary="Get all task completions for a user", operation_id="getTaskCompletionsForUser")
+@router.get(
+    "/{user_id}/task_completion",
+    summary="Get all task completions for a user",
+    operation_id="getTaskCompletionsForUser",
+    dependencies=[conditional_get("enrollments", "task_completions")],
+)
 def endp_get_task_completions_for_user(
-    sql: Annotated[Session, Depends(get_sql)], user_id: ID_PATH_ANNOTATION
+    sql: Annotated[Session, Depends(get_read_sql)], user_id: ID_PATH_ANNOTATION
 ) -> EnrollmentResponseTasks:
     return get_task_completions_for_user(sql=sql, user_id=user_id)
\ No newline at end of file
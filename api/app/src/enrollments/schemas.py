@@ -1,3 +1,5 @@
+from typing import Literal
+
 from pydantic import BaseModel, ConfigDict, Field
 from datetime import datetime, date
 # from ..courses.schemas import CourseResponse
@@ -44,3 +46,14 @@ class EnrollmentResponseTasks(EnrollmentResponse):
     total_tasks: int = 0
 
     model_config = ConfigDict(from_attributes=True)
+
+
+class EnrollmentBulkCreate(BaseModel):
+    items: list[EnrollmentCreate] = Field(..., min_length=1, max_length=1000)
+
+
+class EnrollmentBulkResult(BaseModel):
+    index: int
+    status: Literal["created", "conflict", "not_found"]
+    enrollment_id: int | None = None
+    detail: str | None = None
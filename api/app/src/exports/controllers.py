@@ -0,0 +1,177 @@
+import csv
+import io
+import itertools
+import json
+from collections.abc import Iterator
+from datetime import date, datetime, timedelta
+from pathlib import Path
+
+from fastapi import HTTPException
+from fastapi.responses import StreamingResponse
+from sqlalchemy import Select, select
+
+from app import models
+from app.config import settings
+from app.database import ReadSessionLocal
+from app.src.exports.schemas import (
+    EXPORT_MEDIA_TYPES,
+    ExportFormat,
+    SnapshotCreate,
+    SnapshotResponse,
+)
+from app.src.exports.snapshots import PyArrowMissingError, take_snapshot
+
+# Rows fetched from the cursor per round trip; memory use is bounded by this
+EXPORT_CHUNK_SIZE = 1000
+
+
+def enrollments_export_query(
+    course_id: int | None = None,
+    category_id: int | None = None,
+    start: date | None = None,
+    end: date | None = None,
+) -> Select:
+    query = select(
+        models.Enrollment.enrollment_id,
+        models.Enrollment.student_id,
+        models.Enrollment.course_id,
+        models.Enrollment.assigner_id,
+        models.Enrollment.enrolled_at,
+        models.Enrollment.deadline,
+        models.Enrollment.completed_at,
+        models.Enrollment.completed_tasks,
+        models.Enrollment.total_tasks,
+        models.Enrollment.is_active,
+    ).order_by(models.Enrollment.enrollment_id)
+
+    if course_id is not None:
+        query = query.where(models.Enrollment.course_id == course_id)
+    if category_id is not None:
+        query = query.join(
+            models.Course, models.Course.course_id == models.Enrollment.course_id
+        ).where(models.Course.category_id == category_id)
+    if start is not None:
+        query = query.where(models.Enrollment.enrolled_at >= start)
+    if end is not None:
+        query = query.where(models.Enrollment.enrolled_at <= end)
+    return query
+
+
+def task_completions_export_query(
+    course_id: int | None = None,
+    category_id: int | None = None,
+    start: date | None = None,
+    end: date | None = None,
+) -> Select:
+    query = (
+        select(
+            models.TaskCompletion.task_completion_id,
+            models.TaskCompletion.enrollment_id,
+            models.Enrollment.student_id,
+            models.Enrollment.course_id,
+            models.TaskCompletion.task_id,
+            models.TaskCompletion.completed_at,
+            models.TaskCompletion.is_active,
+        )
+        .join(
+            models.Enrollment,
+            models.Enrollment.enrollment_id == models.TaskCompletion.enrollment_id,
+        )
+        .order_by(models.TaskCompletion.task_completion_id)
+    )
+
+    if course_id is not None:
+        query = query.where(models.Enrollment.course_id == course_id)
+    if category_id is not None:
+        query = query.join(
+            models.Course, models.Course.course_id == models.Enrollment.course_id
+        ).where(models.Course.category_id == category_id)
+    # completed_at is a timestamp; the range is inclusive of whole days
+    if start is not None:
+        query = query.where(
+            models.TaskCompletion.completed_at >= datetime.combine(start, datetime.min.time())
+        )
+    if end is not None:
+        query = query.where(
+            models.TaskCompletion.completed_at
+            < datetime.combine(end + timedelta(days=1), datetime.min.time())
+        )
+    return query
+
+
+def export_value(value):
+    if isinstance(value, date | datetime):
+        return value.isoformat()
+    return value
+
+
+def stream_rows(query: Select, export_format: ExportFormat) -> Iterator[str]:
+    # The request session is closed before the body is sent, so the export
+    # holds its own read session for as long as the client keeps reading
+    with ReadSessionLocal() as sql:
+        result = sql.execute(query.execution_options(yield_per=EXPORT_CHUNK_SIZE))
+        columns = list(result.keys())
+
+        if export_format == "ndjson":
+            for rows in result.partitions():
+                yield "".join(
+                    json.dumps(
+                        dict(zip(columns, map(export_value, row), strict=True)),
+                        separators=(",", ":"),
+                    )
+                    + "\n"
+                    for row in rows
+                )
+            return
+
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        writer.writerow(columns)
+        for rows in result.partitions():
+            writer.writerows(map(export_value, row) for row in rows)
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+        if buffer.tell():
+            yield buffer.getvalue()
+
+
+def export_response(
+    query: Select, export_format: ExportFormat, name: str
+) -> StreamingResponse:
+    chunks = stream_rows(query, export_format)
+    try:
+        # Run the query before the status line goes out, so a failing export
+        # still answers 500 instead of a truncated 200
+        first = next(chunks, "")
+
+    except Exception as e:
+        raise HTTPException(status_code=500, detail="Internal server error") from e
+
+    return StreamingResponse(
+        itertools.chain((first,), chunks),
+        media_type=EXPORT_MEDIA_TYPES[export_format],
+        headers={
+            "Content-Disposition": f'attachment; filename="{name}.{export_format}"'
+        },
+    )
+
+
+def create_snapshot(data: SnapshotCreate) -> SnapshotResponse:
+    try:
+        snapshot = take_snapshot(
+            Path(settings.snapshot.output_dir),
+            data.file_format or settings.snapshot.file_format,
+            settings.snapshot.chunk_size,
+        )
+        return SnapshotResponse(
+            path=str(snapshot.path),
+            file_format=snapshot.file_format,
+            rows=snapshot.rows,
+        )
+
+    except PyArrowMissingError as e:
+        raise HTTPException(status_code=501, detail=str(e)) from e
+
+    except Exception as e:
+        raise HTTPException(status_code=500, detail="Internal server error") from e
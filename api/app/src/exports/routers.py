@@ -0,0 +1,73 @@
+from datetime import date
+from typing import Annotated
+
+from app.src.auth.controllers import get_current_admin
+from app.src.exports.controllers import (
+    create_snapshot,
+    enrollments_export_query,
+    export_response,
+    task_completions_export_query,
+)
+from app.src.exports.schemas import ExportFormat, SnapshotCreate, SnapshotResponse
+from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.responses import StreamingResponse
+
+router = APIRouter(prefix="/exports", tags=["Exports"])
+
+
+class ExportFilters:
+    def __init__(
+        self,
+        course_id: Annotated[int | None, Query(ge=1)] = None,
+        category_id: Annotated[int | None, Query(ge=1)] = None,
+        start: Annotated[date | None, Query(description="First day, inclusive")] = None,
+        end: Annotated[date | None, Query(description="Last day, inclusive")] = None,
+    ):
+        if start is not None and end is not None and start > end:
+            raise HTTPException(status_code=400, detail="start is after end")
+        self.course_id = course_id
+        self.category_id = category_id
+        self.start = start
+        self.end = end
+
+
+@router.get(
+    "/enrollments",
+    summary="Stream student course enrollments as CSV or NDJSON",
+    operation_id="exportEnrollments",
+    response_class=StreamingResponse,
+)
+def endp_export_enrollments(
+    filters: Annotated[ExportFilters, Depends()],
+    export_format: Annotated[ExportFormat, Query(alias="format")] = "csv",
+) -> StreamingResponse:
+    return export_response(
+        enrollments_export_query(**vars(filters)), export_format, "enrollments"
+    )
+
+
+@router.get(
+    "/task_completions",
+    summary="Stream task_completions as CSV or NDJSON",
+    operation_id="exportTaskCompletions",
+    response_class=StreamingResponse,
+)
+def endp_export_task_completions(
+    filters: Annotated[ExportFilters, Depends()],
+    export_format: Annotated[ExportFormat, Query(alias="format")] = "csv",
+) -> StreamingResponse:
+    return export_response(
+        task_completions_export_query(**vars(filters)),
+        export_format,
+        "task_completions",
+    )
+
+
+@router.post(
+    "/snapshots",
+    summary="Write a Parquet/Arrow snapshot of the database",
+    operation_id="createSnapshot",
+    dependencies=[Depends(get_current_admin)],
+)
+def endp_create_snapshot(data: SnapshotCreate) -> SnapshotResponse:
+    return create_snapshot(data=data)
@@ -0,0 +1,20 @@
+from typing import Literal
+
+from pydantic import BaseModel
+
+ExportFormat = Literal["csv", "ndjson"]
+
+EXPORT_MEDIA_TYPES: dict[str, str] = {
+    "csv": "text/csv",
+    "ndjson": "application/x-ndjson",
+}
+
+
+class SnapshotCreate(BaseModel):
+    file_format: Literal["parquet", "arrow"] | None = None
+
+
+class SnapshotResponse(BaseModel):
+    path: str
+    file_format: Literal["parquet", "arrow"]
+    rows: dict[str, int]
@@ -0,0 +1,140 @@
+import shutil
+from dataclasses import dataclass, field
+from datetime import UTC, date, datetime
+from pathlib import Path
+from typing import Literal
+
+from sqlalchemy import Column, Connection, select
+
+from app import models
+from app.database import read_engine
+
+SnapshotFormat = Literal["parquet", "arrow"]
+
+SNAPSHOT_EXTENSIONS: dict[str, str] = {"parquet": "parquet", "arrow": "arrow"}
+
+SNAPSHOT_TABLES: tuple[type[models.Base], ...] = (
+    models.User,
+    models.Course,
+    models.Task,
+    models.Enrollment,
+    models.TaskCompletion,
+)
+
+# Never leaves the database, not even for analytics
+SNAPSHOT_EXCLUDED_COLUMNS: dict[str, set[str]] = {"users": {"password_hash"}}
+
+
+class PyArrowMissingError(RuntimeError):
+    pass
+
+
+@dataclass
+class Snapshot:
+    path: Path
+    file_format: SnapshotFormat
+    rows: dict[str, int] = field(default_factory=dict)
+
+
+def load_pyarrow():
+    # pyarrow is an optional dependency and heavy to import, so it is only
+    # loaded when a snapshot is actually taken
+    try:
+        import pyarrow as pa
+        import pyarrow.ipc  # noqa: F401
+        import pyarrow.parquet  # noqa: F401
+    except ImportError as e:
+        raise PyArrowMissingError(
+            "Snapshots need pyarrow, install it with `pip install pyarrow`"
+        ) from e
+    return pa
+
+
+def arrow_type(pa, column: Column):
+    python_type = column.type.python_type
+    if python_type is bool:
+        return pa.bool_()
+    if python_type is int:
+        return pa.int64()
+    if python_type is datetime:
+        return pa.timestamp("us")
+    if python_type is date:
+        return pa.date32()
+    return pa.string()
+
+
+def snapshot_columns(model: type[models.Base]) -> list[Column]:
+    excluded = SNAPSHOT_EXCLUDED_COLUMNS.get(model.__tablename__, set())
+    return [column for column in model.__table__.columns if column.name not in excluded]
+
+
+def write_table(
+    pa,
+    conn: Connection,
+    model: type[models.Base],
+    path: Path,
+    file_format: SnapshotFormat,
+    chunk_size: int,
+) -> int:
+    columns = snapshot_columns(model)
+    schema = pa.schema(
+        [pa.field(column.name, arrow_type(pa, column), column.nullable) for column in columns]
+    )
+    result = conn.execute(
+        select(*columns).order_by(*model.__table__.primary_key.columns),
+        execution_options={"yield_per": chunk_size},
+    )
+
+    if file_format == "parquet":
+        writer = pa.parquet.ParquetWriter(path, schema)
+    else:
+        writer = pa.ipc.new_file(path, schema)
+
+    rows = 0
+    with writer:
+        for chunk in result.partitions():
+            arrays = [
+                pa.array(values, type=schema.field(i).type)
+                for i, values in enumerate(zip(*chunk, strict=True))
+            ]
+            writer.write_batch(pa.RecordBatch.from_arrays(arrays, schema=schema))
+            rows += len(chunk)
+    return rows
+
+
+def take_snapshot(
+    output_dir: Path, file_format: SnapshotFormat, chunk_size: int
+) -> Snapshot:
+    """Write every snapshot table to a new directory under `output_dir`.
+
+    All tables are read inside one read transaction, so the files describe a
+    single point in time even while the API keeps writing. With the "wal"
+    storage profile writers carry on meanwhile; under the default rollback
+    journal they wait for the snapshot to finish. The directory only appears
+    under its final name once every file is complete.
+    """
+    pa = load_pyarrow()
+
+    taken_at = datetime.now(UTC).strftime("%Y%m%dT%H%M%S.%fZ")
+    snapshot = Snapshot(output_dir / f"snapshot-{taken_at}", file_format)
+    partial = output_dir / f".{snapshot.path.name}.partial"
+    partial.mkdir(parents=True)
+
+    try:
+        with read_engine.connect() as conn:
+            # pysqlite only opens transactions for DML; without an explicit
+            # BEGIN every SELECT would read its own snapshot of the database
+            conn.exec_driver_sql("BEGIN")
+            for model in SNAPSHOT_TABLES:
+                name = model.__tablename__
+                path = partial / f"{name}.{SNAPSHOT_EXTENSIONS[file_format]}"
+                snapshot.rows[name] = write_table(
+                    pa, conn, model, path, file_format, chunk_size
+                )
+            conn.exec_driver_sql("COMMIT")
+        partial.rename(snapshot.path)
+    except BaseException:
+        shutil.rmtree(partial, ignore_errors=True)
+        raise
+
+    return snapshot
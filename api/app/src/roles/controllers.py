@@ -1,17 +1,75 @@
-from fastapi import HTTPException
+from fastapi import HTTPException, Response
 from sqlalchemy.orm import Session
 from app import models
+from app.cache import cached_response
+from app.writer import run_write
+from app.filtering import Filters
+from app.pagination import (
+    DEFAULT_PAGE_LIMIT,
+    Page,
+    keyset_paginate,
+    order_by_keys,
+)
+from app.config import settings
+from app.serialization import Projection, detail_response, list_response
+from app.src.auth.revocations import revoke_tokens
 from app.src.roles.schemas import RoleCreate, RoleResponse, RoleUpdate
 
+from sqlalchemy import select
 from sqlalchemy.exc import IntegrityError, OperationalError
 
 
-def get_roles(sql: Session) -> list[RoleResponse]:
+ROLE_PROJECTION = Projection(RoleResponse, models.Role)
+ROLE_FILTERS = Filters(
+    {
+        "role_id": models.Role.role_id,
+        "name": models.Role.name,
+    },
+    sortable=("role_id", "name"),
+)
+
+
+@cached_response("roles")
+def get_roles(
+    sql: Session,
+    cursor: str | None = None,
+    limit: int | None = None,
+    fields: str | None = None,
+    filters: list[str] | None = None,
+    sort: str | None = None,
+) -> list[RoleResponse] | Page[RoleResponse] | Response:
     try:
-        roles: list[models.Role] = sql.query(models.Role).all()
-        if not roles:
-            raise HTTPException(status_code=404, detail="Roles not found")
-        return [RoleResponse.model_validate(role) for role in roles]
+        ordering = ROLE_FILTERS.ordering(sort)
+        if fields is not None or settings.serialization.fast_collections:
+            projection = ROLE_PROJECTION.restrict(fields)
+            return list_response(
+                ROLE_FILTERS.where(
+                    sql.query(*projection.columns),
+                    filters,
+                ),
+                projection,
+                models.Role.role_id,
+                cursor,
+                limit,
+                not_found_detail="Roles not found",
+                ordering=ordering,
+            )
+
+        query = sql.query(models.Role)
+        query = ROLE_FILTERS.where(query, filters)
+        if cursor is None and limit is None:
+            roles: list[models.Role] = order_by_keys(query, ordering).all()
+            if not roles:
+                raise HTTPException(status_code=404, detail="Roles not found")
+            return [RoleResponse.model_validate(role) for role in roles]
+
+        roles, next_cursor = keyset_paginate(
+            query, models.Role.role_id, cursor, limit or DEFAULT_PAGE_LIMIT, ordering
+        )
+        return Page[RoleResponse](
+            items=[RoleResponse.model_validate(role) for role in roles],
+            next_cursor=next_cursor,
+        )
 
     except HTTPException as e:
         raise e
@@ -23,12 +81,14 @@ def get_roles(sql: Session) -> list[RoleResponse]:
 
 def create_role(sql: Session, data: RoleCreate) -> RoleResponse:
     try:
-        new_role: models.Role = models.Role(**data.model_dump())
+        def write(sql: Session) -> RoleResponse:
+            new_role: models.Role = models.Role(**data.model_dump())
 
-        sql.add(new_role)
-        sql.commit()
-        sql.refresh(new_role)
-        return RoleResponse.model_validate(new_role)
+            sql.add(new_role)
+            sql.flush()
+            return RoleResponse.model_validate(new_role)
+
+        return run_write(sql, write)
 
     except IntegrityError as e:
         raise HTTPException(status_code=409, detail=str(e.orig)) from e
@@ -43,15 +103,25 @@ def create_role(sql: Session, data: RoleCreate) -> RoleResponse:
 
 def update_role(sql: Session, data: RoleUpdate, role_id: int) -> RoleResponse:
     try:
-        role: models.Role | None = sql.get(models.Role, role_id)
-        if role is None:
-            raise HTTPException(status_code=404, detail="Role not found")
-        for var, value in vars(data).items():
-            if value is not None:
-                setattr(role, var, value)
-        sql.commit()
-        sql.refresh(role)
-        return RoleResponse.model_validate(role)
+        def write(sql: Session) -> RoleResponse:
+            role: models.Role | None = sql.get(models.Role, role_id)
+            if role is None:
+                raise HTTPException(status_code=404, detail="Role not found")
+            if data.name is not None and data.name != role.name:
+                # The role name is a claim of every access token of its users
+                revoke_tokens(
+                    sql,
+                    select(models.User.user_id).where(
+                        models.User.role_id == role.role_id
+                    ),
+                )
+            for var, value in vars(data).items():
+                if value is not None:
+                    setattr(role, var, value)
+            sql.flush()
+            return RoleResponse.model_validate(role)
+
+        return run_write(sql, write)
 
     except HTTPException as e:
         raise e
@@ -65,8 +135,21 @@ def update_role(sql: Session, data: RoleUpdate, role_id: int) -> RoleResponse:
         raise HTTPException(status_code=500, detail="Internal server error") from e
 
 
-def get_role(sql: Session, role_id: int) -> RoleResponse:
+@cached_response("roles")
+def get_role(
+    sql: Session, role_id: int, fields: str | None = None
+) -> RoleResponse | Response:
     try:
+        if fields is not None:
+            projection = ROLE_PROJECTION.restrict(fields)
+            return detail_response(
+                sql.query(*projection.columns).filter(
+                    models.Role.role_id == role_id
+                ),
+                projection,
+                "Role not found",
+            )
+
         role: models.Role | None = sql.get(models.Role, role_id)
         if role is None:
             raise HTTPException(status_code=404, detail="Role not found")
@@ -82,11 +165,14 @@ def get_role(sql: Session, role_id: int) -> RoleResponse:
 
 def delete_role(sql: Session, role_id: int):
     try:
-        role: models.Role | None = sql.get(models.Role, role_id)
-        if role is None:
-            raise HTTPException(status_code=404, detail="Role not found")
-        sql.delete(role)
-        sql.commit()
+        def write(sql: Session) -> None:
+            role: models.Role | None = sql.get(models.Role, role_id)
+            if role is None:
+                raise HTTPException(status_code=404, detail="Role not found")
+            sql.delete(role)
+            sql.flush()
+
+        return run_write(sql, write)
 
     except HTTPException as e:
         raise e
@@ -1,6 +1,14 @@
 from typing import Annotated
 
-from app.annotations import ID_PATH_ANNOTATION
+from app.annotations import (
+    CURSOR_QUERY_ANNOTATION,
+    FIELDS_QUERY_ANNOTATION,
+    FILTER_QUERY_ANNOTATION,
+    ID_PATH_ANNOTATION,
+    LIMIT_QUERY_ANNOTATION,
+    SORT_QUERY_ANNOTATION,
+)
+from app.pagination import Page
 from app.src.roles.controllers import (
     create_role,
     delete_role,
@@ -13,16 +21,34 @@ from fastapi import APIRouter, Depends
 
 from sqlalchemy.orm import Session
 
-from app.database import get_sql
+from app.database import get_read_sql, get_sql
+from app.versioning import conditional_get
 
 router = APIRouter(prefix="/roles", tags=["Roles"])
 
 
-@router.get("", summary="Get all roles", operation_id="getRoles")
+@router.get(
+    "",
+    summary="Get all roles",
+    operation_id="getRoles",
+    dependencies=[conditional_get("roles")],
+)
 def endp_get_roles(
-    sql: Annotated[Session, Depends(get_sql)],
-) -> list[RoleResponse]:
-    return get_roles(sql=sql)
+    sql: Annotated[Session, Depends(get_read_sql)],
+    cursor: CURSOR_QUERY_ANNOTATION = None,
+    limit: LIMIT_QUERY_ANNOTATION = None,
+    fields: FIELDS_QUERY_ANNOTATION = None,
+    filters: FILTER_QUERY_ANNOTATION = None,
+    sort: SORT_QUERY_ANNOTATION = None,
+) -> list[RoleResponse] | Page[RoleResponse]:
+    return get_roles(
+        sql=sql,
+        cursor=cursor,
+        limit=limit,
+        fields=fields,
+        filters=filters,
+        sort=sort,
+    )
 
 
 @router.post("", summary="Create a role", operation_id="createRoles")
@@ -41,11 +67,18 @@ def endp_update_role(
     return update_role(sql=sql, data=data, role_id=role_id)
 
 
-@router.get("/{role_id}", summary="Get a role", operation_id="getRole")
+@router.get(
+    "/{role_id}",
+    summary="Get a role",
+    operation_id="getRole",
+    dependencies=[conditional_get("roles")],
+)
 def endp_get_role(
-    sql: Annotated[Session, Depends(get_sql)], role_id: ID_PATH_ANNOTATION
+    sql: Annotated[Session, Depends(get_read_sql)],
+    role_id: ID_PATH_ANNOTATION,
+    fields: FIELDS_QUERY_ANNOTATION = None,
 ) -> RoleResponse:
-    return get_role(sql=sql, role_id=role_id)
+    return get_role(sql=sql, role_id=role_id, fields=fields)
 
 
 @router.delete("/{role_id}", summary="Delete a role", operation_id="deleteRole", status_code=204)
@@ -1,4 +1,5 @@
-from app.src.auth.controllers import get_current_user
+from app.src.auth.controllers import get_current_claims
+from app.src.auth.permissions import Permission, authorize
 from fastapi import APIRouter, Depends
 
 from app.src.roles import routers as role_router
@@ -8,20 +9,61 @@ from app.src.users import routers as user_router
 from app.src.enrollments import routers as student_course_router
 from app.src.courses import routers as course_router
 from app.src.task_completions import routers as task_completion_router
+from app.src.analytics import routers as analytics_router
+from app.src.exports import routers as export_router
+from app.src.cache import routers as cache_router
 
 router = APIRouter()
 
-router.include_router(role_router.router)
-router.include_router(user_router.router)
+router.include_router(user_router.registration_router)
 
 
-private_router = APIRouter(dependencies=[Depends(get_current_user)])
+private_router = APIRouter(dependencies=[Depends(get_current_claims)])
 
 
-private_router.include_router(task_router.router)
-private_router.include_router(category_router.router)
-private_router.include_router(student_course_router.router)
-private_router.include_router(course_router.router)
-private_router.include_router(task_completion_router.router)
+private_router.include_router(
+    role_router.router,
+    dependencies=[authorize(Permission.READ_ROLES, Permission.WRITE_ROLES)],
+)
+private_router.include_router(
+    user_router.router,
+    dependencies=[authorize(Permission.READ_USERS, Permission.WRITE_USERS)],
+)
+private_router.include_router(
+    task_router.router,
+    dependencies=[authorize(Permission.READ_TASKS, Permission.WRITE_TASKS)],
+)
+private_router.include_router(
+    category_router.router,
+    dependencies=[authorize(Permission.READ_CATEGORIES, Permission.WRITE_CATEGORIES)],
+)
+private_router.include_router(
+    student_course_router.router,
+    dependencies=[
+        authorize(Permission.READ_ENROLLMENTS, Permission.WRITE_ENROLLMENTS)
+    ],
+)
+private_router.include_router(
+    course_router.router,
+    dependencies=[authorize(Permission.READ_COURSES, Permission.WRITE_COURSES)],
+)
+private_router.include_router(
+    task_completion_router.router,
+    dependencies=[
+        authorize(
+            Permission.READ_TASK_COMPLETIONS, Permission.WRITE_OWN_TASK_COMPLETIONS
+        )
+    ],
+)
+private_router.include_router(
+    analytics_router.router, dependencies=[authorize(Permission.READ_ANALYTICS)]
+)
+private_router.include_router(
+    export_router.router,
+    dependencies=[authorize(Permission.READ_EXPORTS, Permission.WRITE_EXPORTS)],
+)
+private_router.include_router(
+    cache_router.router, dependencies=[authorize(Permission.READ_CACHE)]
+)
 
 router.include_router(private_router)
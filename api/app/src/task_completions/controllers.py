@@ -1,49 +1,141 @@
 from app import models
+from app.writer import run_write
+from app.src.enrollments.progress import bump_completed_tasks, recount_progress
 from app.utils import validate_int
-from fastapi import HTTPException
+from app.filtering import Filters
+from app.pagination import (
+    DEFAULT_PAGE_LIMIT,
+    Page,
+    keyset_paginate,
+    order_by_keys,
+)
+from app.config import settings
+from app.serialization import Projection, detail_response, list_response
+from fastapi import HTTPException, Response
+from sqlalchemy import select
+from sqlalchemy.dialects.sqlite import insert
 from sqlalchemy.orm import Session
 from sqlalchemy.exc import IntegrityError
 
 from app.src.task_completions.schemas import (
+    TaskCompletionBulkCreate,
+    TaskCompletionBulkResponse,
+    TaskCompletionBulkStatus,
     TaskCompletionCreate,
     TaskCompletionResponse,
 )
 
 
-def get_task_completions(sql: Session) -> list[TaskCompletionResponse]:
+TASK_COMPLETION_PROJECTION = Projection(TaskCompletionResponse, models.TaskCompletion)
+TASK_COMPLETION_FILTERS = Filters(
+    {
+        "task_completion_id": models.TaskCompletion.task_completion_id,
+        "enrollment_id": models.TaskCompletion.enrollment_id,
+        "task_id": models.TaskCompletion.task_id,
+        "is_active": models.TaskCompletion.is_active,
+        "completed_at": models.TaskCompletion.completed_at,
+    },
+    sortable=("task_completion_id",),
+)
+
+
+def check_owner(
+    owner_id: int | None, enrollment: models.Enrollment, is_active: bool | None
+) -> None:
+    """Limit a restricted caller to the pending completions of its enrollments.
+
+    Approving a completion (is_active) is left to the teachers.
+    """
+    if owner_id is not None and (enrollment.student_id != owner_id or is_active):
+        raise HTTPException(status_code=403, detail="Permission denied")
+
+
+def get_task_completions(
+    sql: Session,
+    cursor: str | None = None,
+    limit: int | None = None,
+    fields: str | None = None,
+    filters: list[str] | None = None,
+    sort: str | None = None,
+) -> list[TaskCompletionResponse] | Page[TaskCompletionResponse] | Response:
     try:
-        task_completions: list[models.TaskCompletion] = sql.query(
-            models.TaskCompletion
-        ).all()
-        return [
-            TaskCompletionResponse.model_validate(task_completion)
-            for task_completion in task_completions
-        ]
+        ordering = TASK_COMPLETION_FILTERS.ordering(sort)
+        if fields is not None or settings.serialization.fast_collections:
+            projection = TASK_COMPLETION_PROJECTION.restrict(fields)
+            return list_response(
+                TASK_COMPLETION_FILTERS.where(
+                    sql.query(*projection.columns),
+                    filters,
+                ),
+                projection,
+                models.TaskCompletion.task_completion_id,
+                cursor,
+                limit,
+                ordering=ordering,
+            )
+
+        query = sql.query(models.TaskCompletion)
+        query = TASK_COMPLETION_FILTERS.where(query, filters)
+        if cursor is None and limit is None:
+            task_completions: list[models.TaskCompletion] = order_by_keys(
+                query, ordering
+            ).all()
+            return [
+                TaskCompletionResponse.model_validate(task_completion)
+                for task_completion in task_completions
+            ]
+
+        task_completions, next_cursor = keyset_paginate(
+            query,
+            models.TaskCompletion.task_completion_id,
+            cursor,
+            limit or DEFAULT_PAGE_LIMIT,
+            ordering,
+        )
+        return Page[TaskCompletionResponse](
+            items=[
+                TaskCompletionResponse.model_validate(task_completion)
+                for task_completion in task_completions
+            ],
+            next_cursor=next_cursor,
+        )
+
+    except HTTPException as e:
+        raise e
+
     except Exception as e:
         print(e)
         raise HTTPException(status_code=500, detail="Internal server error") from e
 
 
 def create_task_completion(
-    sql: Session, data: TaskCompletionCreate
+    sql: Session, data: TaskCompletionCreate, owner_id: int | None = None
 ) -> TaskCompletionResponse:
     try:
-        new_task_completion = models.TaskCompletion(**data.model_dump())
+        def write(sql: Session) -> TaskCompletionResponse:
+            new_task_completion = models.TaskCompletion(**data.model_dump())
 
-        enrollment: models.Enrollment | None = sql.get(
-            models.Enrollment, validate_int(data.enrollment_id)
-        )
-        if enrollment is None or not enrollment.is_active:
-            raise HTTPException(status_code=404, detail="Enrollment not found")
+            enrollment: models.Enrollment | None = sql.get(
+                models.Enrollment, validate_int(data.enrollment_id)
+            )
+            if enrollment is None or not enrollment.is_active:
+                raise HTTPException(status_code=404, detail="Enrollment not found")
+            check_owner(owner_id, enrollment, data.is_active)
+
+            task: models.Task | None = sql.get(models.Task, validate_int(data.task_id))
+            if task is None or not task.is_active:
+                raise HTTPException(status_code=404, detail="Task not found")
+
+            sql.add(new_task_completion)
+            sql.flush()
+
+            if new_task_completion.is_active and task.course_id == enrollment.course_id:
+                bump_completed_tasks(sql, enrollment.enrollment_id, 1)
+
+            return TaskCompletionResponse.model_validate(new_task_completion)
 
-        task: models.Task | None = sql.get(models.Task, validate_int(data.task_id))
-        if task is None or not task.is_active:
-            raise HTTPException(status_code=404, detail="Task not found")
+        return run_write(sql, write)
 
-        sql.add(new_task_completion)
-        sql.commit()
-        sql.refresh(new_task_completion)
-        return TaskCompletionResponse.model_validate(new_task_completion)
     except HTTPException as e:
         raise e
     except IntegrityError as e:
@@ -56,34 +148,148 @@ def create_task_completion(
         raise HTTPException(status_code=500, detail="Internal server error") from e
 
 
+def create_task_completions_bulk(
+    sql: Session, data: TaskCompletionBulkCreate, owner_id: int | None = None
+) -> TaskCompletionBulkResponse:
+    try:
+        if owner_id is not None and any(item.is_active for item in data.items):
+            raise HTTPException(status_code=403, detail="Permission denied")
+
+        def write(sql: Session) -> TaskCompletionBulkResponse:
+            enrollment_ids = {item.enrollment_id for item in data.items}
+            # Other students' enrollments are reported as not found
+            owned = (
+                () if owner_id is None else (models.Enrollment.student_id == owner_id,)
+            )
+            task_ids = {item.task_id for item in data.items}
+
+            enrollments = set(
+                sql.scalars(
+                    select(models.Enrollment.enrollment_id).where(
+                        models.Enrollment.enrollment_id.in_(enrollment_ids),
+                        models.Enrollment.is_active == True,  # noqa: E712
+                        *owned,
+                    )
+                )
+            )
+            tasks = set(
+                sql.scalars(
+                    select(models.Task.task_id).where(
+                        models.Task.task_id.in_(task_ids),
+                        models.Task.is_active == True,  # noqa: E712
+                    )
+                )
+            )
+            recorded = set(
+                sql.execute(
+                    select(
+                        models.TaskCompletion.enrollment_id,
+                        models.TaskCompletion.task_id,
+                    ).where(
+                        models.TaskCompletion.enrollment_id.in_(enrollments),
+                        models.TaskCompletion.task_id.in_(tasks),
+                    )
+                ).tuples()
+            )
+
+            statuses: list[TaskCompletionBulkStatus] = []
+            new_rows = []
+            new_positions = []
+            for item in data.items:
+                key = (item.enrollment_id, item.task_id)
+                if item.enrollment_id not in enrollments:
+                    statuses.append("enrollment_not_found")
+                elif item.task_id not in tasks:
+                    statuses.append("task_not_found")
+                elif key in recorded:
+                    statuses.append("exists")
+                else:
+                    new_positions.append(len(statuses))
+                    statuses.append("created")
+                    recorded.add(key)
+                    new_rows.append(item.model_dump())
+
+            created = 0
+            if new_rows:
+                # The unique (enrollment_id, task_id) index keeps a retried
+                # request from recording anything twice
+                inserted = set(
+                    sql.execute(
+                        insert(models.TaskCompletion)
+                        .on_conflict_do_nothing()
+                        .returning(
+                            models.TaskCompletion.enrollment_id,
+                            models.TaskCompletion.task_id,
+                        ),
+                        new_rows,
+                    ).tuples()
+                )
+                for position, row in zip(new_positions, new_rows, strict=True):
+                    if (row["enrollment_id"], row["task_id"]) not in inserted:
+                        # Recorded by a concurrent request since the lookup
+                        statuses[position] = "exists"
+                created = len(inserted)
+                if inserted:
+                    recount_progress(
+                        sql,
+                        models.Enrollment.enrollment_id.in_(
+                            {enrollment_id for enrollment_id, _ in inserted}
+                        ),
+                    )
+
+            return TaskCompletionBulkResponse(created=created, statuses=statuses)
+
+        return run_write(sql, write)
+
+    except HTTPException as e:
+        raise e
+    except Exception as e:
+        sql.rollback()
+        raise HTTPException(status_code=500, detail="Internal server error") from e
+
+
 def update_task_completion(
-    sql: Session, data: TaskCompletionCreate, task_completion_id: int
+    sql: Session,
+    data: TaskCompletionCreate,
+    task_completion_id: int,
+    owner_id: int | None = None,
 ) -> TaskCompletionResponse:
     try:
-        task_completion: models.TaskCompletion | None = sql.get(
-            models.TaskCompletion, validate_int(task_completion_id)
-        )
-        if task_completion is None:
-            raise HTTPException(status_code=404, detail="TaskCompletion not found")
-
-        if data.enrollment_id is not None:
-            enrollment: models.Enrollment | None = sql.get(
-                models.Enrollment, validate_int(data.enrollment_id)
+        def write(sql: Session) -> TaskCompletionResponse:
+            task_completion: models.TaskCompletion | None = sql.get(
+                models.TaskCompletion, validate_int(task_completion_id)
             )
-            if enrollment is None or not enrollment.is_active:
-                raise HTTPException(status_code=404, detail="Enrollment not found")
+            if task_completion is None:
+                raise HTTPException(status_code=404, detail="TaskCompletion not found")
+            check_owner(owner_id, task_completion.enrollment, task_completion.is_active)
 
-        if data.task_id is not None:
-            task: models.Task | None = sql.get(models.Task, data.task_id)
-            if task is None or not task.is_active:
-                raise HTTPException(status_code=404, detail="Task not found")
+            if data.enrollment_id is not None:
+                enrollment: models.Enrollment | None = sql.get(
+                    models.Enrollment, validate_int(data.enrollment_id)
+                )
+                if enrollment is None or not enrollment.is_active:
+                    raise HTTPException(status_code=404, detail="Enrollment not found")
+                check_owner(owner_id, enrollment, data.is_active)
 
-        for var, value in vars(data).items():
-            setattr(task_completion, var, value)
+            if data.task_id is not None:
+                task: models.Task | None = sql.get(models.Task, data.task_id)
+                if task is None or not task.is_active:
+                    raise HTTPException(status_code=404, detail="Task not found")
 
-        sql.commit()
-        sql.refresh(task_completion)
-        return TaskCompletionResponse.model_validate(task_completion)
+            previous_enrollment_id = task_completion.enrollment_id
+            for var, value in vars(data).items():
+                setattr(task_completion, var, value)
+
+            sql.flush()
+            recount_progress(
+                sql,
+                models.Enrollment.enrollment_id.in_(
+                    {previous_enrollment_id, task_completion.enrollment_id}
+                ),
+            )
+            return TaskCompletionResponse.model_validate(task_completion)
+
+        return run_write(sql, write)
 
     except HTTPException as e:
         raise e
@@ -99,9 +305,21 @@ def update_task_completion(
 
 
 def get_task_completion(
-    sql: Session, task_completion_id: int
-) -> TaskCompletionResponse:
+    sql: Session, task_completion_id: int, fields: str | None = None
+) -> TaskCompletionResponse | Response:
     try:
+        if fields is not None:
+            projection = TASK_COMPLETION_PROJECTION.restrict(fields)
+            return detail_response(
+                sql.query(*projection.columns).filter(
+                    models.TaskCompletion.task_completion_id
+                    == validate_int(task_completion_id),
+                    models.TaskCompletion.is_active == True,
+                ),
+                projection,
+                "TaskCompletion not found",
+            )
+
         task_completion: models.TaskCompletion | None = sql.get(
             models.TaskCompletion, validate_int(task_completion_id)
         )
@@ -117,17 +335,25 @@ def get_task_completion(
 
 
 def delete_task_completion(
-    sql: Session, task_completion_id: int
+    sql: Session, task_completion_id: int, owner_id: int | None = None
 ) -> TaskCompletionResponse:
     try:
-        task_completion: models.TaskCompletion | None = sql.get(
-            models.TaskCompletion, validate_int(task_completion_id)
-        )
-        if task_completion is None:
-            raise HTTPException(status_code=404, detail="TaskCompletion not found")
-        sql.delete(task_completion)
-        sql.commit()
-        return TaskCompletionResponse.model_validate(task_completion)
+        def write(sql: Session) -> TaskCompletionResponse:
+            task_completion: models.TaskCompletion | None = sql.get(
+                models.TaskCompletion, validate_int(task_completion_id)
+            )
+            if task_completion is None:
+                raise HTTPException(status_code=404, detail="TaskCompletion not found")
+            check_owner(owner_id, task_completion.enrollment, task_completion.is_active)
+            sql.delete(task_completion)
+            sql.flush()
+            recount_progress(
+                sql,
+                models.Enrollment.enrollment_id == task_completion.enrollment_id,
+            )
+            return TaskCompletionResponse.model_validate(task_completion)
+
+        return run_write(sql, write)
 
     except HTTPException as e:
         raise e
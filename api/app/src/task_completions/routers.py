@@ -1,31 +1,84 @@
 from typing import Annotated
-from app.database import get_sql
+from app.annotations import (
+    CURSOR_QUERY_ANNOTATION,
+    FIELDS_QUERY_ANNOTATION,
+    FILTER_QUERY_ANNOTATION,
+    LIMIT_QUERY_ANNOTATION,
+    SORT_QUERY_ANNOTATION,
+)
+from app.pagination import Page
+from app.database import get_read_sql, get_sql
+from app.src.auth.permissions import Permission, owner_scope
+from app.versioning import conditional_get
 from app.src.task_completions.controllers import (
     create_task_completion,
+    create_task_completions_bulk,
     get_task_completions,
     get_task_completion,
     update_task_completion,
     delete_task_completion,
 )
-from app.src.task_completions.schemas import TaskCompletionCreate, TaskCompletionResponse
+from app.src.task_completions.schemas import (
+    TaskCompletionBulkCreate,
+    TaskCompletionBulkResponse,
+    TaskCompletionCreate,
+    TaskCompletionResponse,
+)
 from fastapi import APIRouter, Depends
 from sqlalchemy.orm import Session
 
 router = APIRouter(prefix="/task_completion", tags=["TaskCompletion"])
 
+# Students only write the pending completions of their own enrollments
+OWNER_ID = Annotated[
+    int | None, Depends(owner_scope(Permission.WRITE_TASK_COMPLETIONS))
+]
+
 
-@router.get("", summary="Get all task_completions", operation_id="getTaskCompletions")
+@router.get(
+    "",
+    summary="Get all task_completions",
+    operation_id="getTaskCompletions",
+    dependencies=[conditional_get("task_completions")],
+)
 def endp_get_task_completions(
-    sql: Annotated[Session, Depends(get_sql)],
-) -> list[TaskCompletionResponse]:
-    return get_task_completions(sql=sql)
+    sql: Annotated[Session, Depends(get_read_sql)],
+    cursor: CURSOR_QUERY_ANNOTATION = None,
+    limit: LIMIT_QUERY_ANNOTATION = None,
+    fields: FIELDS_QUERY_ANNOTATION = None,
+    filters: FILTER_QUERY_ANNOTATION = None,
+    sort: SORT_QUERY_ANNOTATION = None,
+) -> list[TaskCompletionResponse] | Page[TaskCompletionResponse]:
+    return get_task_completions(
+        sql=sql,
+        cursor=cursor,
+        limit=limit,
+        fields=fields,
+        filters=filters,
+        sort=sort,
+    )
 
 
 @router.post("", summary="Create a task_completion", operation_id="createTaskCompletion")
 def endp_create_task_completion(
-    sql: Annotated[Session, Depends(get_sql)], data: TaskCompletionCreate
+    sql: Annotated[Session, Depends(get_sql)],
+    data: TaskCompletionCreate,
+    owner_id: OWNER_ID,
 ) -> TaskCompletionResponse:
-    return create_task_completion(sql=sql, data=data)
+    return create_task_completion(sql=sql, data=data, owner_id=owner_id)
+
+
+@router.post(
+    "/bulk",
+    summary="Record many task_completions",
+    operation_id="createTaskCompletionsBulk",
+)
+def endp_create_task_completions_bulk(
+    sql: Annotated[Session, Depends(get_sql)],
+    data: TaskCompletionBulkCreate,
+    owner_id: OWNER_ID,
+) -> TaskCompletionBulkResponse:
+    return create_task_completions_bulk(sql=sql, data=data, owner_id=owner_id)
 
 
 @router.put(
@@ -37,9 +90,10 @@ def endp_update_task_completion(
     task_completion_id: int,
     sql: Annotated[Session, Depends(get_sql)],
     data: TaskCompletionCreate,
+    owner_id: OWNER_ID,
 ) -> TaskCompletionResponse:
     return update_task_completion(
-        sql=sql, data=data, task_completion_id=task_completion_id
+        sql=sql, data=data, task_completion_id=task_completion_id, owner_id=owner_id
     )
 
 
@@ -47,11 +101,16 @@ def endp_update_task_completion(
     "/{task_completion_id}",
     summary="Get a task_completion",
     operation_id="getTaskCompletion",
+    dependencies=[conditional_get("task_completions")],
 )
 def endp_get_task_completion(
-    sql: Annotated[Session, Depends(get_sql)], task_completion_id: int
+    sql: Annotated[Session, Depends(get_read_sql)],
+    task_completion_id: int,
+    fields: FIELDS_QUERY_ANNOTATION = None,
 ) -> TaskCompletionResponse:
-    return get_task_completion(sql=sql, task_completion_id=task_completion_id)
+    return get_task_completion(
+        sql=sql, task_completion_id=task_completion_id, fields=fields
+    )
 
 
 @router.delete(
@@ -61,6 +120,10 @@ def endp_get_task_completion(
     status_code=204,
 )
 def endp_delete_task_completion(
-    task_completion_id: int, sql: Annotated[Session, Depends(get_sql)]
+    task_completion_id: int,
+    sql: Annotated[Session, Depends(get_sql)],
+    owner_id: OWNER_ID,
 ) -> None:
-    return delete_task_completion(sql=sql, task_completion_id=task_completion_id)
+    return delete_task_completion(
+        sql=sql, task_completion_id=task_completion_id, owner_id=owner_id
+    )
@@ -1,4 +1,6 @@
-from pydantic import BaseModel, ConfigDict
+from typing import Literal
+
+from pydantic import BaseModel, ConfigDict, Field
 from datetime import datetime
 
 
@@ -23,4 +25,19 @@ class TaskCompletionUpdate(BaseModel):
     enrollment_id: int | None = None
     task_id: int | None = None
     completed_at: datetime | None = None
-    is_active: bool | None = None
\ No newline at end of file
+    is_active: bool | None = None
+
+
+class TaskCompletionBulkCreate(BaseModel):
+    items: list[TaskCompletionCreate] = Field(..., min_length=1, max_length=5000)
+
+
+TaskCompletionBulkStatus = Literal[
+    "created", "exists", "enrollment_not_found", "task_not_found"
+]
+
+
+class TaskCompletionBulkResponse(BaseModel):
+    created: int
+    # One status per submitted item, in request order
+    statuses: list[TaskCompletionBulkStatus]
@@ -1,17 +1,76 @@
-from fastapi import HTTPException
+from fastapi import HTTPException, Response
 from sqlalchemy.orm import Session
 from app import models
+from app.cache import cached_response
+from app.writer import run_write
+from app.src.enrollments.progress import bump_total_tasks, recount_progress
 from app.src.tasks.schemas import TaskCreate, TaskResponse, TaskUpdate
 from sqlalchemy.exc import IntegrityError
 from app.utils import validate_int
+from app.filtering import Filters
+from app.pagination import (
+    DEFAULT_PAGE_LIMIT,
+    Page,
+    keyset_paginate,
+    order_by_keys,
+)
+from app.config import settings
+from app.serialization import Projection, detail_response, list_response
+
+
+TASK_PROJECTION = Projection(TaskResponse, models.Task)
+TASK_FILTERS = Filters(
+    {
+        "task_id": models.Task.task_id,
+        "course_id": models.Task.course_id,
+    },
+    sortable=("task_id", "course_id"),
+)
+
+
+@cached_response("tasks")
+def get_tasks(
+    sql: Session,
+    cursor: str | None = None,
+    limit: int | None = None,
+    fields: str | None = None,
+    filters: list[str] | None = None,
+    sort: str | None = None,
+) -> list[TaskResponse] | Page[TaskResponse] | Response:
+    try:
+        ordering = TASK_FILTERS.ordering(sort)
+        if fields is not None or settings.serialization.fast_collections:
+            projection = TASK_PROJECTION.restrict(fields)
+            return list_response(
+                TASK_FILTERS.where(
+                    sql.query(*projection.columns).filter(
+                        models.Task.is_active == True
+                    ),
+                    filters,
+                ),
+                projection,
+                models.Task.task_id,
+                cursor,
+                limit,
+                ordering=ordering,
+            )
 
+        query = sql.query(models.Task).filter(models.Task.is_active == True)
+        query = TASK_FILTERS.where(query, filters)
+        if cursor is None and limit is None:
+            tasks: list[models.Task] = order_by_keys(query, ordering).all()
+            return [TaskResponse.model_validate(task) for task in tasks]
 
-def get_tasks(sql: Session) -> list[TaskResponse]:
-    try:
-        tasks: list[models.Task] = (
-            sql.query(models.Task).filter(models.Task.is_active == True).all()
+        tasks, next_cursor = keyset_paginate(
+            query, models.Task.task_id, cursor, limit or DEFAULT_PAGE_LIMIT, ordering
+        )
+        return Page[TaskResponse](
+            items=[TaskResponse.model_validate(task) for task in tasks],
+            next_cursor=next_cursor,
         )
-        return [TaskResponse.model_validate(task) for task in tasks]
+
+    except HTTPException as e:
+        raise e
 
     except Exception as e:
         print(e)
@@ -23,18 +82,24 @@ def create_task(
     data: TaskCreate,
 ) -> TaskResponse:
     try:
-        task_data = data.model_dump()
-        new_task: models.Task = models.Task(**task_data)
-        course: models.Course | None = sql.get(
-            models.Course, validate_int(new_task.course_id)
-        )
-        if course is None or not course.is_active:
-            raise HTTPException(status_code=404, detail="Course not found")
+        def write(sql: Session) -> TaskResponse:
+            task_data = data.model_dump()
+            new_task: models.Task = models.Task(**task_data)
+            course: models.Course | None = sql.get(
+                models.Course, validate_int(new_task.course_id)
+            )
+            if course is None or not course.is_active:
+                raise HTTPException(status_code=404, detail="Course not found")
 
-        sql.add(new_task)
-        sql.commit()
-        sql.refresh(new_task)
-        return TaskResponse.model_validate(new_task)
+            sql.add(new_task)
+            sql.flush()
+
+            if new_task.is_active:
+                bump_total_tasks(sql, new_task.course_id, 1)
+
+            return TaskResponse.model_validate(new_task)
+
+        return run_write(sql, write)
 
     except IntegrityError as e:
         sql.rollback()
@@ -51,24 +116,34 @@ def create_task(
 
 def update_task(sql: Session, data: TaskUpdate, task_id: int) -> TaskResponse:
     try:
-        task: models.Task | None = sql.get(models.Task, validate_int(task_id))
-        if task is None or not task.is_active:
-            raise HTTPException(status_code=404, detail="Task not found")
-
-        if data.course_id is not None:
-            course: models.Course | None = sql.get(
-                models.Course, validate_int(data.course_id)
-            )
-            if course is None or not course.is_active:
-                raise HTTPException(status_code=404, detail="Course not found")
-
-        for var, value in vars(data).items():
-            if value is not None:
-                setattr(task, var, value)
-
-        sql.commit()
-        sql.refresh(task)
-        return TaskResponse.model_validate(task)
+        def write(sql: Session) -> TaskResponse:
+            task: models.Task | None = sql.get(models.Task, validate_int(task_id))
+            if task is None or not task.is_active:
+                raise HTTPException(status_code=404, detail="Task not found")
+
+            if data.course_id is not None:
+                course: models.Course | None = sql.get(
+                    models.Course, validate_int(data.course_id)
+                )
+                if course is None or not course.is_active:
+                    raise HTTPException(status_code=404, detail="Course not found")
+
+            previous_course_id = task.course_id
+            for var, value in vars(data).items():
+                if value is not None:
+                    setattr(task, var, value)
+
+            sql.flush()
+            if data.course_id is not None or data.is_active is not None:
+                recount_progress(
+                    sql,
+                    models.Enrollment.course_id.in_(
+                        {previous_course_id, task.course_id}
+                    ),
+                )
+            return TaskResponse.model_validate(task)
+
+        return run_write(sql, write)
 
     except HTTPException as e:
         raise e
@@ -82,8 +157,22 @@ def update_task(sql: Session, data: TaskUpdate, task_id: int) -> TaskResponse:
         raise HTTPException(status_code=500, detail="Internal server error") from e
 
 
-def get_task(sql: Session, task_id: int) -> TaskResponse:
+@cached_response("tasks")
+def get_task(
+    sql: Session, task_id: int, fields: str | None = None
+) -> TaskResponse | Response:
     try:
+        if fields is not None:
+            projection = TASK_PROJECTION.restrict(fields)
+            return detail_response(
+                sql.query(*projection.columns).filter(
+                    models.Task.task_id == validate_int(task_id),
+                    models.Task.is_active == True,
+                ),
+                projection,
+                "Task not found",
+            )
+
         task: models.Task | None = sql.get(models.Task, validate_int(task_id))
         if task is None or not task.is_active:
             raise HTTPException(status_code=404, detail="Task not found")
@@ -98,13 +187,19 @@ def get_task(sql: Session, task_id: int) -> TaskResponse:
 
 def delete_task(sql: Session, task_id: int):
     try:
-        task: models.Task | None = sql.get(models.Task, validate_int(task_id))
-        if task is None:
-            raise HTTPException(status_code=404, detail="Task not found")
+        def write(sql: Session) -> None:
+            task: models.Task | None = sql.get(models.Task, validate_int(task_id))
+            if task is None:
+                raise HTTPException(status_code=404, detail="Task not found")
+
+            was_active = task.is_active
+            task.is_active = False
+            sql.flush()
+
+            if was_active:
+                recount_progress(sql, models.Enrollment.course_id == task.course_id)
 
-        task.is_active = False
-        sql.commit()
-        sql.refresh(task)
+        return run_write(sql, write)
 
     except HTTPException as e:
         raise e
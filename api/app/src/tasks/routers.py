@@ -1,6 +1,14 @@
 from typing import Annotated
 
-from app.annotations import ID_PATH_ANNOTATION
+from app.annotations import (
+    CURSOR_QUERY_ANNOTATION,
+    FIELDS_QUERY_ANNOTATION,
+    FILTER_QUERY_ANNOTATION,
+    ID_PATH_ANNOTATION,
+    LIMIT_QUERY_ANNOTATION,
+    SORT_QUERY_ANNOTATION,
+)
+from app.pagination import Page
 from app.src.tasks.controllers import (
     create_task,
     delete_task,
@@ -11,16 +19,34 @@ from app.src.tasks.controllers import (
 from app.src.tasks.schemas import TaskCreate, TaskResponse, TaskUpdate
 from fastapi import APIRouter, Depends
 from sqlalchemy.orm import Session
-from app.database import get_sql
+from app.database import get_read_sql, get_sql
+from app.versioning import conditional_get
 
 router = APIRouter(prefix="/tasks", tags=["Tasks"])
 
 
-@router.get("", summary="Get all tasks", operation_id="getTasks")
+@router.get(
+    "",
+    summary="Get all tasks",
+    operation_id="getTasks",
+    dependencies=[conditional_get("tasks")],
+)
 def endp_get_tasks(
-    sql: Annotated[Session, Depends(get_sql)],
-) -> list[TaskResponse]:
-    return get_tasks(sql=sql)
+    sql: Annotated[Session, Depends(get_read_sql)],
+    cursor: CURSOR_QUERY_ANNOTATION = None,
+    limit: LIMIT_QUERY_ANNOTATION = None,
+    fields: FIELDS_QUERY_ANNOTATION = None,
+    filters: FILTER_QUERY_ANNOTATION = None,
+    sort: SORT_QUERY_ANNOTATION = None,
+) -> list[TaskResponse] | Page[TaskResponse]:
+    return get_tasks(
+        sql=sql,
+        cursor=cursor,
+        limit=limit,
+        fields=fields,
+        filters=filters,
+        sort=sort,
+    )
 
 
 @router.post("", summary="Create a task", operation_id="createTasks")
@@ -39,11 +65,18 @@ def endp_update_task(
     return update_task(sql=sql, data=data, task_id=task_id)
 
 
-@router.get("/{task_id}", summary="Get a task", operation_id="getTask")
+@router.get(
+    "/{task_id}",
+    summary="Get a task",
+    operation_id="getTask",
+    dependencies=[conditional_get("tasks")],
+)
 def endp_get_task(
-    sql: Annotated[Session, Depends(get_sql)], task_id: ID_PATH_ANNOTATION
+    sql: Annotated[Session, Depends(get_read_sql)],
+    task_id: ID_PATH_ANNOTATION,
+    fields: FIELDS_QUERY_ANNOTATION = None,
 ) -> TaskResponse:
-    return get_task(sql=sql, task_id=task_id)
+    return get_task(sql=sql, task_id=task_id, fields=fields)
 
 
 @router.delete(
@@ -1,4 +1,16 @@
 from app import models
+from app.writer import run_write
+from app.filtering import Filters
+from app.pagination import (
+    DEFAULT_PAGE_LIMIT,
+    Page,
+    keyset_paginate,
+    order_by_keys,
+)
+from app.config import settings
+from app.serialization import Projection, detail_response, list_response
+from app.src.auth.revocations import revoke_tokens
+from app.src.roles.schemas import RoleResponse
 from app.src.users.schemas import (
     UserCreate,
     UserResponse,
@@ -6,23 +18,57 @@ from app.src.users.schemas import (
     UserUpdate,
 )
 from app.utils import validate_int
-from fastapi import HTTPException
-from sqlalchemy.orm import Session
+from fastapi import HTTPException, Response
+from sqlalchemy.orm import Query, Session, joinedload, selectinload
+from sqlalchemy import select
 from sqlalchemy.exc import IntegrityError, OperationalError
 
 
+# Loader profiles: every relationship a response schema reads is loaded with the
+# user itself, so list endpoints issue a constant number of statements
+USER_RESPONSE_OPTIONS = (joinedload(models.User.role),)
+USER_TASKS_AND_COURSES_OPTIONS = (
+    joinedload(models.User.role),
+    selectinload(models.User.created_courses),
+)
+USER_PROJECTION = Projection(
+    UserResponse, models.User, role=Projection(RoleResponse, models.Role)
+)
+USER_FILTERS = Filters(
+    {
+        "user_id": models.User.user_id,
+        "username": models.User.username,
+        "role_id": models.User.role_id,
+    },
+    sortable=("user_id", "username"),
+)
+
+
+def user_projection_query(sql: Session, projection: Projection) -> Query:
+    query = sql.query(*projection.columns).select_from(models.User)
+    if "role" in projection.nested:
+        query = query.join(models.User.role)
+    return query
+
+
 def create_user(sql: Session, data: UserCreate) -> UserResponse:
     try:
-        new_user: models.User = models.User(**data.model_dump())
-
-        role: models.Role | None = sql.get(models.Role, validate_int(new_user.role_id))
-        if role is None:
-            raise HTTPException(status_code=404, detail="Role not found")
-        sql.add(new_user)
-        sql.commit()
-        sql.refresh(new_user)
-        return UserResponse.model_validate(new_user)
-    
+        def write(sql: Session) -> UserResponse:
+            role: models.Role | None = sql.scalars(
+                select(models.Role).where(
+                    models.Role.name == settings.auth.default_role
+                )
+            ).one_or_none()
+            if role is None:
+                raise HTTPException(status_code=404, detail="Default role not found")
+
+            new_user: models.User = models.User(**data.model_dump(), role=role)
+            sql.add(new_user)
+            sql.flush()
+            return UserResponse.model_validate(new_user)
+
+        return run_write(sql, write)
+
     except HTTPException as e:
         raise e from e
 
@@ -37,14 +83,52 @@ def create_user(sql: Session, data: UserCreate) -> UserResponse:
         raise HTTPException(status_code=500, detail="Unexpected error") from e
 
 
-def get_users(sql: Session) -> list[UserResponse]:
+def get_users(
+    sql: Session,
+    cursor: str | None = None,
+    limit: int | None = None,
+    fields: str | None = None,
+    filters: list[str] | None = None,
+    sort: str | None = None,
+) -> list[UserResponse] | Page[UserResponse] | Response:
     try:
-        users: list[models.User] = (
-            sql.query(models.User).where(models.User.is_active == True).all()
+        ordering = USER_FILTERS.ordering(sort)
+        if fields is not None or settings.serialization.fast_collections:
+            projection = USER_PROJECTION.restrict(fields)
+            return list_response(
+                USER_FILTERS.where(
+                    user_projection_query(sql, projection).where(
+                        models.User.is_active == True
+                    ),
+                    filters,
+                ),
+                projection,
+                models.User.user_id,
+                cursor,
+                limit,
+                not_found_detail="Users not found",
+                ordering=ordering,
+            )
+
+        query = (
+            sql.query(models.User)
+            .options(*USER_RESPONSE_OPTIONS)
+            .where(models.User.is_active == True)
+        )
+        query = USER_FILTERS.where(query, filters)
+        if cursor is None and limit is None:
+            users: list[models.User] = order_by_keys(query, ordering).all()
+            if not users:
+                raise HTTPException(status_code=404, detail="Users not found")
+            return [UserResponse.model_validate(user) for user in users]
+
+        users, next_cursor = keyset_paginate(
+            query, models.User.user_id, cursor, limit or DEFAULT_PAGE_LIMIT, ordering
+        )
+        return Page[UserResponse](
+            items=[UserResponse.model_validate(user) for user in users],
+            next_cursor=next_cursor,
         )
-        if not users:
-            raise HTTPException(status_code=404, detail="Users not found")
-        return [UserResponse.model_validate(user) for user in users]
 
     except HTTPException as e:
         raise e
@@ -57,9 +141,24 @@ def get_users(sql: Session) -> list[UserResponse]:
         raise HTTPException(status_code=500, detail="Unexpected error") from e
 
 
-def get_user(sql: Session, user_id: int) -> UserResponse:
+def get_user(
+    sql: Session, user_id: int, fields: str | None = None
+) -> UserResponse | Response:
     try:
-        user: models.User | None = sql.get(models.User, validate_int(user_id))
+        if fields is not None:
+            projection = USER_PROJECTION.restrict(fields)
+            return detail_response(
+                user_projection_query(sql, projection).filter(
+                    models.User.user_id == validate_int(user_id),
+                    models.User.is_active == True,
+                ),
+                projection,
+                "User not found",
+            )
+
+        user: models.User | None = sql.get(
+            models.User, validate_int(user_id), options=USER_RESPONSE_OPTIONS
+        )
         if user is None or not user.is_active:
             raise HTTPException(status_code=404, detail="User not found")
 
@@ -78,22 +177,38 @@ def get_user(sql: Session, user_id: int) -> UserResponse:
 
 def update_user(sql: Session, user_id: int, data: UserUpdate) -> UserResponse:
     try:
-        user: models.User | None = sql.get(models.User, validate_int(user_id))
-        if user is None:
-            raise HTTPException(status_code=404, detail="User not found")
-
-        if data.role_id is not None:
-            role: models.Role | None = sql.get(models.Role, validate_int(data.role_id))
-            if role is None:
-                raise HTTPException(status_code=404, detail="Role not found")
-
-        for key, value in data.model_dump(exclude_unset=True).items():
-            if value is not None:
-                setattr(user, key, value)
-
-        sql.commit()
-        sql.refresh(user)
-        return UserResponse.model_validate(user)
+        def write(sql: Session) -> UserResponse:
+            user: models.User | None = sql.get(models.User, validate_int(user_id))
+            if user is None:
+                raise HTTPException(status_code=404, detail="User not found")
+
+            if data.role_id is not None:
+                role: models.Role | None = sql.get(models.Role, validate_int(data.role_id))
+                if role is None:
+                    raise HTTPException(status_code=404, detail="Role not found")
+
+            # The access tokens carry username and role, stale claims are revoked
+            revoke = (
+                (data.is_active is False and user.is_active)
+                or (data.role_id is not None and data.role_id != user.role_id)
+                or (data.username is not None and data.username != user.username)
+            )
+
+            for key, value in data.model_dump(exclude_unset=True).items():
+                if value is not None:
+                    setattr(user, key, value)
+
+            if revoke:
+                revoke_tokens(
+                    sql,
+                    select(models.User.user_id).where(
+                        models.User.user_id == user.user_id
+                    ),
+                )
+            sql.flush()
+            return UserResponse.model_validate(user)
+
+        return run_write(sql, write)
 
     except HTTPException as e:
         raise e from e
@@ -112,7 +227,9 @@ def update_user(sql: Session, user_id: int, data: UserUpdate) -> UserResponse:
 def get_user_tasks_and_courses(
     sql: Session, user_id: int
 ) -> UserResponseTasksAndCourses:
-    user = sql.get(models.User, validate_int(user_id))
+    user = sql.get(
+        models.User, validate_int(user_id), options=USER_TASKS_AND_COURSES_OPTIONS
+    )
     if user is None or not user.is_active:
         raise HTTPException(status_code=404, detail="User not found")
     return UserResponseTasksAndCourses.model_validate(user)
@@ -1,6 +1,15 @@
 from typing import Annotated
-from app.annotations import ID_PATH_ANNOTATION
-from app.database import get_sql
+from app.annotations import (
+    CURSOR_QUERY_ANNOTATION,
+    FIELDS_QUERY_ANNOTATION,
+    FILTER_QUERY_ANNOTATION,
+    ID_PATH_ANNOTATION,
+    LIMIT_QUERY_ANNOTATION,
+    SORT_QUERY_ANNOTATION,
+)
+from app.pagination import Page
+from app.database import get_read_sql, get_sql
+from app.versioning import conditional_get
 from app.src.users.controllers import create_user, get_user, get_user_tasks_and_courses, get_users, update_user
 from fastapi import APIRouter, Depends
 from sqlalchemy.orm import Session
@@ -9,16 +18,35 @@ from app.src.users.schemas import UserCreate, UserResponse, UserResponseTasksAnd
 
 
 router = APIRouter(prefix="/users", tags=["Users"])
+# Self-registration, the only user route open to anonymous callers
+registration_router = APIRouter(prefix="/users", tags=["Users"])
 
 
-@router.get("", summary="Get all users", operation_id="getUsers")
+@router.get(
+    "",
+    summary="Get all users",
+    operation_id="getUsers",
+    dependencies=[conditional_get("users", "roles")],
+)
 def endp_get_users(
-    sql: Annotated[Session, Depends(get_sql)],
-) -> list[UserResponse]:
-    return get_users(sql)
+    sql: Annotated[Session, Depends(get_read_sql)],
+    cursor: CURSOR_QUERY_ANNOTATION = None,
+    limit: LIMIT_QUERY_ANNOTATION = None,
+    fields: FIELDS_QUERY_ANNOTATION = None,
+    filters: FILTER_QUERY_ANNOTATION = None,
+    sort: SORT_QUERY_ANNOTATION = None,
+) -> list[UserResponse] | Page[UserResponse]:
+    return get_users(
+        sql,
+        cursor=cursor,
+        limit=limit,
+        fields=fields,
+        filters=filters,
+        sort=sort,
+    )
 
 
-@router.post("", summary="Create a user", operation_id="createUsers")
+@registration_router.post("", summary="Create a user", operation_id="createUsers")
 def endp_create_user(
     sql: Annotated[Session, Depends(get_sql)], data: UserCreate
 ) -> UserResponse:
@@ -34,15 +62,27 @@ def endp_update_user(
     return update_user(sql, user_id, data)
 
 
-@router.get("/{user_id}", summary="Get a user", operation_id="getUser")
+@router.get(
+    "/{user_id}",
+    summary="Get a user",
+    operation_id="getUser",
+    dependencies=[conditional_get("users", "roles")],
+)
 def endp_get_user(
-    sql: Annotated[Session, Depends(get_sql)], user_id: ID_PATH_ANNOTATION
+    sql: Annotated[Session, Depends(get_read_sql)],
+    user_id: ID_PATH_ANNOTATION,
+    fields: FIELDS_QUERY_ANNOTATION = None,
 ) -> UserResponse:
-    return get_user(sql, user_id)
+    return get_user(sql, user_id, fields=fields)
 
 
-@router.get("/{user_id}/tasksAndCourses", summary="Get a user", operation_id="getUserTasksAndCourses")
+@router.get(
+    "/{user_id}/tasksAndCourses",
+    summary="Get a user",
+    operation_id="getUserTasksAndCourses",
+    dependencies=[conditional_get("users", "roles", "courses", "enrollments", "task_completions")],
+)
 def endp_get_user_task_and_courses(
-    sql: Annotated[Session, Depends(get_sql)], user_id: ID_PATH_ANNOTATION
+    sql: Annotated[Session, Depends(get_read_sql)], user_id: ID_PATH_ANNOTATION
 ) -> UserResponseTasksAndCourses:
     return get_user_tasks_and_courses(sql, user_id)
@@ -14,7 +14,7 @@ class UserBase(BaseModel):
 
 
 class UserCreate(UserBase):
-    role_id: int
+    # Registered users always get auth__default_role, admins change it later
     password_hash: str = Field(..., min_length=6, max_length=50)
 
 
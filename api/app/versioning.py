@@ -0,0 +1,155 @@
+"""Per-table change versions and the ETags of the GET endpoints built on them.
+
+Every flush and every bulk INSERT/UPDATE/DELETE run through a Session bumps
+the `table_versions` row of the tables it touched, inside the same
+transaction, so a rolled back write (or SAVEPOINT) leaves the version alone.
+GET routes declare the tables their response is built from with
+`conditional_get`; the ETag is a hash of the URL and those versions, which
+lets a matching `If-None-Match` be answered with 304 before the endpoint runs
+its query. The tables a transaction wrote are kept in `session.info` until it
+ends, for the after-commit hooks of app.cache.
+"""
+
+import hashlib
+from collections.abc import Iterable
+from typing import Annotated, Any
+
+from fastapi import Depends, HTTPException, Request
+from sqlalchemy import event, select
+from sqlalchemy.dialects.sqlite import insert
+from sqlalchemy.orm import ORMExecuteState, Session
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app import models
+from app.database import get_read_sql
+
+VERSIONS_TABLE = models.TableVersion.__table__
+CHANGED_TABLES = "changed_tables"
+
+
+def bump_versions(session: Session, tables: Iterable[str]) -> None:
+    names = sorted(set(tables) - {VERSIONS_TABLE.name})
+    if not names:
+        return
+    session.info.setdefault(CHANGED_TABLES, set()).update(names)
+
+    stmt = insert(VERSIONS_TABLE)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[VERSIONS_TABLE.c.table_name],
+        set_={"version": VERSIONS_TABLE.c.version + 1},
+    )
+    # Connection.execute skips do_orm_execute, so this does not bump itself
+    session.connection().execute(
+        stmt, [{"table_name": name, "version": 1} for name in names]
+    )
+
+
+@event.listens_for(Session, "after_flush")
+def bump_flushed_tables(session: Session, flush_context: Any) -> None:
+    # new/dirty/deleted and attribute history still show the flushed state here
+    changed = [*session.new, *session.deleted]
+    changed.extend(
+        instance
+        for instance in session.dirty
+        if session.is_modified(instance, include_collections=False)
+    )
+    bump_versions(session, (instance.__table__.name for instance in changed))
+
+
+@event.listens_for(Session, "do_orm_execute")
+def bump_statement_table(orm_execute_state: ORMExecuteState) -> None:
+    if (
+        orm_execute_state.is_insert
+        or orm_execute_state.is_update
+        or orm_execute_state.is_delete
+    ):
+        bump_versions(
+            orm_execute_state.session, [orm_execute_state.statement.table.name]
+        )
+
+
+@event.listens_for(Session, "after_transaction_end")
+def forget_changed_tables(session: Session, transaction: Any) -> None:
+    # Runs after after_commit; a rolled back SAVEPOINT keeps its tables, which
+    # at worst invalidates a little more than needed
+    if transaction.parent is None:
+        session.info.pop(CHANGED_TABLES, None)
+
+
+def read_versions(sql: Session, tables: Iterable[str]) -> dict[str, int]:
+    rows = sql.execute(
+        select(VERSIONS_TABLE.c.table_name, VERSIONS_TABLE.c.version).where(
+            VERSIONS_TABLE.c.table_name.in_(list(tables))
+        )
+    ).all()
+    return dict(rows)  # type: ignore[arg-type]
+
+
+def make_etag(
+    request: Request, tables: tuple[str, ...], versions: dict[str, int]
+) -> str:
+    state = ",".join(f"{table}:{versions.get(table, 0)}" for table in tables)
+    digest = hashlib.blake2b(
+        f"{request.url.path}?{request.url.query}|{state}".encode(), digest_size=12
+    ).hexdigest()
+    return f'W/"{digest}"'
+
+
+def etag_matches(if_none_match: str | None, etag: str) -> bool:
+    if if_none_match is None:
+        return False
+    # Weak comparison, the only kind allowed for If-None-Match
+    candidates = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+    return "*" in candidates or etag.removeprefix("W/") in candidates
+
+
+def conditional_get(*tables: str):
+    """Route dependency answering a matching `If-None-Match` with 304.
+
+    `tables` must cover every table the response is built from. The versions
+    are read before the endpoint queries, so a write landing in between can at
+    worst label newer data with an older ETag, which the next request simply
+    revalidates; stale data never gets a current ETag.
+    """
+    unknown = set(tables) - set(models.Base.metadata.tables)
+    if unknown:
+        raise ValueError(f"Unknown tables: {', '.join(sorted(unknown))}")
+
+    def check_etag(
+        request: Request, sql: Annotated[Session, Depends(get_read_sql)]
+    ) -> None:
+        etag = make_etag(request, tables, read_versions(sql, tables))
+        if etag_matches(request.headers.get("if-none-match"), etag):
+            raise HTTPException(status_code=304, headers={"ETag": etag})
+        request.state.etag = etag
+
+    return Depends(check_etag)
+
+
+class ETagMiddleware:
+    """Put the ETag computed by `conditional_get` on successful responses.
+
+    The fast collection paths return ready-made Responses, which FastAPI does
+    not merge dependency headers into, so the header is added on the way out.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or scope["method"] != "GET":
+            await self.app(scope, receive, send)
+            return
+
+        async def send_with_etag(message: Message) -> None:
+            if message["type"] == "http.response.start" and message["status"] == 200:
+                etag = scope.get("state", {}).get("etag")
+                if etag is not None:
+                    headers = MutableHeaders(scope=message)
+                    headers["ETag"] = etag
+                    # Cacheable, but always revalidated with If-None-Match
+                    headers.setdefault("Cache-Control", "no-cache")
+            await send(message)
+
+        await self.app(scope, receive, send_with_etag)
@@ -0,0 +1,138 @@
+import contextlib
+import queue
+import threading
+from collections.abc import Callable
+from concurrent.futures import Future, InvalidStateError
+from typing import Any
+
+from fastapi import HTTPException, status
+from sqlalchemy.orm import Session, sessionmaker
+
+from app import versioning  # noqa: F401  registers the table version listeners
+from app.config import settings
+from app.database import SessionLocal
+
+WriteJob = tuple[Callable[[Session], Any], Future]
+
+
+class CommitQueue:
+    """Single in-process writer that group-commits mutations from all requests.
+
+    Callers hand over a function that performs their writes on the writer's
+    session. The writer drains whatever is queued (up to `max_batch` jobs),
+    runs every job inside its own SAVEPOINT and commits the whole batch in one
+    transaction, so N concurrent requests cost one fsync and one write lock
+    instead of N competing ones. A failing job only rolls back its savepoint
+    and its exception is handed back to that caller alone.
+    """
+
+    def __init__(self, session_factory: sessionmaker[Session], max_batch: int):
+        self._session_factory = session_factory
+        self._max_batch = max_batch
+        self._jobs: queue.SimpleQueue[WriteJob] = queue.SimpleQueue()
+        self._thread: threading.Thread | None = None
+        self._lock = threading.Lock()
+
+    def submit[T](self, fn: Callable[[Session], T], timeout: float | None = None) -> T:
+        """Run `fn` in the next batch and return its result once committed.
+
+        Raises TimeoutError when that takes longer than `timeout` seconds; a job
+        still waiting in the queue is then dropped, one already running may
+        still commit.
+        """
+        self._ensure_started()
+        future: Future[T] = Future()
+        self._jobs.put((fn, future))
+        try:
+            return future.result(timeout)
+        except TimeoutError:
+            future.cancel()
+            raise
+
+    def _ensure_started(self) -> None:
+        if self._thread is not None and self._thread.is_alive():
+            return
+        with self._lock:
+            # A writer killed by a BaseException is replaced by a new one
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(
+                    target=self._run, name="sql-writer", daemon=True
+                )
+                self._thread.start()
+
+    def _next_batch(self) -> list[WriteJob]:
+        batch = [self._jobs.get()]
+        while len(batch) < self._max_batch:
+            try:
+                batch.append(self._jobs.get_nowait())
+            except queue.Empty:
+                break
+        return batch
+
+    def _run(self) -> None:
+        while True:
+            batch = self._next_batch()
+            try:
+                self._commit_batch(batch)
+            except BaseException as e:
+                # Whatever broke the batch (a job raising a BaseException, the
+                # rollback or closing the session) fails every caller still
+                # waiting on it instead of leaving them blocked
+                for _, future in batch:
+                    with contextlib.suppress(InvalidStateError):
+                        future.set_exception(e)
+                if not isinstance(e, Exception):
+                    raise
+
+    def _commit_batch(self, batch: list[WriteJob]) -> None:
+        committed: list[tuple[Future, Any]] = []
+        with self._session_factory() as session:
+            for fn, future in batch:
+                if not future.set_running_or_notify_cancel():
+                    continue
+                try:
+                    with session.begin_nested():
+                        result = fn(session)
+                except Exception as e:  # handed back to the caller
+                    future.set_exception(e)
+                else:
+                    committed.append((future, result))
+
+            try:
+                session.commit()
+            except Exception as e:  # handed back to every caller of the batch
+                for future, _ in committed:
+                    future.set_exception(e)
+                session.rollback()
+                return
+
+            for future, result in committed:
+                future.set_result(result)
+
+
+commit_queue: CommitQueue | None = (
+    CommitQueue(SessionLocal, settings.sql.write_batch_size)
+    if settings.sql.write_queue
+    else None
+)
+
+
+def run_write[T](sql: Session, fn: Callable[[Session], T]) -> T:
+    """Run `fn` against a write session and commit it.
+
+    `fn` does its lookups and mutations on the session it receives and must
+    build its response before returning (flush first when it needs generated
+    keys). Without the write queue it runs on the request's own session.
+    """
+    if commit_queue is None:
+        result = fn(sql)
+        sql.commit()
+        return result
+
+    try:
+        return commit_queue.submit(fn, settings.sql.write_timeout_seconds)
+    except TimeoutError as e:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Timed out waiting for the write to commit",
+        ) from e
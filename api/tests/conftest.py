@@ -0,0 +1,75 @@
+import os
+import tempfile
+from pathlib import Path
+
+# Settings are read when app.config is imported, so the test database has to
+# be configured before any test module imports the app
+os.environ.setdefault("SQL__NAME", str(Path(tempfile.mkdtemp()) / "test"))
+os.environ.setdefault("AUTH__SECRET_KEY", "test-secret-key-" + "x" * 48)
+os.environ.setdefault("AUTH__ALGORITHM", "HS256")
+os.environ.setdefault("AUTH__ACCESS_TOKEN_EXPIRE_MINUTES", "30")
+
+import pytest  # noqa: E402
+from fastapi.testclient import TestClient  # noqa: E402
+from sqlalchemy.orm import Session  # noqa: E402
+
+from app import models  # noqa: E402
+from app.cache import get_generations  # noqa: E402
+from app.database import SessionLocal, engine  # noqa: E402
+from app.main import app  # noqa: E402
+
+ADMIN_PASSWORD = "secret1"
+
+
+@pytest.fixture(scope="session")
+def client() -> TestClient:
+    return TestClient(app)
+
+
+@pytest.fixture
+def sql() -> Session:
+    """A write session on a freshly created, empty schema."""
+    models.Base.metadata.drop_all(bind=engine)
+    models.Base.metadata.create_all(bind=engine)
+    # Responses cached by earlier tests describe the dropped rows
+    get_generations().bump(models.Base.metadata.tables)
+    # Refreshing expired attributes would begin an IMMEDIATE transaction and
+    # hold the write lock the requests under test need
+    with SessionLocal(expire_on_commit=False) as session:
+        yield session
+
+
+@pytest.fixture
+def admin(sql: Session) -> models.User:
+    role = models.Role(name="admin")
+    user = models.User(
+        username="admin",
+        first_name="Ada",
+        last_name="Admin",
+        email="admin@example.com",
+        password_hash=ADMIN_PASSWORD,
+        role=role,
+    )
+    sql.add(user)
+    sql.commit()
+    return user
+
+
+@pytest.fixture
+def admin_headers(client: TestClient, admin: models.User) -> dict[str, str]:
+    response = client.post(
+        "/auth/token", data={"username": admin.username, "password": ADMIN_PASSWORD}
+    )
+    assert response.status_code == 200, response.text
+    return {"Authorization": f"Bearer {response.json()['access_token']}"}
+
+
+@pytest.fixture
+def course(sql: Session, admin: models.User) -> models.Course:
+    """A course taught by the admin, with one task."""
+    course = models.Course(
+        title="course", teacher=admin, category=models.Category(name="category")
+    )
+    sql.add(models.Task(title="task", course=course))
+    sql.commit()
+    return course
@@ -0,0 +1,90 @@
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+from app import models
+from app.cache import SharedGenerations
+from app.config import settings
+from app.database import engine
+
+pytestmark = pytest.mark.skipif(
+    not settings.cache.enabled, reason="response cache is disabled"
+)
+
+
+def category_stats(client: TestClient, headers: dict[str, str]) -> tuple[int, int]:
+    response = client.get("/cache/stats", headers=headers)
+    assert response.status_code == 200, response.text
+    for route in response.json()["routes"]:
+        if route["route"] == "get_categories":
+            return route["hits"], route["misses"]
+    return 0, 0
+
+
+def category_names(client: TestClient, headers: dict[str, str]) -> list[str]:
+    response = client.get("/categories", headers=headers)
+    assert response.status_code == 200, response.text
+    return [category["name"] for category in response.json()]
+
+
+def test_write_invalidates_cached_response(
+    client: TestClient,
+    sql: Session,
+    admin_headers: dict[str, str],
+):
+    sql.add(models.Category(name="first"))
+    sql.commit()
+
+    hits, misses = category_stats(client, admin_headers)
+    assert category_names(client, admin_headers) == ["first"]
+    assert category_names(client, admin_headers) == ["first"]
+    assert category_stats(client, admin_headers) == (hits + 1, misses + 1)
+
+    response = client.post(
+        "/categories", json={"name": "second"}, headers=admin_headers
+    )
+    assert response.status_code == 200, response.text
+    assert category_names(client, admin_headers) == ["first", "second"]
+    assert category_stats(client, admin_headers) == (hits + 1, misses + 2)
+
+
+@pytest.mark.skipif(not settings.cache.shared, reason="generations are not shared")
+def test_write_of_another_worker_invalidates_cached_response(
+    client: TestClient,
+    sql: Session,
+    admin_headers: dict[str, str],
+):
+    sql.add(models.Category(name="first"))
+    sql.commit()
+    assert category_names(client, admin_headers) == ["first"]
+
+    # Another worker writes on its own connection and bumps its own mapping
+    # of the generations file
+    with engine.begin() as conn:
+        conn.execute(
+            text("INSERT INTO categories (name, is_active) VALUES ('other', 1)")
+        )
+    assert category_names(client, admin_headers) == ["first"]
+    other_worker = SharedGenerations(
+        settings.cache.generations_file or f"{settings.sql.name}.generations"
+    )
+    other_worker.bump(["categories"])
+
+    assert category_names(client, admin_headers) == ["first", "other"]
+
+
+def test_disabled_route_always_queries(
+    client: TestClient,
+    sql: Session,
+    admin_headers: dict[str, str],
+    monkeypatch: pytest.MonkeyPatch,
+):
+    monkeypatch.setattr(settings.cache, "disabled_routes", ["get_categories"])
+    sql.add(models.Category(name="first"))
+    sql.commit()
+
+    stats = category_stats(client, admin_headers)
+    assert category_names(client, admin_headers) == ["first"]
+    assert category_names(client, admin_headers) == ["first"]
+    assert category_stats(client, admin_headers) == stats
@@ -0,0 +1,70 @@
+from fastapi.testclient import TestClient
+from sqlalchemy.orm import Session
+
+from app import models
+from tests.test_query_counts import count_statements
+
+
+def get(client: TestClient, url: str, headers: dict[str, str], etag: str | None):
+    if etag is not None:
+        headers = {**headers, "If-None-Match": etag}
+    return client.get(url, headers=headers)
+
+
+def test_matching_etag_answers_304_until_a_write(
+    client: TestClient,
+    sql: Session,
+    admin_headers: dict[str, str],
+):
+    sql.add(models.Category(name="first"))
+    sql.commit()
+
+    response = get(client, "/categories", admin_headers, None)
+    assert response.status_code == 200, response.text
+    etag = response.headers["ETag"]
+    assert response.headers["Cache-Control"] == "no-cache"
+
+    with count_statements() as statements:
+        response = get(client, "/categories", admin_headers, etag)
+    assert response.status_code == 304
+    assert response.headers["ETag"] == etag
+    assert response.content == b""
+    # Only the version lookup, the endpoint never ran its query
+    assert all("categories" not in statement for statement in statements)
+
+    # Weak comparison, in a list of candidates
+    response = get(client, "/categories", admin_headers, f'"other", {etag[2:]}')
+    assert response.status_code == 304
+    # Every URL has its own ETag
+    response = get(client, "/categories?limit=1", admin_headers, etag)
+    assert response.status_code == 200
+
+    # A rolled back write leaves the version alone
+    response = client.post("/categories", json={"name": "first"}, headers=admin_headers)
+    assert response.status_code == 400
+    assert get(client, "/categories", admin_headers, etag).status_code == 304
+
+    response = client.post(
+        "/categories", json={"name": "second"}, headers=admin_headers
+    )
+    assert response.status_code == 200, response.text
+    response = get(client, "/categories", admin_headers, etag)
+    assert response.status_code == 200
+    assert response.headers["ETag"] != etag
+    assert [category["name"] for category in response.json()] == ["first", "second"]
+
+
+def test_detail_etag_follows_its_table(
+    client: TestClient,
+    course: models.Course,
+    admin_headers: dict[str, str],
+):
+    url = f"/courses/{course.course_id}"
+    etag = get(client, url, admin_headers, None).headers["ETag"]
+    assert get(client, url, admin_headers, etag).status_code == 304
+
+    response = client.put(url, json={"description": "changed"}, headers=admin_headers)
+    assert response.status_code == 200, response.text
+    response = get(client, url, admin_headers, etag)
+    assert response.status_code == 200
+    assert response.json()["description"] == "changed"
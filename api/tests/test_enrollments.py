@@ -0,0 +1,53 @@
+from fastapi.testclient import TestClient
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+
+from app import models
+
+
+def test_bulk_enrollment_reports_every_item(
+    client: TestClient,
+    sql: Session,
+    admin: models.User,
+    course: models.Course,
+    admin_headers: dict[str, str],
+):
+    enrollment = {
+        "student_id": admin.user_id,
+        "course_id": course.course_id,
+        "assigner_id": admin.user_id,
+    }
+    items = [
+        enrollment,
+        enrollment,
+        {**enrollment, "student_id": 999},
+        {**enrollment, "course_id": 999},
+        {**enrollment, "assigner_id": 999},
+    ]
+    response = client.post(
+        "/enrollments/bulk", json={"items": items}, headers=admin_headers
+    )
+    assert response.status_code == 200, response.text
+    results = response.json()
+
+    assert [result["index"] for result in results] == list(range(len(items)))
+    assert [(result["status"], result["detail"]) for result in results] == [
+        ("created", None),
+        # Already enrolled by the first item of the same request
+        ("conflict", "Student course enrollment already exists"),
+        ("not_found", "Student not found"),
+        ("not_found", "Course not found"),
+        ("not_found", "Assigner not found"),
+    ]
+    enrollment_id = results[0]["enrollment_id"]
+    assert [result["enrollment_id"] for result in results[1:]] == [None] * 4
+
+    response = client.get(f"/enrollments/{enrollment_id}", headers=admin_headers)
+    assert response.status_code == 200, response.text
+    assert response.json()["student_id"] == admin.user_id
+
+    response = client.post(
+        "/enrollments/bulk", json={"items": [enrollment]}, headers=admin_headers
+    )
+    assert response.json()[0]["status"] == "conflict"
+    assert sql.scalar(select(func.count(models.Enrollment.enrollment_id))) == 1
@@ -0,0 +1,62 @@
+import csv
+import io
+import json
+from datetime import date, datetime
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy.orm import Session
+
+from app import models
+from app.src.exports import controllers
+
+COMPLETED_AT = datetime(2025, 1, 2, 3, 4, 5)
+
+
+@pytest.fixture
+def completion(sql: Session, admin: models.User) -> models.TaskCompletion:
+    course = models.Course(
+        title="course", teacher=admin, category=models.Category(name="category")
+    )
+    enrollment = models.Enrollment(
+        student=admin, assigner=admin, course=course, enrolled_at=date(2025, 1, 1)
+    )
+    completion = models.TaskCompletion(
+        enrollment=enrollment,
+        task=models.Task(title="task", course=course),
+        completed_at=COMPLETED_AT,
+    )
+    sql.add(completion)
+    sql.commit()
+    return completion
+
+
+def test_csv_and_ndjson_agree_on_timestamps(
+    client: TestClient,
+    completion: models.TaskCompletion,
+    admin_headers: dict[str, str],
+):
+    url = "/exports/task_completions"
+    response = client.get(url, params={"format": "csv"}, headers=admin_headers)
+    assert response.status_code == 200, response.text
+    (row,) = csv.DictReader(io.StringIO(response.text))
+
+    response = client.get(url, params={"format": "ndjson"}, headers=admin_headers)
+    assert response.status_code == 200, response.text
+    (line,) = response.text.splitlines()
+
+    assert row["completed_at"] == json.loads(line)["completed_at"]
+    assert row["completed_at"] == COMPLETED_AT.isoformat()
+
+
+def test_failing_export_answers_500(
+    client: TestClient,
+    admin_headers: dict[str, str],
+    monkeypatch: pytest.MonkeyPatch,
+):
+    def fail():
+        raise RuntimeError("database is gone")
+
+    monkeypatch.setattr(controllers, "ReadSessionLocal", fail)
+    response = client.get("/exports/enrollments", headers=admin_headers)
+    assert response.status_code == 500
@@ -0,0 +1,133 @@
+from datetime import date
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from app import models
+
+NEW_USER = {
+    "username": "mallory",
+    "first_name": "Mal",
+    "last_name": "Lory",
+    "email": "mallory@example.com",
+    "password_hash": "secret1",
+}
+
+
+@pytest.fixture
+def student_headers(
+    client: TestClient, sql: Session, admin: models.User
+) -> dict[str, str]:
+    sql.add(models.Role(name="student"))
+    sql.commit()
+    # A caller supplied role_id is ignored, registration gets the default role
+    response = client.post("/users", json={**NEW_USER, "role_id": admin.role_id})
+    assert response.status_code == 200, response.text
+    assert response.json()["role"]["name"] == "student"
+
+    response = client.post(
+        "/auth/token",
+        data={"username": NEW_USER["username"], "password": NEW_USER["password_hash"]},
+    )
+    return {"Authorization": f"Bearer {response.json()['access_token']}"}
+
+
+@pytest.mark.parametrize(
+    ("method", "url", "body"),
+    [
+        ("GET", "/users", None),
+        ("PUT", "/users/1", {"role_id": 1, "password_hash": "secret1"}),
+        ("GET", "/roles", None),
+        ("POST", "/roles", {"name": "intruder"}),
+        ("PUT", "/roles/1", {"name": "intruder"}),
+        ("DELETE", "/roles/1", None),
+    ],
+)
+def test_user_and_role_management_needs_permission(
+    client: TestClient,
+    student_headers: dict[str, str],
+    method: str,
+    url: str,
+    body: dict | None,
+):
+    assert client.request(method, url, json=body).status_code == 401
+    response = client.request(method, url, json=body, headers=student_headers)
+    assert response.status_code == 403
+
+
+def test_admin_manages_users_and_roles(
+    client: TestClient,
+    student_headers: dict[str, str],
+    admin_headers: dict[str, str],
+):
+    response = client.post("/roles", json={"name": "teacher"}, headers=admin_headers)
+    assert response.status_code == 200, response.text
+    teacher_role_id = response.json()["role_id"]
+
+    response = client.put(
+        "/users/2",
+        json={"role_id": teacher_role_id, "password_hash": "secret1"},
+        headers=admin_headers,
+    )
+    assert response.status_code == 200, response.text
+    assert response.json()["role"]["name"] == "teacher"
+
+
+def test_students_only_request_their_own_task_completions(
+    client: TestClient,
+    sql: Session,
+    admin: models.User,
+    student_headers: dict[str, str],
+    admin_headers: dict[str, str],
+):
+    student = sql.scalars(
+        select(models.User).where(models.User.username == NEW_USER["username"])
+    ).one()
+    course = models.Course(
+        title="course", teacher=admin, category=models.Category(name="category")
+    )
+    task = models.Task(title="task", course=course)
+    own, other = (
+        models.Enrollment(
+            student=user, assigner=admin, course=course, enrolled_at=date.today()
+        )
+        for user in (student, admin)
+    )
+    sql.add_all([task, own, other])
+    sql.commit()
+
+    def request(enrollment: models.Enrollment, is_active: bool = False) -> dict:
+        return {
+            "enrollment_id": enrollment.enrollment_id,
+            "task_id": task.task_id,
+            "is_active": is_active,
+        }
+
+    response = client.post(
+        "/task_completion", json=request(other), headers=student_headers
+    )
+    assert response.status_code == 403
+    # Approving is left to teachers
+    response = client.post(
+        "/task_completion", json=request(own, True), headers=student_headers
+    )
+    assert response.status_code == 403
+    response = client.post(
+        "/task_completion/bulk",
+        json={"items": [request(other)]},
+        headers=student_headers,
+    )
+    assert response.json()["statuses"] == ["enrollment_not_found"]
+
+    response = client.post(
+        "/task_completion", json=request(own), headers=student_headers
+    )
+    assert response.status_code == 200, response.text
+    url = f"/task_completion/{response.json()['task_completion_id']}"
+    response = client.put(url, json=request(own, True), headers=student_headers)
+    assert response.status_code == 403
+    response = client.put(url, json=request(own, True), headers=admin_headers)
+    assert response.status_code == 200, response.text
+    assert client.delete(url, headers=student_headers).status_code == 403
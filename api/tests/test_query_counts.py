@@ -0,0 +1,98 @@
+"""The list endpoints must issue the same number of statements for any size."""
+
+from collections.abc import Iterator
+from contextlib import contextmanager
+from datetime import date
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from app import models
+from app.config import settings
+from app.database import engine, read_engine
+
+ROWS = 10
+
+
+@contextmanager
+def count_statements() -> Iterator[list[str]]:
+    statements: list[str] = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    for target in (engine, read_engine):
+        event.listen(target, "before_cursor_execute", record)
+    try:
+        yield statements
+    finally:
+        for target in (engine, read_engine):
+            event.remove(target, "before_cursor_execute", record)
+
+
+def add_rows(sql: Session, teacher: models.User, count: int) -> None:
+    """Add `count` students with their own role, each enrolled in a new course.
+
+    Distinct roles make a lazily loaded `User.role` cost one query per row.
+    """
+    category = sql.query(models.Category).first()
+    if category is None:
+        category = models.Category(name="category")
+        sql.add(category)
+
+    offset = sql.query(models.Course).count()
+    for i in range(offset, offset + count):
+        student = models.User(
+            username=f"student{i}",
+            first_name="Sam",
+            last_name="Student",
+            email=f"student{i}@example.com",
+            password_hash="secret1",
+            role=models.Role(name=f"role{i}"),
+        )
+        course = models.Course(title=f"course{i}", teacher=teacher, category=category)
+        task = models.Task(title=f"task{i}", course=course)
+        enrollment = models.Enrollment(
+            student=student, assigner=teacher, course=course, enrolled_at=date.today()
+        )
+        sql.add_all(
+            [
+                student,
+                course,
+                task,
+                enrollment,
+                models.TaskCompletion(enrollment=enrollment, task=task),
+            ]
+        )
+    sql.commit()
+
+
+def statements_for(client: TestClient, url: str, headers: dict[str, str]) -> int:
+    # The first request also loads the per-worker auth state
+    assert client.get(url, headers=headers).status_code == 200
+    with count_statements() as statements:
+        response = client.get(url, headers=headers)
+    assert response.status_code == 200, response.text
+    return len(statements)
+
+
+@pytest.mark.parametrize("fast_collections", [True, False])
+@pytest.mark.parametrize("url", ["/users", "/users/1/tasksAndCourses", "/enrollments"])
+def test_statement_count_does_not_grow_with_rows(
+    client: TestClient,
+    sql: Session,
+    admin: models.User,
+    admin_headers: dict[str, str],
+    monkeypatch: pytest.MonkeyPatch,
+    url: str,
+    fast_collections: bool,
+):
+    monkeypatch.setattr(settings.serialization, "fast_collections", fast_collections)
+
+    add_rows(sql, admin, 1)
+    single = statements_for(client, url, admin_headers)
+
+    add_rows(sql, admin, ROWS - 1)
+    assert statements_for(client, url, admin_headers) == single
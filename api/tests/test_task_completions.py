@@ -0,0 +1,94 @@
+from datetime import date
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from app import models
+from app.database import engine
+
+
+@pytest.fixture
+def enrollment(
+    sql: Session, admin: models.User, course: models.Course
+) -> models.Enrollment:
+    """The admin enrolled in the course, which gets a second task."""
+    enrollment = models.Enrollment(
+        student=admin, assigner=admin, course=course, enrolled_at=date.today()
+    )
+    sql.add_all([enrollment, models.Task(title="second", course=course)])
+    sql.commit()
+    return enrollment
+
+
+def completions(enrollment: models.Enrollment, *task_ids: int) -> list[dict]:
+    return [
+        {"enrollment_id": enrollment.enrollment_id, "task_id": task_id}
+        for task_id in task_ids
+    ]
+
+
+def test_bulk_completions_report_every_item(
+    client: TestClient,
+    enrollment: models.Enrollment,
+    admin_headers: dict[str, str],
+):
+    first, second = (task.task_id for task in enrollment.course.tasks)
+    items = [
+        *completions(enrollment, first, second, first, 999),
+        {"enrollment_id": 999, "task_id": first},
+    ]
+    response = client.post(
+        "/task_completion/bulk", json={"items": items}, headers=admin_headers
+    )
+    assert response.status_code == 200, response.text
+    assert response.json() == {
+        "created": 2,
+        "statuses": [
+            "created",
+            "created",
+            "exists",
+            "task_not_found",
+            "enrollment_not_found",
+        ],
+    }
+
+    # A retried request records nothing twice
+    response = client.post(
+        "/task_completion/bulk", json={"items": items[:2]}, headers=admin_headers
+    )
+    assert response.json() == {"created": 0, "statuses": ["exists", "exists"]}
+
+
+def test_bulk_completions_count_only_inserted_rows(
+    client: TestClient,
+    enrollment: models.Enrollment,
+    admin_headers: dict[str, str],
+):
+    raced, other = (task.task_id for task in enrollment.course.tasks)
+    recorded = []
+
+    def record_concurrently(conn, cursor, statement, parameters, context, executemany):
+        # Another request records the first item between lookup and INSERT
+        if statement.startswith("INSERT INTO task_completions") and not recorded:
+            recorded.append(raced)
+            cursor.execute(
+                "INSERT INTO task_completions (enrollment_id, task_id, is_active) "
+                "VALUES (?, ?, 1)",
+                (enrollment.enrollment_id, raced),
+            )
+
+    event.listen(engine, "before_cursor_execute", record_concurrently)
+    try:
+        response = client.post(
+            "/task_completion/bulk",
+            json={"items": completions(enrollment, raced, other)},
+            headers=admin_headers,
+        )
+    finally:
+        event.remove(engine, "before_cursor_execute", record_concurrently)
+
+    assert response.status_code == 200, response.text
+    assert recorded
+    assert response.json() == {"created": 1, "statuses": ["exists", "created"]}
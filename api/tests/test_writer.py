@@ -0,0 +1,146 @@
+"""Group commit of the in-process write queue."""
+
+import threading
+import time
+from collections.abc import Callable
+from concurrent.futures import Future, ThreadPoolExecutor
+
+import pytest
+from sqlalchemy import event, select
+from sqlalchemy.orm import Session, sessionmaker
+
+from app import models
+from app.database import SessionLocal, engine
+from app.writer import CommitQueue
+
+
+def add_category(name: str) -> Callable[[Session], str]:
+    def write(session: Session) -> str:
+        session.add(models.Category(name=name))
+        session.flush()
+        return name
+
+    return write
+
+
+def fail(session: Session) -> None:
+    session.add(models.Category(name="failed"))
+    session.flush()
+    raise ValueError("job failed")
+
+
+def submit_batch(
+    writer: CommitQueue, jobs: list[Callable[[Session], object]]
+) -> list[Future]:
+    """Submit `jobs` from concurrent callers so they are committed as one batch.
+
+    A blocking job holds the writer until all of them are queued behind it.
+    """
+    started = threading.Event()
+    release = threading.Event()
+
+    def block(session: Session) -> None:
+        started.set()
+        release.wait()
+
+    with ThreadPoolExecutor(len(jobs) + 1) as pool:
+        blocked = pool.submit(writer.submit, block)
+        started.wait()
+        futures = [pool.submit(writer.submit, job) for job in jobs]
+        while writer._jobs.qsize() < len(jobs):
+            time.sleep(0.01)
+        release.set()
+        for future in [blocked, *futures]:
+            future.exception()
+    return futures
+
+
+def category_names(sql: Session) -> set[str]:
+    sql.rollback()
+    return set(sql.scalars(select(models.Category.name)))
+
+
+def test_concurrent_writes_share_one_commit(sql: Session):
+    commits = []
+
+    def count_commit(conn) -> None:
+        commits.append(conn)
+
+    event.listen(engine, "commit", count_commit)
+    try:
+        futures = submit_batch(
+            CommitQueue(SessionLocal, 64), [add_category(f"c{i}") for i in range(5)]
+        )
+    finally:
+        event.remove(engine, "commit", count_commit)
+
+    assert [future.result() for future in futures] == [f"c{i}" for i in range(5)]
+    # The blocking job writes nothing, the five queued behind it share a commit
+    assert len(commits) == 1
+    assert category_names(sql) == {f"c{i}" for i in range(5)}
+
+
+def test_failing_job_only_fails_its_caller(sql: Session):
+    first, failed, last = submit_batch(
+        CommitQueue(SessionLocal, 64),
+        [add_category("first"), fail, add_category("last")],
+    )
+
+    assert first.result() == "first"
+    assert last.result() == "last"
+    with pytest.raises(ValueError, match="job failed"):
+        failed.result()
+    assert category_names(sql) == {"first", "last"}
+
+
+class FailingCommitSession(Session):
+    def commit(self) -> None:
+        raise RuntimeError("disk full")
+
+
+def test_failed_commit_fails_every_caller(sql: Session):
+    writer = CommitQueue(sessionmaker(engine, class_=FailingCommitSession), 64)
+    futures = submit_batch(writer, [add_category("first"), add_category("last")])
+
+    for future in futures:
+        with pytest.raises(RuntimeError, match="disk full"):
+            future.result()
+    assert category_names(sql) == set()
+
+
+# The dying writer thread is reported by pytest's thread exception hook
+@pytest.mark.filterwarnings("ignore::pytest.PytestUnhandledThreadExceptionWarning")
+def test_writer_is_restarted_after_it_dies(sql: Session):
+    writer = CommitQueue(SessionLocal, 64)
+
+    def exit_writer(session: Session) -> None:
+        raise SystemExit
+
+    with pytest.raises(SystemExit):
+        writer.submit(exit_writer, timeout=5)
+    writer._thread.join(timeout=5)
+    assert not writer._thread.is_alive()
+
+    assert writer.submit(add_category("after"), timeout=5) == "after"
+    assert category_names(sql) == {"after"}
+
+
+def test_submit_times_out(sql: Session):
+    writer = CommitQueue(SessionLocal, 64)
+    release = threading.Event()
+
+    def block(session: Session) -> None:
+        release.wait()
+
+    with ThreadPoolExecutor(1) as pool:
+        blocked = pool.submit(writer.submit, block)
+        while writer._jobs.qsize():
+            time.sleep(0.01)
+        with pytest.raises(TimeoutError):
+            writer.submit(add_category("late"), timeout=0.1)
+        release.set()
+        blocked.result()
+
+    # The queued job was dropped rather than committed after its caller gave up
+    assert writer.submit(add_category("next"), timeout=5) == "next"
+    assert category_names(sql) == {"next"}
@@ -49,12 +49,6 @@ export interface UserCreate {
      * @memberof UserCreate
      */
     isActive?: boolean;
-    /**
-     * 
-     * @type {number}
-     * @memberof UserCreate
-     */
-    roleId: number;
     /**
      * 
      * @type {string}
@@ -71,7 +65,6 @@ export function instanceOfUserCreate(value: object): value is UserCreate {
     if (!('firstName' in value) || value['firstName'] === undefined) return false;
     if (!('lastName' in value) || value['lastName'] === undefined) return false;
     if (!('email' in value) || value['email'] === undefined) return false;
-    if (!('roleId' in value) || value['roleId'] === undefined) return false;
     if (!('passwordHash' in value) || value['passwordHash'] === undefined) return false;
     return true;
 }
@@ -91,7 +84,6 @@ export function UserCreateFromJSONTyped(json: any, ignoreDiscriminator: boolean)
         'lastName': json['last_name'],
         'email': json['email'],
         'isActive': json['is_active'] == null ? undefined : json['is_active'],
-        'roleId': json['role_id'],
         'passwordHash': json['password_hash'],
     };
 }
@@ -112,7 +104,6 @@ export function UserCreateToJSONTyped(value?: UserCreate | null, ignoreDiscrimin
         'last_name': value['lastName'],
         'email': value['email'],
         'is_active': value['isActive'],
-        'role_id': value['roleId'],
         'password_hash': value['passwordHash'],
     };
 }
@@ -89,7 +89,6 @@ const SignUpPage = () => {
           email,
           username,
           passwordHash: password,
-          roleId: 1,
           isActive: true,
         }
       });